@@ -0,0 +1,211 @@
+# This file contains a bounded least-recently-used (LRU) cache for functions
+# that are evaluated repeatedly with identical arguments, such as the arc
+# length of a delay spiral while tuning it or sweeping over many lengths.
+# Caching is opt-in: memoized functions behave exactly like the original
+# functions until caching is enabled.
+#
+# The top-level functions are as follows:
+#   memoize         - decorator making a function's results cacheable.
+#   enable          - enables caching for all memoized functions.
+#   disable         - disables caching for all memoized functions.
+#   clear           - clears the caches of all memoized functions.
+#   info            - hit/miss statistics for all memoized functions.
+#   canonical_key   - converts arguments to a hashable key, hashing lists and
+#                     ndarrays by value.
+
+
+import functools
+import inspect
+import numpy as np
+
+#
+# Local constants
+#
+
+cache_size = 4096   # default maximum number of results cached per function
+
+# All functions decorated with 'memoize', by qualified name
+memoized_funcs = {}
+
+
+#
+# Functions
+#
+
+def canonical_key(value):
+    '''
+    Converts 'value' to a hashable key that compares equal for values that
+    are equal element-by-element. Lists, tuples, and dicts are converted
+    recursively and ndarrays are keyed by their dtype, shape, and data. The
+    type of each value is kept in the key, since functions may treat e.g. a
+    list and an ndarray, or a float and a numpy float, differently.
+
+    Args:
+        value:          Any argument of a memoized function.
+
+    Return:
+        A hashable key
+        <tuple>
+    '''
+    if isinstance(value, np.ndarray):
+        return (np.ndarray, value.dtype.str, value.shape, value.tobytes())
+    elif isinstance(value, (list, tuple)):
+        return (type(value),) + tuple(canonical_key(v) for v in value)
+    elif isinstance(value, dict):
+        return (dict,) + tuple(
+            (k, canonical_key(v)) for k, v in sorted(value.items()))
+    else:
+        return (type(value), value)
+
+
+def memoize(func=None, bypass=('verbose',)):
+    '''
+    Decorator making the results of 'func' cacheable in a bounded LRU cache
+    keyed on its canonicalized arguments (see 'canonical_key'). Arguments
+    are bound to the signature of 'func' with defaults applied first, so a
+    value passed by position, by keyword, or left at its default all share
+    the same cache entry.
+
+    Caching is disabled until 'enable' is called (or 'cache_enable' on the
+    decorated function), so by default the decorated function simply calls
+    'func'. Calls where any argument named in 'bypass' is truthy are never
+    cached, so that e.g. verbose output is still printed.
+
+    The decorated function has the following additional attributes:
+        cache_enable(maxsize=cache_size):   enables its cache
+        cache_disable():                    disables and clears its cache
+        cache_clear():                      clears its cache
+        cache_info():                       returns (hits, misses, maxsize,
+                                            currsize) as a named tuple, or
+                                            None if caching is disabled
+
+    Args:
+        func:           Function to memoize. Must return immutable values.
+                        <function>
+
+        bypass:         Names of arguments which disable caching of a call
+                        when they're truthy.
+                        <tuple of str>
+                        (default: ('verbose',))
+
+    Return:
+        The memoized function
+        <function>
+    '''
+    if func is None:
+        return functools.partial(memoize, bypass=bypass)
+
+    signature = inspect.signature(func)
+    cached_func = None
+
+    def call_with_key(key):
+        '''Unpacks the arguments stored alongside the key'''
+        return func(**key.arguments)
+    #enddef
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if cached_func is None:
+            return func(*args, **kwargs)
+
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+
+        if any(arguments.get(name) for name in bypass):
+            return func(*args, **kwargs)
+
+        return cached_func(CacheKey(arguments))
+    #enddef
+
+    def cache_enable(maxsize=cache_size):
+        '''Enables caching with at most 'maxsize' results'''
+        nonlocal cached_func
+        cached_func = functools.lru_cache(maxsize=maxsize)(call_with_key)
+    #enddef
+
+    def cache_disable():
+        '''Disables caching and discards cached results'''
+        nonlocal cached_func
+        cached_func = None
+    #enddef
+
+    def cache_clear():
+        '''Discards cached results and resets the hit/miss counters'''
+        if cached_func is not None:
+            cached_func.cache_clear()
+    #enddef
+
+    def cache_info():
+        '''Hits, misses, maxsize, and currsize of the cache'''
+        if cached_func is not None:
+            return cached_func.cache_info()
+    #enddef
+
+    wrapper.cache_enable = cache_enable
+    wrapper.cache_disable = cache_disable
+    wrapper.cache_clear = cache_clear
+    wrapper.cache_info = cache_info
+
+    memoized_funcs[func.__module__ + '.' + func.__qualname__] = wrapper
+
+    return wrapper
+
+
+class CacheKey:
+    '''
+    Bound arguments of a memoized function, hashed and compared by their
+    canonical key (see 'canonical_key') so that they can be looked up in an
+    LRU cache while still being available to call the function with.
+    '''
+    __slots__ = ('arguments', 'key', 'hash')
+
+    def __init__(self, arguments):
+        self.arguments = arguments
+        self.key = canonical_key(tuple(arguments.items()))
+        self.hash = hash(self.key)
+
+    def __hash__(self):
+        return self.hash
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+def enable(maxsize=cache_size):
+    '''
+    Enables caching for all memoized functions, with at most 'maxsize'
+    results cached per function. Any previously cached results are
+    discarded.
+    '''
+    for func in memoized_funcs.values():
+        func.cache_enable(maxsize)
+
+
+def disable():
+    '''
+    Disables caching for all memoized functions and discards their cached
+    results.
+    '''
+    for func in memoized_funcs.values():
+        func.cache_disable()
+
+
+def clear():
+    '''
+    Discards the cached results of all memoized functions and resets their
+    hit/miss counters.
+    '''
+    for func in memoized_funcs.values():
+        func.cache_clear()
+
+
+def info():
+    '''
+    Returns a dict of the cache statistics (see 'functools.lru_cache') of
+    each memoized function, keyed by its qualified name. Functions with
+    caching disabled are omitted.
+    '''
+    return {name: func.cache_info()
+            for name, func in memoized_funcs.items()
+            if func.cache_info() is not None}
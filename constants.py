@@ -20,3 +20,4 @@ seg_length = 1.0    # default straight segment length for curved waveguides
 #
 
 min_bend_radius = 5.0	# Minimum bend radius
+max_vertices = 8190	# Maximum number of points in a GDSII path or polygon
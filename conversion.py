@@ -0,0 +1,219 @@
+# This file contains functions for converting ndarrays of coordinates to
+# KLayout points, paths, and polygons in bulk. KLayout has no constructor
+# taking an array of coordinates, so every point is still created by a
+# Python call, but these functions keep the per-point overhead to a minimum
+# by converting the ndarray to Python numbers all at once with 'tolist',
+# rather than indexing the ndarray twice per point.
+#
+# The top-level functions are as follows:
+#   array_to_DPoints    - converts an ndarray to a list of pya.DPoints, in
+#                         chunks to bound memory.
+#   array_to_Points     - converts an ndarray to a list of pya.Points,
+#                         snapping to database units if requested.
+#   array_to_DPath      - converts an ndarray to a pya.DPath.
+#   array_to_Path       - converts an ndarray to a pya.Path in database units.
+#   array_to_DPolygon   - converts an ndarray to a pya.DPolygon.
+#   array_to_Polygon    - converts an ndarray to a pya.Polygon in database
+#                         units.
+#   to_dbu              - snaps coordinates in microns to integer database
+#                         units exactly as KLayout does.
+#   benchmark           - times each conversion route on the installed
+#                         version of KLayout.
+
+
+import timeit
+import pya
+import numpy as np
+
+#
+# Local constants
+#
+
+# Number of points converted at a time by 'array_to_DPoints'. Converting
+# in chunks bounds memory, and on KLayout 0.30 is no slower than converting
+# all at once (see 'benchmark').
+chunk_size = 4096
+
+
+#
+# Functions
+#
+
+def to_dbu(arr, dbu):
+    '''
+    Snaps coordinates in microns to integer database units. Coordinates are
+    scaled by 1 / 'dbu' and rounded half away from zero, which is exactly
+    how KLayout converts a DPath or DPolygon to database units (e.g. when
+    inserting it into a layout), so the resulting shapes are identical.
+
+    Args:
+        arr:            Coordinates in microns.
+                        <np.ndarray>
+
+        dbu:            Database unit, in microns.
+                        <float>
+
+    Return:
+        The coordinates in database units.
+        <np.ndarray of np.int64 with the shape of 'arr'>
+    '''
+    scaled = np.multiply(arr, 1 / dbu)
+    return np.trunc(scaled + np.copysign(0.5, scaled)).astype(np.int64)
+
+
+def array_to_DPoints(arr, chunk_size=chunk_size):
+    '''
+    Converts an ndarray of coordinates to a list of DPoints.
+
+    Args:
+        arr:            Coordinates of the points. First row x coords. Second
+                        row y coords.
+                        <2 x N np.ndarray>
+
+        chunk_size:     The coordinates are converted to Python floats this
+                        many points at a time, so the temporary lists of 
+                        floats never hold more than 'chunk_size' points. If
+                        None, they're converted all at once.
+                        <int>
+                        (default: conversion.chunk_size == 4096)
+
+    Return:
+        The points
+        <list of pya.DPoint>
+    '''
+    if chunk_size is None:
+        return list(map(pya.DPoint, *arr.tolist()))
+
+    dpts = []
+    for start in range(0, arr.shape[1], chunk_size):
+        chunk = arr[:, start:start + chunk_size]
+        dpts.extend(map(pya.DPoint, *chunk.tolist()))
+
+    return dpts
+
+
+def array_to_Points(arr, dbu=None):
+    '''
+    Converts an ndarray of coordinates to a list of Points, in database
+    units.
+
+    Args:
+        arr:            Coordinates of the points. First row x coords. Second
+                        row y coords. In database units if 'dbu' is None,
+                        otherwise in microns.
+                        <2 x N np.ndarray>
+
+        dbu:            If not None, 'arr' is snapped from microns to this
+                        database unit first (see 'to_dbu').
+                        <float>
+                        (default: None)
+
+    Return:
+        The points
+        <list of pya.Point>
+    '''
+    if dbu is not None:
+        arr = to_dbu(arr, dbu)
+
+    return list(map(pya.Point, *arr.tolist()))
+
+
+def array_to_DPath(arr, width):
+    '''
+    Converts an ndarray of coordinates to a DPath of the given width.
+    '''
+    return pya.DPath(array_to_DPoints(arr), width)
+
+
+def array_to_Path(arr, width, dbu):
+    '''
+    Converts an ndarray of coordinates in microns to a Path of the given
+    width in microns, snapped to the database unit 'dbu'. Inserting it into
+    a layout with that database unit gives the same shape as inserting the
+    equivalent DPath, but the conversion to database units is done by numpy.
+    '''
+    return pya.Path(array_to_Points(arr, dbu), int(to_dbu(width, dbu)))
+
+
+def array_to_DPolygon(arr, raw=False):
+    '''
+    Converts an ndarray of coordinates of the hull of a polygon to a
+    DPolygon. If 'raw' is True, the hull isn't compressed (i.e. colinear and
+    duplicate points are kept), which also skips KLayout's processing of it.
+    '''
+    return pya.DPolygon(array_to_DPoints(arr), raw)
+
+
+def array_to_Polygon(arr, dbu, raw=False):
+    '''
+    Converts an ndarray of coordinates in microns of the hull of a polygon to
+    a Polygon snapped to the database unit 'dbu'. See 'array_to_DPolygon' for
+    'raw'.
+    '''
+    return pya.Polygon(array_to_Points(arr, dbu), raw)
+
+
+def benchmark(n_pts=50000, dbu=0.001, number=3, repeat=5):
+    '''
+    Times each route for converting a path with 'n_pts' points from an
+    ndarray and inserting it into a layout, on the installed version of
+    KLayout. The routes are:
+
+        route       description
+        ---------------------------------------------------------------------
+        'loop'      A DPoint per point, indexing the ndarray for each
+                    coordinate (how chickpea used to convert coordinates).
+        'tolist'    'array_to_DPoints' with 'chunk_size' = None
+        'chunked'   'array_to_DPath', i.e. 'array_to_DPoints' in chunks of
+                    the default 'chunk_size'
+        'dbu'       'array_to_Path', snapping to database units with numpy
+
+    All routes produce identical shapes in the layout.
+
+    Args:
+        n_pts:          Number of points in the path.
+                        <int>
+                        (default: 50000)
+
+        dbu:            Database unit of the layout, in microns.
+                        <float>
+                        (default: 0.001)
+
+        number, repeat: Each route is run 'number' times, 'repeat' times
+                        over, and the fastest repetition is kept (see
+                        'timeit.repeat').
+                        <int>
+                        (default: 3, 5)
+
+    Return:
+        The time per conversion of each route in seconds, from fastest to
+        slowest.
+        <dict of str: float>
+    '''
+    theta = np.linspace(0, 100, n_pts)
+    arr = np.stack((theta * np.cos(theta), theta * np.sin(theta)))
+    width = 0.5
+
+    layout = pya.Layout()
+    layout.dbu = dbu
+    shapes = layout.create_cell('benchmark').shapes(layout.layer(1, 0))
+
+    def loop():
+        dpts = []
+        for i in range(arr.shape[1]):
+            dpts.append(pya.DPoint(arr[0, i], arr[1, i]))
+        shapes.insert(pya.DPath(dpts, width))
+
+    routes = {
+        'loop':     loop,
+        'tolist':   lambda: shapes.insert(pya.DPath(
+                        array_to_DPoints(arr, None), width)),
+        'chunked':  lambda: shapes.insert(array_to_DPath(arr, width)),
+        'dbu':      lambda: shapes.insert(array_to_Path(arr, width, dbu)),
+    }
+
+    times = {name: min(timeit.repeat(route, number=number, repeat=repeat))
+                   / number
+             for name, route in routes.items()}
+
+    return dict(sorted(times.items(), key=lambda item: item[1]))
@@ -157,16 +157,20 @@ def dir_coupler(layout, layer, cell, coupling_length, arm_lengths=16,
 
         sbend_output:   If 'pcell' is passed, s-bends generated as PCells. 
                         If 'path' is passed, s-bends generated as DPaths.
+                        If 'cell' is passed, s-bends are instances of cells
+                        shared by all identical s-bends in the layout, e.g.
+                        across a sweep of couplers (see 'paths.s_bend_cell').
                         <str>
                         (default: 'pcell')
     '''
-    if sbend_output == 'pcell':
+    if sbend_output in ('pcell', 'cell'):
         # Generate the DPaths defining the directional coupler.
         input1, straight1, output1, input2, straight2, output2 = \
             dir_coupler_pcell(
             layout, layer, coupling_length, arm_lengths=arm_lengths, 
             arm_heights=arm_heights, sep=sep, wg_width=wg_width,
-            seg_length=seg_length, n_pts=n_pts, origin=origin)
+            seg_length=seg_length, n_pts=n_pts, origin=origin,
+            sbend_output=sbend_output)
     elif sbend_output == 'path':
         # Generate the PCells and DPaths defining the directional coupler.
         input1, straight1, output1, input2, straight2, output2 = \
@@ -175,8 +179,8 @@ def dir_coupler(layout, layer, cell, coupling_length, arm_lengths=16,
             arm_heights=arm_heights, wg_width=wg_width, seg_length=seg_length,
             n_pts=n_pts, origin=origin)
     else:
-        raise ValueError("Expected one of the strings 'pcell' or 'path' to "
-            + "be passed to the argument 'sbend_output'."
+        raise ValueError("Expected one of the strings 'pcell', 'cell', or "
+            + "'path' to be passed to the argument 'sbend_output'."
             + "instead got '{}'.".format(sbend_output))
 
     if cell == 'divide':    # Divide coupler into 6 cells
@@ -189,7 +193,7 @@ def dir_coupler(layout, layer, cell, coupling_length, arm_lengths=16,
         cell_straight2 = layout.create_cell('straight2')
 
 
-        if sbend_output == 'pcell':
+        if sbend_output in ('pcell', 'cell'):
             cell_input1.insert(input1)
             cell_input2.insert(input2)
             cell_output1.insert(output1)
@@ -217,7 +221,7 @@ def dir_coupler(layout, layer, cell, coupling_length, arm_lengths=16,
     else:   # Insert the coupler into the passed cell
         # Insert the paths into the passed cell so that the user can customize
         # the coupler's placement in their layout by transforming the cell.
-        if sbend_output == 'pcell':
+        if sbend_output in ('pcell', 'cell'):
             cell.insert(input1)
             cell.insert(input2)
             cell.insert(output1)
@@ -397,7 +401,7 @@ def dir_coupler_path(layout, layer, coupling_length, sep=sep, arm_lengths=16,
 
 def dir_coupler_pcell(layout, layer, coupling_length, sep=sep, arm_lengths=16,
     arm_heights=8, wg_width=wg_width, seg_length=seg_length, n_pts=None, 
-    origin='port0'):
+    origin='port0', sbend_output='pcell'):
     '''
     Generates layout of a directional coupler like the one shown below. 
     Inserts the coupler into the passed cell and layer. The center of the 
@@ -469,6 +473,11 @@ def dir_coupler_pcell(layout, layer, coupling_length, sep=sep, arm_lengths=16,
                         <str>
                         (default: 'port0')
 
+        sbend_output:   The 'output' of 'paths.s_bend' for the s-bends, 
+                        either 'pcell' or 'cell'.
+                        <str>
+                        (default: 'pcell')
+
     
     Return: <tuple of pya.DCellInstArray objects>
         input1:     Lower-left s-bend
@@ -558,16 +567,16 @@ def dir_coupler_pcell(layout, layer, coupling_length, sep=sep, arm_lengths=16,
     # Generate each s-bend with the requested dimensions and positions
     input1 = paths.s_bend(layout, layer, length=arm_lengths[0], 
         height=arm_heights[0], wg_width=wg_width, seg_length=seg_length, 
-        n_pts=n_pts, trans=trans_in1)
+        n_pts=n_pts, trans=trans_in1, output=sbend_output)
     input2 = paths.s_bend(layout, layer, length=arm_lengths[1], 
         height=arm_heights[1], wg_width=wg_width, seg_length=seg_length, 
-        n_pts=n_pts, trans=trans_in2)
+        n_pts=n_pts, trans=trans_in2, output=sbend_output)
     output1 = paths.s_bend(layout, layer, length=arm_lengths[2], 
         height=arm_heights[2], wg_width=wg_width, seg_length=seg_length, 
-        n_pts=n_pts, trans=trans_out1)
+        n_pts=n_pts, trans=trans_out1, output=sbend_output)
     output2 = paths.s_bend(layout, layer, length=arm_lengths[3], 
         height=arm_heights[3], wg_width=wg_width, seg_length=seg_length, 
-        n_pts=n_pts, trans=trans_out2)
+        n_pts=n_pts, trans=trans_out2, output=sbend_output)
 
 
     straight1 = pya.DCellInstArray(straight_bottom_cell.cell_index(), trans_str1)
@@ -2,6 +2,8 @@
 # in KLayout. The top-level functions are as follows:
 #
 #   round_path                      - wrapper around round path pcell.
+#   round_corners_coords            - rounds the corners of many polylines at
+#                                     once with numpy.
 #   delay_spiral                    - generates a delay spiral with constant
 #                                     waveguide separation.
 #   parabolic_taper                 - generates a taper with parabolic profile
@@ -52,7 +54,16 @@
 import pya
 import math as ma
 import numpy as np
+import json
+import hashlib
+import time
+import timeit
+import concurrent.futures
+import functools
+import weakref
 import chickpea.scipy_relex as relex
+from chickpea import caching
+from chickpea import conversion
 from chickpea.constants import *
 from chickpea.transforms import null_trans
 
@@ -67,7 +78,9 @@ def delay_spiral(layout, layer, cell, arc_length, min_spacing,
     origin='center', trans=null_trans,
     verbose=False, garrulous=False,
     max_turns=50, max_iterations=100,
-    sbend_output='pcell'):
+    sbend_output='pcell', segmentation='sampled', alength_table=None,
+    trace=None, trim_mode='spacing', trim_axis='vertical', max_sagitta=None,
+    chunk_segments=None):
     '''
     Populates 'cell' with a delay spiral composed of two intertwined extended
     arithmetic/Archimedean spirals joined by an s-bend in the center. 
@@ -85,14 +98,21 @@ def delay_spiral(layout, layer, cell, arc_length, min_spacing,
     This function uses these initial parameter values:
         spacing b/w waveguide edges = min_spacing
         # of turns of each spiral   = 1
-    The number of turns is then incremented until adding another turn would 
-    overshoot the desired arc length. Once this coarse tuning is done, finer
-    tuning is done by iteratively changing the spacing. The correction to
-    the spacing at each iteration is proportional to the error in arc length.
-    The proportionality factor is determined by approximating the arc length
-    of the intertwined spirals as the circumference of concentric circles with
-    corresponding separations and innermost radius. Once adequate values for
-    the number of turns and spacing are found, they are passed to 
+    The number of turns is then set to the largest number that does not 
+    overshoot the desired arc length. This number is estimated analytically 
+    from the arc length of the one-turn spiral (see 
+    'delay_spiral_turns_estimate') and then bracketed between spirals that do 
+    and don't overshoot, which usually takes only two more evaluations of the
+    spiral geometry. Once this coarse tuning is done, finer
+    tuning is done by iteratively changing the spacing. The first correction
+    to the spacing is proportional to the error in arc length, with the
+    proportionality factor determined by approximating the arc length of the
+    intertwined spirals as the circumference of concentric circles with
+    corresponding separations and innermost radius. After that, the spacing
+    is found with a secant method safeguarded by bisection (see 
+    'increasing_root'), which also converges when extensions or a radial
+    shift make the concentric circle approximation inaccurate. Once adequate
+    values for the number of turns and spacing are found, they are passed to 
     'delay_spiral_geo', along with the rest of the specified parameters.
 
     Args:
@@ -371,8 +391,46 @@ def delay_spiral(layout, layer, cell, arc_length, min_spacing,
                         <pya.DTrans object>
                         (default: transforms.null_trans)
 
+        segmentation:   How the spirals are divided into segments whose ends
+                        are tangent to the x and y axes, between which the
+                        straight extensions are inserted.
+
+                        'sampled':
+                            The tangent points are located among the sampled
+                            coordinates of the spirals (see 
+                            'arithmetic_spiral_segments'), so the spirals must
+                            be sampled densely enough for them to be found.
+
+                        'analytic':
+                            The angles of the tangent points are computed
+                            exactly and each segment is sampled separately
+                            (see 'arithmetic_spiral_curve_segments'), so the
+                            ends of the segments are exactly tangent to the 
+                            axes for any n_pts or seg_length.
+                            Since the arc length then doesn't depend on the
+                            sampling, the tuning computes it without building
+                            the geometry (see 
+                            'delay_spiral_geo_alength_analytic').
+                        <str>
+                        (default: 'sampled')
+
+        max_sagitta:    If given, the spirals are sampled with the fewest 
+                        points that keep the chords between them within 
+                        'max_sagitta' of the ideal spirals, so that points
+                        are spaced further apart where the spirals curve 
+                        less (see 'arithmetic_spiral_sagitta_thetas'), and
+                        n_pts and seg_length are ignored. If 'dbu', the 
+                        database unit of 'layout' is used, since smaller
+                        deviations can't be represented anyway. Works best
+                        with 'analytic' segmentation, since 'sampled' 
+                        segmentation locates the ends of the segments among
+                        the sparser points.
+                        <float or str or None>
+                        (default: None)
+
         verbose:        If True, prints concise updates on how the tuning is 
-                        going at each iteration of parameter values.
+                        going at each iteration of parameter values, and how
+                        many times the spiral geometry had to be evaluated.
                         <bool>
                         (default: False)
 
@@ -394,18 +452,73 @@ def delay_spiral(layout, layer, cell, arc_length, min_spacing,
                         <int>
                         (default: 100)
 
+        alength_table:  A table of arc lengths precomputed for the same 
+                        parameters by 'delay_spiral_alength_table', or the
+                        name of the file it was saved to. The number of turns
+                        is then read off the table, and the spacing is 
+                        interpolated from it and polished with typically one
+                        or two evaluations of the arc length. A ValueError is
+                        raised if the table was computed with different 
+                        parameters.
+                        <dict or str or None>
+                        (default: None)
+
+        trace:          Called with the following keyword arguments every time
+                        the arc length of a spiral is needed while tuning:
+                            target:     the desired arc length
+                            stage:      'coarse', 'fine', or 'trim'
+                            turns:      number of turns of the spiral
+                            spacing:    spacing between waveguide edges
+                            arc_length: arc length of the spiral
+                            error:      arc_length - target
+                            wall_time:  time taken to get the arc length, 
+                                        in seconds
+                            cached:     True if the arc length was already
+                                        known and not evaluated again
+                        Pass a 'TuningTrace' to record these for analysis.
+                        <function or TuningTrace or None>
+                        (default: None)
+
+        trim_mode:      If 'spacing', the arc length is fine tuned by 
+                        increasing the spacing from 'min_spacing'. If
+                        'extension', the spacing is kept at 'min_spacing' and
+                        the extensions along 'trim_axis' are all lengthened 
+                        by the same amount instead, which takes a single 
+                        evaluation of the arc length but makes the spiral 
+                        slightly non-square. See 'delay_spiral_alen_tuning'.
+                        <str>
+                        (default: 'spacing')
+
+        trim_axis:      Which extensions are lengthened when trim_mode is
+                        'extension', either 'vertical' or 'horizontal'.
+                        <str>
+                        (default: 'vertical')
+
         sbend_output:   If 'pcell' is passed, s-bends generated as PCells. 
                         If 'path' is passed, s-bends generated as DPaths.
+                        If 'polygon' is passed, s-bends generated as 
+                        DPolygons (see 's_bend_polygon'). If 'cell' is 
+                        passed, s-bends are instances of cells shared by
+                        identical s-bends (see 's_bend_cell').
                         <str>
                         (default: 'pcell')
 
+        chunk_segments: If given, each spiral arm is generated and inserted
+                        as several paths of this many segments, one at a 
+                        time (see 'delay_spiral_arm_chunks'), rather than as
+                        a single path, so the memory needed doesn't grow 
+                        with the number of turns. Requires 'analytic' 
+                        segmentation.
+                        <int or None>
+                        (default: None)
+
     Return:
         actual_alength: The arc length of the generated spiral
                         <float>
     '''
     # Tune the number of turns and spacing to meet arc length and minimum
     # spacing requriements.
-    turns, spacing, actual_alength = delay_spiral_alen_tuning(
+    solution = delay_spiral_alen_tuning(
         arc_length, min_spacing,
         radial_shift=radial_shift,
         port0_side=port0_side, port1_side=port1_side, 
@@ -414,37 +527,233 @@ def delay_spiral(layout, layer, cell, arc_length, min_spacing,
         horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
         xy_ext_arr=xy_ext_arr, alen_tolerance=alen_tolerance,
         wg_width=wg_width, n_pts=n_pts, seg_length=seg_length,
-        verbose=verbose, garrulous=garrulous)
+        verbose=verbose, garrulous=garrulous, 
+        max_turns=max_turns, max_iterations=max_iterations,
+        segmentation=segmentation, alength_table=alength_table, trace=trace, 
+        trim_mode=trim_mode, trim_axis=trim_axis, return_solution=True,
+        max_sagitta=layout.dbu if max_sagitta == 'dbu' else max_sagitta,
+        chunk_segments=chunk_segments)
+
+    # Now that we've got the parameters, generate the spiral. The tuning 
+    # already computed its coordinates and s-bend.
+    delay_spiral_geo(layout, layer, cell, origin=origin, trans=trans, 
+        sbend_output=sbend_output, solution=solution)
 
-    # Determine the end angles to supply to properly position the ports
-    fwd_port_locs = {   # forward spiral port locations
-        'bottom': 0,
-        'right':  90,
-        'top':    180,
-        'left':   270
-    }
+    # Return the actual pathlength of the generated spiral so the user can
+    # check it and use the actual length in calculations.
+    return solution.arc_length
 
-    rev_port_locs = {   # reverse spiral port locations
-        'top':    0,
-        'left':   90,
-        'bottom': 180,
-        'right':  270
-    }
 
-    # Now that we've got the parameters, generate the spiral.
-    delay_spiral_geo(layout, layer, cell, turns, spacing, 
-        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift, 
-        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
-        start_turn=start_turn, start_angle=start_angle, 
-        fwd_end_angle=fwd_port_locs[port0_side], 
-        rev_end_angle=rev_port_locs[port1_side],
-        radial_shift=radial_shift, xy_ext_arr=xy_ext_arr,
-        wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
-        origin=origin, trans=trans, sbend_output=sbend_output)
+def delay_spiral_bank(layout, layer, arc_lengths, min_spacing, cells=None,
+    cell_name='delay_spiral', max_workers=None,
+    alen_tolerance=0.1, radial_shift=0, 
+    port0_side='left', port1_side='bottom', 
+    vertical=0, horizontal=0, quad_shift=0,
+    horizontal_mode='symmetric', vertical_mode='symmetric', xy_ext_arr=None,
+    start_turn=1, start_angle=0, 
+    wg_width=wg_width, n_pts=None, seg_length=seg_length, 
+    origin='center', trans=null_trans,
+    verbose=False, garrulous=False,
+    max_turns=50, max_iterations=100,
+    sbend_output='pcell', segmentation='sampled', alength_table=None,
+    trace=None, trim_mode='spacing', trim_axis='vertical', max_sagitta=None,
+    chunk_segments=None):
+    '''
+    Generates a bank of delay spirals with different arc lengths and 
+    otherwise identical parameters, one per cell, as 'delay_spiral' does for
+    a single spiral.
 
-    # Return the actual pathlength of the generated spiral so the user can
-    # check it and use the actual length in calculations.
-    return actual_alength
+    Tuning the number of turns and spacing of each spiral (see 
+    'delay_spiral_alen_tuning') only involves numpy, so the spirals are 
+    tuned in parallel by a pool of worker processes. The geometry is then 
+    generated in this process, since KLayout objects can't be shared with 
+    the workers.
+
+    Args:
+        layout:         Layout object for instantiation
+                        <pya.Layout object>
+
+        layer:          The index of the layer to insert the paths into (this
+                        is what's returned by layout.layer())
+                        <int>
+
+        arc_lengths:    Desired arc length of each spiral in the bank.
+                        <list or 1D np.ndarray of floats>
+
+        min_spacing:    See 'delay_spiral'.
+                        <float or int>
+
+        cells:          Cells to insert the spirals into, one per arc length.
+                        If None, cells named '<cell_name>_<index>' are 
+                        created in 'layout' once all spirals are tuned, so
+                        no cells are created if tuning fails.
+                        <list of pya.Cell objects or None>
+                        (default: None)
+
+        cell_name:      Prefix of the names of the cells created when 'cells'
+                        is None.
+                        <str>
+                        (default: 'delay_spiral')
+
+        max_workers:    Number of worker processes used for tuning. If None,
+                        the number of processors on the machine is used. If 
+                        1, the spirals are tuned in this process without a 
+                        pool, which is necessary where new processes can't be
+                        started, e.g. in some embedded python interpreters.
+                        <int or None>
+                        (default: None)
+
+        trace:          See 'delay_spiral_alen_tuning'. Since the spirals are
+                        tuned in other processes, each one is recorded by a 
+                        separate 'TuningTrace', and 'trace' is called with 
+                        the records once all spirals are tuned.
+                        <function or TuningTrace or None>
+                        (default: None)
+
+        verbose,
+        garrulous:      See 'delay_spiral'. The updates are printed by the
+                        worker processes, so those of different spirals may
+                        be interleaved.
+                        <bool>
+                        (default: False)
+
+        The remaining arguments are the same as for 'delay_spiral', and are
+        shared by all spirals in the bank. Any exception raised while tuning
+        a spiral is raised here. Before any spiral is tuned, a ValueError is
+        raised if some of them are predicted to fail (see 
+        'delay_spiral_feasibility').
+
+    Return:
+        cells:          The cells containing each spiral.
+                        <list of pya.Cell objects>
+
+        actual_lengths: The arc length of each generated spiral.
+                        <1D np.ndarray>
+
+        tune_times:     Time taken to tune each spiral, in seconds.
+                        <1D np.ndarray>
+
+        build_times:    Time taken to generate the geometry of each spiral,
+                        in seconds.
+                        <1D np.ndarray>
+    '''
+    if cells is not None and len(cells) != len(arc_lengths):
+        raise ValueError(
+            "Got {} cells for {} arc lengths. ".format(
+                len(cells), len(arc_lengths))
+            + "Supply one cell per arc length.")
+
+    # Tuning arguments shared by all spirals
+    tuning_args = dict(min_spacing=min_spacing, 
+        alen_tolerance=alen_tolerance, radial_shift=radial_shift,
+        port0_side=port0_side, port1_side=port1_side, 
+        start_turn=start_turn, start_angle=start_angle,
+        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+        xy_ext_arr=xy_ext_arr, wg_width=wg_width, n_pts=n_pts, 
+        seg_length=seg_length, verbose=verbose, garrulous=garrulous,
+        max_turns=max_turns, max_iterations=max_iterations, 
+        segmentation=segmentation, alength_table=alength_table, 
+        trim_mode=trim_mode, trim_axis=trim_axis, return_solution=True,
+        max_sagitta=layout.dbu if max_sagitta == 'dbu' else max_sagitta,
+        chunk_segments=chunk_segments)
+
+    # Check that every spiral can be generated before tuning any of them
+    feasible, min_length, max_length, bend_radius = delay_spiral_feasibility(
+        arc_lengths, min_spacing, radial_shift=radial_shift,
+        port0_side=port0_side, port1_side=port1_side,
+        start_turn=start_turn, start_angle=start_angle,
+        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+        xy_ext_arr=xy_ext_arr, alen_tolerance=alen_tolerance,
+        wg_width=wg_width, max_turns=max_turns)
+
+    if not np.all(feasible):
+        arc_lengths = np.asarray(arc_lengths, float)
+        out_of_range = np.isnan(bend_radius)
+        too_tight = ~feasible & ~out_of_range
+        raise ValueError(
+              "Can't generate delay spirals with arc lengths "
+            + "{} outside the feasible range ".format(
+                arc_lengths[out_of_range].tolist())
+            + "of {} to {} um, or with arc lengths ".format(
+                min_length, max_length - alen_tolerance)
+            + "{} whose s-bends would have bend radii ".format(
+                arc_lengths[too_tight].tolist())
+            + "{} below the minimum of {} um. ".format(
+                bend_radius[too_tight].tolist(), min_bend_radius)
+            + "See 'delay_spiral_feasibility'.")
+
+    # Load the table once rather than in every worker
+    if isinstance(alength_table, str):
+        tuning_args['alength_table'] = \
+            delay_spiral_load_alength_table(alength_table)
+
+    all_args = [dict(tuning_args, arc_length=arc_length,
+                     trace=None if trace is None else TuningTrace())
+                for arc_length in arc_lengths]
+
+    if max_workers == 1:
+        results = [delay_spiral_bank_tuning(args) for args in all_args]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers) as pool:
+            results = list(pool.map(delay_spiral_bank_tuning, all_args))
+
+    # Only create cells once every spiral is tuned
+    if cells is None:
+        cells = [layout.create_cell("{}_{}".format(cell_name, i)) 
+                 for i in range(len(arc_lengths))]
+
+    actual_lengths = np.empty(len(cells))
+    tune_times = np.empty(len(cells))
+    build_times = np.empty(len(cells))
+
+    for i, (cell, result) in enumerate(zip(cells, results)):
+        solution, tune_times[i], records = result
+        actual_lengths[i] = solution.arc_length
+
+        if trace is not None:
+            for record in records:
+                trace(**record)
+
+        # The workers already computed the coordinates and s-bend
+        start = time.perf_counter()
+        delay_spiral_geo(layout, layer, cell, origin=origin, trans=trans, 
+            sbend_output=sbend_output, solution=solution)
+        build_times[i] = time.perf_counter() - start
+
+    return cells, actual_lengths, tune_times, build_times
+
+
+def delay_spiral_bank_tuning(tuning_args):
+    '''
+    Tunes one spiral of a bank generated by 'delay_spiral_bank'. This is 
+    run by the worker processes, so it must be defined at the top level of
+    the module.
+
+    Args:
+        tuning_args:    Arguments to 'delay_spiral_alen_tuning'.
+                        <dict>
+
+    Return:
+        solution:       As returned by 'delay_spiral_alen_tuning'.
+                        <SpiralSolution or tuple>
+
+        tune_time:      Time taken to tune the spiral, in seconds.
+                        <float>
+
+        records:        The records of the 'TuningTrace' passed as 'trace', 
+                        if any.
+                        <list of dicts or None>
+    '''
+    start = time.perf_counter()
+    solution = delay_spiral_alen_tuning(**tuning_args)
+    tune_time = time.perf_counter() - start
+
+    trace = tuning_args.get('trace')
+    records = None if trace is None else trace.records
+
+    return solution, tune_time, records
 
 
 def delay_spiral_alen_tuning(arc_length, min_spacing,
@@ -455,7 +764,10 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
     xy_ext_arr=None, alen_tolerance=0.1,
     wg_width=wg_width, n_pts=None, seg_length=seg_length,
     verbose=False, garrulous=False,
-    max_turns=50, max_iterations=100):
+    max_turns=50, max_iterations=100, segmentation='sampled',
+    alength_table=None, warm_start=None, trace=None,
+    trim_mode='spacing', trim_axis='vertical', return_solution=False,
+    max_sagitta=None, chunk_segments=None):
     '''
     This function takes the parameters supplied to 'delay_spiral' and
     converts them into an equivalent set of parameters to 'delay_spiral_geo'.
@@ -472,16 +784,30 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
     This function uses these initial parameter values:
         spacing b/w waveguide edges = min_spacing
         # of turns of each spiral   = 1
-    The number of turns is then incremented until adding another turn would 
-    overshoot the desired arc length. Once this coarse tuning is done, finer
-    tuning is done by iteratively changing the spacing. The correction to
-    the spacing at each iteration is proportional to the error in arc length.
-    The proportionality factor is determined by approximating the arc length
-    of the intertwined spirals as the circumference of concentric circles with
-    corresponding separations and innermost radius. Once adequate values for
-    the number of turns and spacing are found, they are returned, along with
-    the actual arc length that those values would give if passed as arguments
-    to 'delay_spiral_geo'.
+    The number of turns is then set to the largest number that does not 
+    overshoot the desired arc length. This number is estimated analytically 
+    from the arc length of the one-turn spiral (see 
+    'delay_spiral_turns_estimate') and then bracketed between spirals that do 
+    and don't overshoot, which usually takes only two more evaluations of the
+    spiral geometry. Once this coarse tuning is done, finer
+    tuning is done by iteratively changing the spacing. The first correction
+    to the spacing is proportional to the error in arc length, with the
+    proportionality factor determined by approximating the arc length of the
+    intertwined spirals as the circumference of concentric circles with
+    corresponding separations and innermost radius. After that, the spacing
+    is found with a secant method safeguarded by bisection (see 
+    'increasing_root'), which also converges when extensions or a radial
+    shift make the concentric circle approximation inaccurate. Once adequate
+    values for the number of turns and spacing are found, they are returned,
+    along with the actual arc length that those values would give if passed
+    as arguments to 'delay_spiral_geo'.
+
+    Alternatively, with trim_mode='extension', the spacing is kept at 
+    'min_spacing' and the fine tuning is instead done by lengthening every
+    vertical or horizontal extension by the same amount. The arc length 
+    grows linearly with it (see 'delay_spiral_ext_counts'), so the amount is
+    solved for directly and checked with a single evaluation of the arc 
+    length, at the cost of a slightly non-square spiral.
 
     Args:
         arc_length:    Length along the spine of the delay spiral path.
@@ -730,8 +1056,39 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
                         <float or int>
                         (default: constants.seg_length == 1.0)
 
+        segmentation:   How the spirals are divided into segments whose ends
+                        are tangent to the x and y axes, between which the
+                        straight extensions are inserted.
+
+                        'sampled':
+                            The tangent points are located among the sampled
+                            coordinates of the spirals (see 
+                            'arithmetic_spiral_segments'), so the spirals must
+                            be sampled densely enough for them to be found.
+
+                        'analytic':
+                            The angles of the tangent points are computed
+                            exactly and each segment is sampled separately
+                            (see 'arithmetic_spiral_curve_segments'), so the
+                            ends of the segments are exactly tangent to the 
+                            axes for any n_pts or seg_length.
+                            Since the arc length then doesn't depend on the
+                            sampling, the tuning computes it without building
+                            the geometry (see 
+                            'delay_spiral_geo_alength_analytic').
+                        <str>
+                        (default: 'sampled')
+
+        max_sagitta:    If given, the spirals are sampled with the fewest 
+                        points that keep the chords between them within 
+                        'max_sagitta' of the ideal spirals, and n_pts and 
+                        seg_length are ignored. See 'delay_spiral_geo'.
+                        <float or None>
+                        (default: None)
+
         verbose:        If True, prints concise updates on how the tuning is 
-                        going at each iteration of parameter values.
+                        going at each iteration of parameter values, and how
+                        many times the spiral geometry had to be evaluated.
                         <bool>
                         (default: False)
 
@@ -753,6 +1110,85 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
                         <int>
                         (default: 100)
 
+        alength_table:  A table of arc lengths precomputed for the same 
+                        parameters by 'delay_spiral_alength_table', or the
+                        name of the file it was saved to. The number of turns
+                        is then read off the table, and the spacing is 
+                        interpolated from it and polished with typically one
+                        or two evaluations of the arc length. A ValueError is
+                        raised if the table was computed with different 
+                        parameters.
+                        <dict or str or None>
+                        (default: None)
+
+        warm_start:     Arc lengths already computed for spirals with the 
+                        same parameters, keyed by (turns, spacing between 
+                        waveguide centers). They're used in place of 
+                        evaluating the arc length again and to start the
+                        tuning near the solution, and every arc length 
+                        evaluated is added to the dict. Passing the same dict
+                        when tuning to a sequence of arc lengths therefore
+                        carries each solution over to the next. See 
+                        'DelaySpiralTuner'.
+                        <dict or None>
+                        (default: None)
+
+        trace:          Called with the following keyword arguments every time
+                        the arc length of a spiral is needed while tuning:
+                            target:     the desired arc length
+                            stage:      'coarse', 'fine', or 'trim'
+                            turns:      number of turns of the spiral
+                            spacing:    spacing between waveguide edges
+                            arc_length: arc length of the spiral
+                            error:      arc_length - target
+                            wall_time:  time taken to get the arc length, 
+                                        in seconds
+                            cached:     True if the arc length was already
+                                        known and not evaluated again
+                        Pass a 'TuningTrace' to record these for analysis.
+                        <function or TuningTrace or None>
+                        (default: None)
+
+        trim_mode:      How the arc length is fine tuned once the number of
+                        turns is found.
+
+                        'spacing':
+                            The spacing between the arms of the spirals is
+                            increased from 'min_spacing'.
+
+                        'extension':
+                            The spacing is kept at 'min_spacing', and the
+                            extensions along 'trim_axis' are all lengthened
+                            by the same amount. Can't be used with 
+                            'xy_ext_arr', and requires return_solution to 
+                            be True, since the trimmed extensions aren't 
+                            part of the plain return value.
+                        <str>
+                        (default: 'spacing')
+
+        trim_axis:      Which extensions are lengthened when trim_mode is
+                        'extension', either 'vertical' or 'horizontal'.
+                        <str>
+                        (default: 'vertical')
+
+        return_solution: If True, a 'SpiralSolution' holding the tuned
+                        spiral is returned instead, which can be passed to
+                        'delay_spiral_geo' to generate it without computing
+                        it again. With sampled segmentation, the spirals are
+                        then evaluated with 'delay_spiral_geo_solution', and
+                        the solution of the last one is kept, which is
+                        usually the tuned one.
+                        <bool>
+                        (default: False)
+
+        chunk_segments: Passed to 'delay_spiral_geo_solution' for the 
+                        returned solution, so that the spiral arms are 
+                        generated in chunks of this many segments when it's
+                        passed to 'delay_spiral_geo'. Requires 'analytic'
+                        segmentation. Only used if return_solution is True.
+                        <int or None>
+                        (default: None)
+
     Return:
         turns:          The computed number of turns for each spiral so
                         that, when 'turns' is passed along with 'spacing' to 
@@ -767,9 +1203,34 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
         tuned_length:   The actual arc length of the delay spiral generated
                         when 'turns' and 'spacing' are passed to 
                         'delay_spiral_geo'.
+
+        When trim_mode is 'extension', the trimmed extensions also have to be
+        passed to 'delay_spiral_geo', so only the 'SpiralSolution' is 
+        returned (see 'return_solution'). They're held by its 'vertical' and
+        'horizontal' attributes.
     '''
     if min_spacing < 0: raise ValueError("min_spacing must be positive.")
 
+    if trim_mode not in ('spacing', 'extension'):
+        raise ValueError("trim_mode must be 'spacing' or 'extension', "
+            + "not '{}'.".format(trim_mode))
+
+    if trim_mode == 'extension':
+        if trim_axis not in ('vertical', 'horizontal'):
+            raise ValueError("trim_axis must be 'vertical' or 'horizontal', "
+                + "not '{}'.".format(trim_axis))
+        if xy_ext_arr is not None:
+            raise ValueError("trim_mode='extension' can't be used with "
+                + "'xy_ext_arr'.")
+        if not return_solution:
+            raise ValueError("trim_mode='extension' requires "
+                + "return_solution=True, since the trimmed extensions are "
+                + "only returned with the SpiralSolution.")
+
+    if chunk_segments is not None and segmentation != 'analytic':
+        raise ValueError("'chunk_segments' requires 'analytic' "
+            + "segmentation.")
+
     # Determine the end angles to supply to properly position the ports
     fwd_port_locs = {
         'bottom': 0,
@@ -785,21 +1246,144 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
         'right': 270
     }
 
-    turns = 1               # initialize the number of turns to 1
+    # Every evaluation of the arc length builds the full spiral geometry, so
+    # count them to keep track of how much work the tuning is doing.
+    evaluations = 0
 
-    # initialize spacing to the minimum spacing between waveguide centers
-    # (must add wg_width since min_spacing argument is spacing edge-to-edge)
-    spacing = min_spacing + wg_width
+    geo_alength = delay_spiral_alength_func(segmentation)
 
-    tuned_length = delay_spiral_geo_alength(turns, spacing - wg_width, 
-        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift, 
+    # Arguments describing the spiral, other than the number of turns, the
+    # spacing and the extensions
+    spiral_args = dict(quad_shift=quad_shift, 
         horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
         start_turn=start_turn, start_angle=start_angle, 
         fwd_end_angle=fwd_port_locs[port0_side], 
         rev_end_angle=rev_port_locs[port1_side],
         radial_shift=radial_shift, xy_ext_arr=xy_ext_arr,
         wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
-        verbose=garrulous)
+        segmentation=segmentation, max_sagitta=max_sagitta)
+
+    # The solution of the spiral evaluated last, keyed by its turns, spacing
+    # between waveguide centers and trim, when it's kept (see 
+    # 'return_solution').
+    last_solution = None
+
+    # Arc lengths that are already known, keyed by the number of turns and 
+    # the spacing between waveguide centers, so they needn't be evaluated 
+    # again. These come from 'warm_start' and 'alength_table', and every
+    # new evaluation is added.
+    known_lengths = {} if warm_start is None else warm_start
+
+    # Stage of the tuning reported to 'trace'
+    stage = 'coarse'
+
+    def trimmed(extension, trim):
+        '''Lengthens every entry of 'vertical' or 'horizontal' by 'trim' '''
+        if isinstance(extension, np.ndarray):
+            return extension.astype(float) + trim
+        return extension + trim
+    #enddef
+
+    def trimmed_extensions(trim):
+        '''Extension arguments with those along 'trim_axis' trimmed'''
+        if trim == 0:
+            return dict(vertical=vertical, horizontal=horizontal)
+        elif trim_axis == 'vertical':
+            return dict(vertical=trimmed(vertical, trim), 
+                        horizontal=horizontal)
+        else:
+            return dict(vertical=vertical, 
+                        horizontal=trimmed(horizontal, trim))
+    #enddef
+
+    def alength(turns, spacing, trim=0):
+        '''
+        Arc length given the spacing between waveguide centers, with the
+        extensions along 'trim_axis' lengthened by 'trim'. Trimmed spirals
+        aren't added to the known arc lengths, which are all untrimmed.
+        '''
+        nonlocal evaluations, last_solution
+        start = time.perf_counter()
+        cached = trim == 0 and (turns, spacing) in known_lengths
+
+        if not cached:
+            evaluations += 1
+
+            # Evaluating a sampled spiral computes its geometry anyway
+            if return_solution and segmentation == 'sampled':
+                solution = delay_spiral_geo_solution(turns, 
+                    spacing - wg_width, verbose=garrulous, 
+                    **trimmed_extensions(trim), **spiral_args)
+                last_solution = (turns, spacing, trim), solution
+                length = solution.arc_length
+            else:
+                length = geo_alength(turns, spacing - wg_width, 
+                    verbose=garrulous, **trimmed_extensions(trim), 
+                    **spiral_args)
+
+            if trim == 0: 
+                known_lengths[turns, spacing] = length
+        else:
+            length = known_lengths[turns, spacing]
+
+        if trace is not None:
+            trace(target=arc_length, stage=stage, turns=turns, 
+                spacing=spacing - wg_width, arc_length=length, 
+                error=length - arc_length, 
+                wall_time=time.perf_counter() - start, cached=cached)
+
+        return length
+    #enddef
+
+    def solve(turns, spacing, trim=0):
+        '''Solution of the tuned spiral, reusing the last one if possible'''
+        if last_solution is not None and \
+           last_solution[0] == (turns, spacing, trim):
+            return last_solution[1]
+
+        return delay_spiral_geo_solution(turns, spacing - wg_width, 
+            chunk_segments=chunk_segments, **trimmed_extensions(trim), 
+            **spiral_args)
+    #enddef
+
+    # initialize spacing to the minimum spacing between waveguide centers
+    # (must add wg_width since min_spacing argument is spacing edge-to-edge)
+    spacing = min_spacing + wg_width
+
+    if alength_table is not None:
+        if isinstance(alength_table, str):
+            alength_table = delay_spiral_load_alength_table(alength_table)
+
+        key, params = delay_spiral_alength_table_key(
+            min_spacing=min_spacing, 
+            port0_side=port0_side, port1_side=port1_side, 
+            radial_shift=radial_shift, 
+            start_turn=start_turn, start_angle=start_angle,
+            vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+            horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+            xy_ext_arr=xy_ext_arr, wg_width=wg_width, 
+            n_pts=n_pts, seg_length=seg_length, segmentation=segmentation,
+            max_sagitta=max_sagitta)
+
+        if key != alength_table['key']:
+            raise ValueError(
+                "The arc length table was computed for parameters "
+                + "{} but the spiral has ".format(alength_table['params'])
+                + "parameters {}. Recompute the table with ".format(params)
+                + "'delay_spiral_alength_table'.")
+
+        # Table columns are edge-to-edge spacings starting at min_spacing, 
+        # and rows are numbers of turns. The arc lengths at the minimum 
+        # spacing are all needed for coarse tuning, but only one row is
+        # needed for fine tuning, so that's added later.
+        table_turns = [int(n) for n in alength_table['turns']]
+        table_spacings = alength_table['spacings'] + wg_width
+        table_lengths = alength_table['lengths']
+
+        known_lengths.update(((n, spacing), length) 
+            for n, length in zip(table_turns, table_lengths[:, 0]))
+
+    tuned_length = alength(1, spacing)
 
     upper_bound = arc_length + alen_tolerance
 
@@ -820,66 +1404,156 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
         print("Begin coarse tuning:")
         print("====================")
 
-    while True:
-        # Compute what the length would be upon adding an extra turn.
-        next_turn_length = delay_spiral_geo_alength(
-            turns + 1, spacing - wg_width, 
-            vertical=vertical, horizontal=horizontal, quad_shift=quad_shift, 
-            horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
-            start_turn=start_turn, start_angle=start_angle, 
-            fwd_end_angle=fwd_port_locs[port0_side], 
-            rev_end_angle=rev_port_locs[port1_side],
-            radial_shift=radial_shift, xy_ext_arr=xy_ext_arr,
-            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
-            verbose=garrulous)
+    # Length added to the spiral by the straight extensions in each turn. This
+    # only informs the initial estimate of the number of turns, so an average
+    # over the turns is good enough.
+    ext_per_turn = delay_spiral_ext_per_turn(vertical, horizontal, xy_ext_arr)
+
+    # We're looking for the number of turns 'turns' such that
+    #     alength(turns, spacing) < upper_bound <= alength(turns + 1, spacing)
+    # The lower end of this bracket is known to start with, since we've
+    # already checked that one turn doesn't overshoot. Each geometry
+    # evaluation either raises the lower end or lowers the upper end of the
+    # bracket, and the next number of turns to try is estimated analytically
+    # from the most recently evaluated spiral.
+    turns = 1
+    upper_turns = None
+
+    # Narrow the bracket as far as the arc lengths already known at the 
+    # minimum spacing allow. The search below only continues if they don't 
+    # close it.
+    for (known_turns, known_spacing), length in known_lengths.items():
+        if known_spacing != spacing: 
+            continue
+        if length < upper_bound and known_turns > turns:
+            turns, tuned_length = known_turns, length
+        elif length >= upper_bound and \
+             (upper_turns is None or known_turns < upper_turns):
+            upper_turns = known_turns
+
+    if turns > max_turns:
+        raise TimeoutError(
+            "Exceeded {} turns. Terminating iteration.".format(max_turns))
+
+    ref_turns, ref_length = turns, tuned_length
+
+    while upper_turns is None or upper_turns - turns > 1:
+        guess = int(ma.floor(delay_spiral_turns_estimate(
+            upper_bound, ref_turns, ref_length, spacing, 
+            radial_shift=radial_shift, start_turn=start_turn, 
+            start_angle=start_angle, ext_per_turn=ext_per_turn)))
+
+        # Keep the guess inside the bracket. If the estimate says we've 
+        # already found the right number of turns, check the next one up to 
+        # close the bracket.
+        guess = max(guess, turns + 1)
+        if upper_turns is not None: guess = min(guess, upper_turns - 1)
+        guess = min(guess, max_turns + 1)
+
+        guess_length = alength(guess, spacing)
+        ref_turns, ref_length = guess, guess_length
+
+        if verbose:
+            print("Turns: {}".format(guess))
+            print("Arc length: {}".format(guess_length))
+            print("------------------------------------")
+
+        if guess_length < upper_bound:
+            turns, tuned_length = guess, guess_length
+            if turns > max_turns:
+                raise TimeoutError(
+                    "Exceeded {} turns. Terminating iteration.".format(
+                    max_turns))
+        else:
+            upper_turns = guess
+    #endwhile
+
+    if verbose:
+        print("Coarse tuning settled on {} turns ".format(turns)
+            + "after {} geometry evaluations.".format(evaluations))
+
+
+    #
+    # Alternatively, do fine arc length tuning by lengthening the extensions
+    #
+
+    if trim_mode == 'extension':
+        trim_iterations = 0
+        stage = 'trim'
+
+        if verbose:
+            print("Begin extension trimming:")
+            print("=========================")
+
+        def trim_alength(trim):
+            '''Arc length at the tuned number of turns, w/ progress updates'''
+            nonlocal trim_iterations
+            trim_iterations += 1
+            if trim_iterations > max_iterations:
+                raise TimeoutError('Exceeded {} trimming iterations.'.format(
+                    max_iterations))
 
-        # If it hasn't gone beyond the upper bound, update the actual
-        # number of turns
-        if next_turn_length < upper_bound:
-            turns += 1
-            tuned_length = next_turn_length
+            tuned_length = alength(turns, spacing, float(trim))
 
             if verbose:
-                print("Turns: {}".format(turns))
-                print("Arc length: {}".format(tuned_length))
-                print("------------------------------------")
-        # Otherwise, stop rough tuning without updating to the number of
-        # turns that made the tuned length exceed the desired arc length.
-        else: break
-        if turns > max_turns:
-            raise TimeoutError("Exceeded 50 turns. Terminating iteration.")
-    #endwhile
+                print("Iteration #: {}".format(trim_iterations))
+                print("Added {} extension: {} um".format(trim_axis, trim))
+                print("Arc length: {} um".format(tuned_length))
+                print("-----------------------------------------")
+
+            return tuned_length
+        #enddef
+
+        trim = 0
+        al_err = arc_length - tuned_length
+
+        if np.abs(al_err) > alen_tolerance:
+            # Every extension along the trim axis adds the trim to the arc 
+            # length, so the first guess is exact unless the extensions are
+            # negative or the sampling of the spirals changes.
+            n_vertical, n_horizontal = delay_spiral_ext_counts(turns, 
+                spacing - wg_width, radial_shift=radial_shift, 
+                start_turn=start_turn, start_angle=start_angle,
+                fwd_end_angle=fwd_port_locs[port0_side], 
+                rev_end_angle=rev_port_locs[port1_side], wg_width=wg_width)
+            n_ext = n_vertical if trim_axis == 'vertical' else n_horizontal
+
+            if n_ext == 0:
+                raise ValueError("A spiral with {} turns has no ".format(turns)
+                    + "{} extensions to trim. Try trimming ".format(trim_axis)
+                    + "the other axis or trim_mode='spacing'.")
+
+            trim, tuned_length = increasing_root(trim_alength, arc_length, 
+                alen_tolerance, 0, tuned_length, al_err / n_ext)
+
+        trim = float(trim)
+
+        if verbose: 
+            print("Done! {} geometry evaluations in total.".format(evaluations))
+
+        return solve(turns, spacing, trim)
 
 
     #
     # Do fine arc length tuning by adjusting the spacing between turns
     #
 
-    al_err = arc_length - tuned_length
     fine_iterations = 0
+    stage = 'fine'
 
     if verbose:
         print("Begin fine tuning:")
         print("==================")
 
-    while np.abs(al_err) > alen_tolerance:
-        # This estimate of how to adjust spacing to tweak the arc length is
-        # obtained by approximating the spiral arc length as the total 
-        # circumference of concentric circles.
-        spacing += al_err / (4 * np.pi * turns * (2 * turns + 1))
-
-        tuned_length = delay_spiral_geo_alength(turns, spacing - wg_width, 
-            vertical=vertical, horizontal=horizontal, quad_shift=quad_shift, 
-            horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
-            start_turn=start_turn, start_angle=start_angle, 
-            fwd_end_angle=fwd_port_locs[port0_side], 
-            rev_end_angle=rev_port_locs[port1_side],
-            radial_shift=radial_shift, xy_ext_arr=xy_ext_arr,
-            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
-            verbose=garrulous)
-
-        al_err = arc_length - tuned_length
+    def fine_alength(spacing):
+        '''Arc length at the tuned number of turns, w/ progress updates'''
+        nonlocal fine_iterations
         fine_iterations += 1
+        if fine_iterations > max_iterations:
+            raise TimeoutError(
+                'Exceeded {} fine tuning iterations.'.format(max_iterations))
+
+        tuned_length = alength(turns, spacing)
 
         if verbose:
             print("Iteration #: {}".format(fine_iterations))
@@ -887,80 +1561,942 @@ def delay_spiral_alen_tuning(arc_length, min_spacing,
             print("Arc length: {} um".format(tuned_length))
             print("-----------------------------------------")
 
-        if fine_iterations > max_iterations:
-            raise TimeoutError(
-                'Exceeded {} fine tuning iterations.'.format(max_iterations))
-    #endwhile
+        return tuned_length
+    #enddef
 
-    if verbose: print("Done!")
+    # Add the table's arc lengths for spirals with this number of turns
+    if alength_table is not None and turns in table_turns:
+        known_lengths.update(((turns, known_spacing), length) 
+            for known_spacing, length in zip(table_spacings, 
+                table_lengths[table_turns.index(turns)]))
 
-    return turns, spacing - wg_width, tuned_length
+    # Arc lengths already known for spirals with this number of turns, 
+    # sorted by spacing. This includes the one at the minimum spacing.
+    known_row = sorted((known_spacing, length) 
+        for (known_turns, known_spacing), length in known_lengths.items()
+        if known_turns == turns)
 
+    within = [(known_spacing, length) for known_spacing, length in known_row
+              if np.abs(arc_length - length) <= alen_tolerance]
+    below = [(known_spacing, length) for known_spacing, length in known_row
+             if length < arc_length]
+    above = [(known_spacing, length) for known_spacing, length in known_row
+             if length > arc_length]
 
-def delay_spiral_geo(layout, layer, cell, turns, spacing, vertical=0, 
-    horizontal=0, quad_shift=0, horizontal_mode='symmetric', 
-    vertical_mode='symmetric', start_turn=1, start_angle=0, fwd_end_angle=0, 
-    rev_end_angle=0, radial_shift=0, xy_ext_arr=None,
-    wg_width=wg_width, n_pts=None, seg_length=seg_length, 
-    origin='center', trans=null_trans, sbend_output='pcell'):
-    '''
-    Populates 'cell' with a delay spiral composed of two intertwined extended
-    arithmetic/Archimedean spirals joined by an s-bend in the center. 
+    if within:
+        spacing, tuned_length = within[0]
 
-    Parameters available to the user are directly related to the spiral 
-    geometry, hence the suffix '_geo'. For an equivalent parameter set 
-    optimized for photonic design, see 'delay_spiral'.
+    else:
+        # Seed the bracket for the root finder with the largest spacing 
+        # known to give an arc length that's too short. 
+        spacing, tuned_length = below[-1]
+        al_err = arc_length - tuned_length
 
-    Args:
-        layout:         Layout object for instantiation
-                        <pya.Layout object>
+        if above:
+            # Interpolate between the known arc lengths on either side.
+            above_spacing, above_length = above[0]
+            next_spacing = spacing + (above_spacing - spacing) * al_err / (
+                above_length - tuned_length)
 
-        layer:          The index of the layer to insert the path into (this
-                        is the value returned from the layout.layer() method).
-                        <int>
+        elif len(below) > 1:
+            # Extrapolate from the two largest known spacings, since the arc
+            # length is nearly linear in the spacing.
+            prev_spacing, prev_length = below[-2]
+            next_spacing = spacing + (spacing - prev_spacing) * al_err / (
+                tuned_length - prev_length)
 
-        cell:           Index of the cell to insert the directional coupler
-                        into (this is the value returned by the method
-                        'layout.create_cell').
-                        <int>
+        else:
+            # The first step is obtained by approximating the spiral arc 
+            # length as the total circumference of concentric circles. 
+            next_spacing = spacing + al_err / (
+                4 * np.pi * turns * (2 * turns + 1))
 
-        turns:          Number of full turns each spiral will make.
+        spacing, tuned_length = increasing_root(fine_alength, arc_length, 
+            alen_tolerance, spacing, tuned_length, next_spacing)
+
+    if verbose: 
+        print("Done! {} geometry evaluations in total.".format(evaluations))
+
+    if return_solution:
+        return solve(turns, spacing)
+
+    return turns, spacing - wg_width, tuned_length
+
+
+class SpiralSolution:
+    '''
+    Everything needed to generate a delay spiral, as computed by
+    'delay_spiral_geo_solution' and returned by 'delay_spiral_alen_tuning'
+    when 'return_solution' is True. Passing it as 'solution' to
+    'delay_spiral_geo' generates the spiral without recomputing any of it.
+    It holds only numbers, strings, and ndarrays, so it can be sent between
+    processes.
+
+    Attributes:
+        turns:          Number of full turns each spiral makes.
                         <int>
 
         spacing:        Distance between the edges of successive waveguides.
-                        <float or int>
+                        <float>
 
-        vertical:       Length of vertical straight segments to be inserted.
-                        This is done by shifting the segments of the spiral
-                        outwards from their original positions and letting
-                        them be implicitly stitched together when the coords
-                        are used to generate a path.
-                        If list, the nth entry specifies by how much the nth
-                        half of the spiral (imagining the spiral divided along
-                        the y axis) is shifted. The segments corresponding to
-                        the 0th entry are those in the first FULL half and the
-                        segment before the first full half, if there exists
-                        one. E.g., if the spiral's innermost segment is in 
-                        quadrant 1, and the spiral unwinds in the counter-
-                        clockwise direction, then the first three segments
-                        will be shifted as specified by the 0th entry in 
-                        'vertical' (i.e., the segments in quadrants 1, 2, 3),
-                        but if the spiral started in quadrant 2, only the
-                        firt two segments (in quadrants 2, 3) would be shifted
-                        by the 0th entry, as usual.
-                        If more values are supplied than turns, the extra
-                        value are ignored. If fewer values are supplied than
-                        turns, the function will raise an exception.
-                        <float or int or list>
-                        (default: 0)
+        arc_length:     Arc length of the delay spiral, as computed by
+                        'delay_spiral_geo_alength'.
+                        <float>
 
-        horizontal:     Length of horizontal straight segments to be inserted.
-                        This is done by shifting the segments of the spiral
-                        outwards from their original positions and letting
-                        them be implicitly stitched together when the coords
-                        are used to generate a path.
-                        If list, the nth entry specifies by how much the nth
-                        half of the spiral (imagining the spiral divided along
+        vertical, horizontal:
+                        Lengths of the vertical and horizontal extensions,
+                        including any trimming by 'delay_spiral_alen_tuning'.
+                        <float or int or np.ndarray>
+
+        wg_width:       Width of the waveguides.
+                        <float>
+
+        fwd_points, rev_points:
+                        Coordinates of the extended forward and reverse
+                        spirals, from their innermost points outwards.
+                        None if the spirals are generated in chunks.
+                        <2 x N np.ndarray or None>
+
+        fwd_boundaries, rev_boundaries:
+                        Indices of the first point of every segment of the
+                        spirals after the first, i.e. of the ends of the
+                        straight extensions. None if the spirals are 
+                        generated in chunks.
+                        <1D np.ndarray of ints or None>
+
+        s_bend_length, s_bend_height:
+                        Dimensions of the s-bend joining the spirals (see
+                        's_bend').
+                        <float>
+
+        s_bend_axis:    'x' or 'y', the axis along which the inner ports of
+                        the spirals point, and thus the s-bend's length runs.
+                        <str>
+
+        s_bend_position:
+                        Location of the s-bend's port 0.
+                        <np.ndarray of shape (2,)>
+
+        port0, port1:   Locations of the outer ports of the forward and
+                        reverse spirals.
+                        <np.ndarray of shape (2,)>
+
+        bbox:           Corners [[xmin, ymin], [xmax, ymax]] of the bounding
+                        box of the spiral arms, including the waveguide width.
+                        None if the spirals are generated in chunks.
+                        <np.ndarray of shape (2, 2) or None>
+
+        chunk_args:     Arguments to 'delay_spiral_arm_chunks' generating 
+                        the forward and reverse spirals, if they're generated
+                        in chunks (see 'delay_spiral_chunked_solution'), and
+                        None otherwise.
+                        <tuple of 2 dicts or None>
+    '''
+    __slots__ = ('turns', 'spacing', 'arc_length', 'vertical', 'horizontal',
+                 'wg_width', 'fwd_points', 'rev_points', 'fwd_boundaries',
+                 'rev_boundaries', 's_bend_length', 's_bend_height',
+                 's_bend_axis', 's_bend_position', 'port0', 'port1', 'bbox',
+                 'chunk_args')
+
+    def __init__(self, **attributes):
+        for name in self.__slots__:
+            setattr(self, name, attributes[name])
+
+    def __repr__(self):
+        return "SpiralSolution(turns={}, spacing={}, arc_length={})".format(
+            self.turns, self.spacing, self.arc_length)
+
+
+class TuningTrace:
+    '''
+    Records every arc length needed while tuning delay spirals, when passed
+    as 'trace' to 'delay_spiral_alen_tuning', 'delay_spiral', or 
+    'delay_spiral_bank'. Unlike the verbose output of those functions, the
+    records can be analyzed afterwards, e.g. to find which spirals converge
+    slowly and where the time spent tuning goes. One trace can record the 
+    tuning of any number of spirals, which are told apart by their target
+    arc length.
+
+    Attributes:
+        records:        One dict per arc length, with the entries described
+                        under 'trace' in 'delay_spiral_alen_tuning'.
+                        <list of dicts>
+    '''
+    # Fields of each record and their numpy dtypes
+    dtype = [
+        ('target', float),
+        ('stage', 'U6'),
+        ('turns', int),
+        ('spacing', float),
+        ('arc_length', float),
+        ('error', float),
+        ('wall_time', float),
+        ('cached', bool)]
+
+    def __init__(self):
+        self.records = []
+
+    def __call__(self, **record):
+        self.records.append(record)
+
+    def __len__(self):
+        return len(self.records)
+
+    def to_array(self):
+        '''
+        Returns the records as a numpy record array, so that e.g. 
+        trace.to_array().wall_time gives the time taken by every evaluation.
+        '''
+        names = [name for name, _ in self.dtype]
+        return np.array(
+            [tuple(record[name] for name in names) for record in self.records],
+            dtype=self.dtype).view(np.recarray)
+
+    def to_json(self, filename=None):
+        '''
+        Returns the records as a JSON list of objects, and also writes it to
+        'filename' if one is given.
+        '''
+        text = json.dumps([
+            {name: (value.item() if isinstance(value, np.generic) else value)
+             for name, value in record.items()}
+            for record in self.records])
+
+        if filename is not None:
+            with open(filename, 'w') as f:
+                f.write(text)
+
+        return text
+
+
+class DelaySpiralTuner:
+    '''
+    Tunes delay spirals sharing all parameters but their arc length, e.g. 
+    when sweeping the arc length, as 'delay_spiral_alen_tuning' does for a 
+    single spiral. Every arc length computed is remembered and passed to 
+    'delay_spiral_alen_tuning' as 'warm_start', so each tuning starts from 
+    the number of turns and spacing found by the previous ones. When the 
+    arc lengths are swept in order, this typically takes one or two
+    evaluations of the arc length per spiral. Sweeping in any other order is
+    still correct, since the bracket on the number of turns and the spacing
+    is built from all known arc lengths rather than the last solution alone.
+
+    Args:
+        min_spacing:    See 'delay_spiral_alen_tuning'.
+                        <float or int>
+
+        tuning_args:    Any other arguments to 'delay_spiral_alen_tuning', 
+                        except 'arc_length' and 'warm_start'.
+
+    Attributes:
+        known_lengths:  Every arc length computed, keyed by (turns, spacing
+                        between waveguide centers).
+                        <dict>
+
+        solution:       The last result of 'delay_spiral_alen_tuning', or
+                        None.
+                        <tuple or SpiralSolution or None>
+    '''
+    def __init__(self, min_spacing, **tuning_args):
+        self.min_spacing = min_spacing
+        self.tuning_args = tuning_args
+        self.known_lengths = {}
+        self.solution = None
+
+    def tune(self, arc_length):
+        '''
+        Returns the turns, spacing, and tuned length of the spiral with
+        'arc_length', as returned by 'delay_spiral_alen_tuning'.
+        '''
+        self.solution = delay_spiral_alen_tuning(arc_length, self.min_spacing,
+            warm_start=self.known_lengths, **self.tuning_args)
+
+        return self.solution
+
+    def reset(self):
+        '''Forgets all arc lengths computed so far'''
+        self.known_lengths.clear()
+        self.solution = None
+
+
+def increasing_root(func, target, tolerance, x0, y0, x1):
+    '''
+    Finds x > x0 such that func(x) is within 'tolerance' of 'target', where
+    'func' is an increasing function and func(x0) = y0 < target. This is a 
+    secant method safeguarded by bisection. Until an x with func(x) > target 
+    is found, secant steps extrapolate upwards from x0. Once the root is 
+    bracketed, secant steps that would leave the bracket, or that don't 
+    halve it within two steps, are replaced by bisection. This way the root
+    is found quickly when 'func' is smooth, and still reliably when it's 
+    only roughly linear or a bit noisy.
+
+    Args:
+        func:           Increasing function of a single float.
+                        <callable>
+
+        target:         Value of 'func' to find.
+                        <float>
+
+        tolerance:      Allowable deviation of func(x) from 'target'.
+                        <float>
+
+        x0:             Lower end of the search interval.
+                        <float>
+
+        y0:             func(x0), which must be less than 'target'.
+                        <float>
+
+        x1:             First point to evaluate. Must be greater than 'x0'.
+                        <float>
+
+    Return:
+        x:              The root.
+                        <float>
+
+        y:              func(x)
+                        <float>
+    '''
+    lo, f_lo = x0, y0 - target  # lower end of the bracket, func(lo) < target
+    hi = None                   # upper end of the bracket, func(hi) > target
+    prev_x, prev_f = lo, f_lo   # previous point for secant steps
+    slow_steps = 0              # steps that didn't halve the bracket
+
+    x = x1
+    while True:
+        y = func(x)
+        f = y - target
+        if np.abs(f) <= tolerance:
+            return x, y
+
+        width = None if hi is None else hi - lo
+        if f < 0:
+            lo, f_lo = x, f
+        else:
+            hi = x
+
+        # Secant step through the two most recent points
+        if f != prev_f:
+            next_x = x - f * (x - prev_x) / (f - prev_f)
+        else:
+            next_x = None
+        prev_x, prev_f = x, f
+
+        if hi is None:
+            # Not bracketed yet, so keep going up. If the secant doesn't 
+            # (which func being increasing shouldn't allow, barring noise),
+            # double the distance from the start instead.
+            if next_x is None or next_x <= lo:
+                next_x = lo + 2 * (lo - x0)
+        else:
+            if width is not None and hi - lo > width / 2:
+                slow_steps += 1
+            else:
+                slow_steps = 0
+
+            if next_x is None or not (lo < next_x < hi) or slow_steps >= 2:
+                next_x = (lo + hi) / 2
+                slow_steps = 0
+
+        x = next_x
+    #endwhile
+
+
+def delay_spiral_turns_estimate(arc_length, ref_turns, ref_length, spacing,
+    radial_shift=0, start_turn=1, start_angle=0, ext_per_turn=0):
+    '''
+    Estimates the (non-integer) number of turns at which the delay spiral 
+    reaches an arc length of 'arc_length', given the arc length 'ref_length'
+    of an already evaluated delay spiral with 'ref_turns' turns and the same
+    'spacing' and other parameters.
+
+    The arc length added by changing the number of turns is modelled as the
+    change in length of the two intertwined arithmetic spirals plus a fixed
+    amount of straight extensions per turn. Everything else that contributes
+    to the arc length (the s-bend, the partial segments at the ends of the 
+    spirals, etc.) is carried over from the reference spiral. Approximating
+    the spirals as concentric circles gives a quadratic in the number of
+    turns that is solved directly, and the result is then polished with a 
+    couple of Newton steps on the exact arithmetic spiral arc length.
+
+    Args:
+        arc_length:     The arc length the estimate should reach.
+                        <float>
+
+        ref_turns:      Number of turns of the reference delay spiral.
+                        <int>
+
+        ref_length:     Arc length of the reference delay spiral.
+                        <float>
+
+        spacing:        Distance between the centers of successive waveguides
+                        (NOT the edges, unlike 'delay_spiral_geo').
+                        <float or int>
+
+        radial_shift:   Shifts the radius uniformly. In the spiral equation
+                        r = b * theta + a, a = radial_shift.
+                        <float or int>
+                        (default: 0)
+
+        start_turn:     The turn of the spiral to start on.
+                        <int>
+                        (default: 1)
+
+        start_angle:    Angle in degrees at which spiral generation starts.
+                        <float or int>
+                        (default: 0)
+
+        ext_per_turn:   Length of straight extensions added to the delay
+                        spiral (both spirals together) per turn. See
+                        'delay_spiral_ext_per_turn'.
+                        <float or int>
+                        (default: 0)
+
+    Return:
+        The estimated number of turns.
+        <float>
+    '''
+    # Each of the intertwined spirals has twice the center-to-center spacing
+    b = spacing / np.pi
+    a = radial_shift
+    theta0 = ma.radians(360 * start_turn + start_angle)
+
+    # Length of both spirals as concentric circles, i.e., the integral of 
+    # r dtheta from theta0 to theta0 + 2 pi turns, written as a quadratic
+    # A turns^2 + B' turns in the number of turns.
+    A = 4 * np.pi**2 * b
+    B = 4 * np.pi * (a + b * theta0)
+    ref_circles = A * ref_turns**2 + B * ref_turns
+
+    # Solve for the arc length with the extensions included.
+    B += ext_per_turn
+    C = ref_length - ref_circles - ext_per_turn * ref_turns - arc_length
+    turns = (-B + np.sqrt(B**2 - 4 * A * C)) / (2 * A)
+
+    # Newton steps on the exact arc length of the spirals.
+    def spirals_alength(turns):
+        '''Arc length of both spirals without extensions'''
+        return 2 * arithmetic_spiral_alength(b, a, theta0, 
+            theta0 + 2 * np.pi * turns)
+
+    ref_spirals = spirals_alength(ref_turns)
+    for i in range(2):
+        model_length = ref_length + spirals_alength(turns) - ref_spirals \
+            + ext_per_turn * (turns - ref_turns)
+        end_radius = a + b * (theta0 + 2 * np.pi * turns)
+        slope = 4 * np.pi * np.sqrt(b**2 + end_radius**2) + ext_per_turn
+        turns -= (model_length - arc_length) / slope
+
+    return turns
+
+
+def delay_spiral_feasibility(arc_length, min_spacing, radial_shift=0,
+    port0_side='left', port1_side='bottom', start_turn=1, start_angle=0,
+    vertical=0, horizontal=0, quad_shift=0,
+    horizontal_mode='symmetric', vertical_mode='symmetric', xy_ext_arr=None,
+    alen_tolerance=0.1, wg_width=wg_width, max_turns=50):
+    '''
+    Predicts whether 'delay_spiral' can generate delay spirals with the
+    given arc lengths and parameters, without generating any geometry. Two
+    failures are checked for:
+
+        - The arc length is out of reach of 'delay_spiral_alen_tuning',
+          either because a spiral with one turn already overshoots it, or
+          because more than 'max_turns' turns, or more turns than extensions
+          given per turn cover, would be needed.
+
+        - The s-bend joining the spirals in the center has a bend radius
+          below constants.min_bend_radius, so 's_bend' raises once the 
+          spiral is tuned and its geometry is generated.
+
+    The arc lengths are evaluated analytically (see 
+    'delay_spiral_geo_alength_batch'), and the tuning is mimicked to predict
+    the number of turns and spacing of each spiral, at which the s-bend is
+    computed exactly from the innermost points of the spirals. With single
+    extension lengths for all turns, this takes a few vectorized evaluations
+    for all arc lengths together. With sampled segmentation, the arc lengths
+    of the tuned spirals differ slightly, so arc lengths right at the ends of
+    the feasible range, or giving a bend radius right at the minimum, may be
+    misjudged.
+
+    Negative extensions count towards the arc length by their absolute 
+    length, as in the generated geometry, and move the innermost points 
+    inwards, which can tighten the s-bend. For example, an arc length of 
+    307 um with a 'min_spacing' of 2 um, a 'radial_shift' of 1 um and 
+    'vertical' set to -2 um gives a bend radius of 4.87 um, and so is 
+    infeasible.
+
+    Args:
+        arc_length:     Desired arc length of each spiral to check.
+                        <float or np.ndarray>
+
+        min_spacing, radial_shift, port0_side, port1_side, start_turn,
+        start_angle, vertical, horizontal, quad_shift, horizontal_mode,
+        vertical_mode, xy_ext_arr, alen_tolerance, wg_width, max_turns:
+                        See 'delay_spiral_alen_tuning'. Extensions given per
+                        turn needn't cover max_turns + 1 turns; arc lengths
+                        needing more turns than they cover are infeasible.
+
+    Return:
+        feasible:       Whether each arc length can be generated.
+                        <bool or np.ndarray of bools>
+
+        min_length:     Smallest arc length that can be generated.
+                        <float>
+
+        max_length:     Largest arc length that can be generated.
+                        <float>
+
+        bend_radius:    Predicted bend radius of the center s-bend of each 
+                        spiral, or NaN where the arc length is out of reach.
+                        <float or np.ndarray>
+    '''
+    # Determine the end angles to supply to properly position the ports
+    fwd_port_locs = {
+        'bottom': 0,
+        'right': 90,
+        'top': 180,
+        'left': 270
+    }
+
+    rev_port_locs = {
+        'top': 0,
+        'left': 90,
+        'bottom': 180,
+        'right': 270
+    }
+
+    fwd_end_angle = fwd_port_locs[port0_side]
+    rev_end_angle = rev_port_locs[port1_side]
+
+    arc_length = np.asarray(arc_length, float)
+
+    per_turn = xy_ext_arr is not None or np.ndim(vertical) != 0 or \
+        np.ndim(horizontal) != 0
+
+    if not per_turn:
+        def alength(turns, spacing):
+            '''Arc lengths of many spirals at once'''
+            return delay_spiral_geo_alength_batch(turns, spacing, 
+                radial_shift=radial_shift, vertical=vertical, 
+                horizontal=horizontal, start_turn=start_turn, 
+                start_angle=start_angle, fwd_end_angle=fwd_end_angle, 
+                rev_end_angle=rev_end_angle, wg_width=wg_width)
+        #enddef
+    else:
+        # Extensions that vary by turn aren't supported by the batch 
+        # evaluation, so the spirals are evaluated one at a time.
+        @np.vectorize
+        def alength(turns, spacing):
+            '''Arc lengths of many spirals, one at a time'''
+            return delay_spiral_geo_alength_analytic(int(turns), spacing, 
+                vertical=vertical, horizontal=horizontal, 
+                quad_shift=quad_shift, horizontal_mode=horizontal_mode, 
+                vertical_mode=vertical_mode, start_turn=start_turn, 
+                start_angle=start_angle, fwd_end_angle=fwd_end_angle, 
+                rev_end_angle=rev_end_angle, radial_shift=radial_shift, 
+                xy_ext_arr=xy_ext_arr, wg_width=wg_width)
+        #enddef
+
+    #
+    # Mimic the coarse tuning
+    #
+
+    # Arc lengths at the minimum spacing for every number of turns the 
+    # tuning may try. They increase with the number of turns, so the turns
+    # chosen for each arc length are the number of them that don't overshoot.
+    all_turns = np.arange(1, max_turns + 2)
+
+    if per_turn:
+        # Extensions given per turn only cover spirals with so many turns, 
+        # beyond which the tuning fails as it does beyond 'max_turns'.
+        min_spacing_lengths = []
+        for turns in all_turns:
+            try:
+                min_spacing_lengths.append(float(alength(turns, min_spacing)))
+            except IndexError:
+                break
+
+        if not min_spacing_lengths:
+            raise ValueError("The extensions given per turn don't cover a "
+                + "spiral with a single turn.")
+
+        all_turns = all_turns[:len(min_spacing_lengths)]
+        min_spacing_lengths = np.array(min_spacing_lengths)
+    else:
+        min_spacing_lengths = alength(all_turns, min_spacing)
+
+    min_length, max_length = min_spacing_lengths[[0, -1]]
+
+    # See 'delay_spiral_alen_tuning' for when the tuning gives up
+    reachable = (arc_length >= min_length) & \
+        (arc_length + alen_tolerance <= max_length)
+
+    turns = np.searchsorted(min_spacing_lengths, arc_length + alen_tolerance)
+    turns = np.clip(turns, 1, max(all_turns[-1] - 1, 1))
+    tuned_length = min_spacing_lengths[turns - 1]
+
+    #
+    # Mimic the fine tuning
+    #
+
+    # The arc length is nearly linear in the spacing, so the spacing is found
+    # with a few secant steps starting from the first step of the tuning.
+    spacing = np.full(arc_length.shape, float(min_spacing))
+    next_spacing = spacing + (arc_length - tuned_length) / (
+        4 * np.pi * turns * (2 * turns + 1))
+    needs_tuning = reachable & \
+        (np.abs(arc_length - tuned_length) > alen_tolerance)
+
+    for i in range(6):
+        next_length = alength(turns, next_spacing)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = (next_spacing - spacing) * (arc_length - next_length) / (
+                next_length - tuned_length)
+        spacing, tuned_length = next_spacing, next_length
+        next_spacing = np.where(np.isfinite(step), spacing + step, spacing)
+
+    spacing = np.where(needs_tuning, next_spacing, min_spacing)
+
+    #
+    # Bend radius of the s-bend at the tuned spacing
+    #
+
+    b = 2 * (spacing + wg_width) / (2 * np.pi)
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    inner_theta, inner_k, _, _ = arithmetic_spiral_tangent_range(b,
+        radial_shift, start_theta, start_theta + 2 * np.pi)
+
+    # The innermost points of the unextended spirals are reflections of each
+    # other about the origin. Each is moved by the shift applied to the 
+    # innermost segment, in quadrant k of the forward spiral and the 
+    # opposite quadrant of the reverse one (see 
+    # 'delay_spiral_geo_alength_analytic').
+    inner_radius = radial_shift + (b * inner_theta)
+    inner_point = inner_radius * np.array(
+        [np.cos(inner_theta), np.sin(inner_theta)])
+
+    shift = xy_ext_arr
+    if shift is None:
+        shift = arithmetic_spiral_shift_array(vertical, horizontal,
+            quad_shift // 2 + 1, vertical_mode, horizontal_mode)
+
+    fwd_shift = arithmetic_spiral_segment_shifts(shift, 1,
+        inner_k % 4, 1, quad_shift).T
+    rev_shift = arithmetic_spiral_segment_shifts(shift, 1,
+        (inner_k + 2) % 4, 1, quad_shift).T
+
+    separation_x, separation_y = np.abs(
+        (inner_point + fwd_shift.reshape(inner_point.shape)) 
+        - (rev_shift.reshape(inner_point.shape) - inner_point))
+
+    # At even tangent points the spiral is parallel to the y axis, so the
+    # s-bend's 'length' is given by the vertical distance.
+    along_y = inner_k % 2 == 0
+    s_bend_length = np.where(along_y, separation_y, separation_x)
+    s_bend_height = np.where(along_y, separation_x, separation_y)
+
+    # See 's_bend_solve_params' for when s-bends are steep
+    steep_bend = (s_bend_height > s_bend_length) & \
+        (s_bend_length / 2 >= min_bend_radius)
+
+    with np.errstate(divide='ignore'):
+        bend_radius = np.where(steep_bend, s_bend_length / 2, 
+            (s_bend_height**2 + s_bend_length**2) / (4 * s_bend_height))
+
+    bend_radius = np.where(reachable, bend_radius, np.nan)
+    feasible = reachable & (bend_radius >= min_bend_radius)
+
+    if feasible.ndim == 0:
+        return bool(feasible), min_length, max_length, float(bend_radius)
+
+    return feasible, min_length, max_length, bend_radius
+
+
+def delay_spiral_ext_per_turn(vertical=0, horizontal=0, xy_ext_arr=None):
+    '''
+    Returns the average length of the straight extensions added to a delay
+    spiral per turn (counting both intertwined spirals), given the extension 
+    arguments to 'delay_spiral_geo'.
+
+    Each spiral has two vertical and two horizontal extensions per turn, 
+    whatever the extension modes are, so this is 4 * (horizontal + vertical)
+    when both are scalars.
+    '''
+    if xy_ext_arr is not None:
+        # Sum the steps in the shift between successive quadrants, which are
+        # the extension lengths, over a full turn and average over the turns.
+        shift = np.asarray(xy_ext_arr, dtype=float)
+        steps = np.abs(shift - np.roll(shift, 1, axis=0))
+        return 2 * np.mean(np.sum(steps, axis=(0, 1)))
+
+    return 4 * (np.mean(np.abs(vertical)) + np.mean(np.abs(horizontal)))
+
+
+def delay_spiral_alength_func(segmentation):
+    '''
+    Returns the function used to compute the arc length of a delay spiral 
+    while tuning it, for the given segmentation mode. With 'analytic'
+    segmentation the arc length doesn't depend on how the spiral is sampled,
+    so it's computed without building the geometry.
+
+    Args:
+        segmentation:   'sampled' or 'analytic'. See 'delay_spiral_geo'.
+                        <str>
+
+    Return:
+        'delay_spiral_geo_alength' or 'delay_spiral_geo_alength_analytic'
+        <function>
+    '''
+    if segmentation == 'analytic':
+        return delay_spiral_geo_alength_analytic
+    else:
+        return delay_spiral_geo_alength
+
+
+def delay_spiral_alength_table(filename, min_spacing, max_spacing, 
+    n_spacings=50, port0_side='left', port1_side='bottom', radial_shift=0,
+    start_turn=1, start_angle=0,
+    vertical=0, horizontal=0, quad_shift=0,
+    horizontal_mode='symmetric', vertical_mode='symmetric',
+    xy_ext_arr=None, wg_width=wg_width, n_pts=None, seg_length=seg_length,
+    max_turns=50, segmentation='sampled', verbose=False, max_sagitta=None):
+    '''
+    Precomputes the arc lengths of delay spirals over a grid of numbers of
+    turns and spacings, and saves them to 'filename' as a compressed .npz
+    file. Passing the table to 'delay_spiral' or 'delay_spiral_alen_tuning'
+    as 'alength_table' allows the number of turns to be read off the table 
+    and the spacing to be interpolated from it, so that only one or two 
+    exact arc length evaluations are needed to polish it.
+
+    The table is only valid for the parameters it was computed with. These
+    are recorded in the table along with a key identifying them (see 
+    'delay_spiral_alength_table_key'), which is checked whenever the table 
+    is used so that a stale table is never used silently.
+
+    Args:
+        filename:       File to save the table to. The extension '.npz' is
+                        appended if it isn't already there.
+                        <str>
+
+        min_spacing:    Smallest spacing between waveguide edges in the 
+                        table, which must equal the 'min_spacing' passed 
+                        when the table is used.
+                        <float or int>
+
+        max_spacing:    Largest spacing between waveguide edges in the table.
+                        Spirals needing larger spacings can still be tuned
+                        using the table, but take more evaluations.
+                        <float or int>
+
+        n_spacings:     Number of spacings in the table, evenly spaced from
+                        'min_spacing' to 'max_spacing'.
+                        <int>
+                        (default: 50)
+
+        max_turns:      The table has rows for 1 to max_turns + 1 turns.
+                        <int>
+                        (default: 50)
+
+        verbose:        If True, prints progress as each row is computed.
+                        <bool>
+                        (default: False)
+
+        The remaining arguments are the same as for 'delay_spiral'.
+
+    Return:
+        The table, as returned by 'delay_spiral_load_alength_table'.
+        <dict>
+    '''
+    # Determine the end angles to supply to properly position the ports
+    fwd_port_locs = {
+        'bottom': 0,
+        'right': 90,
+        'top': 180,
+        'left': 270
+    }
+
+    rev_port_locs = {
+        'top': 0,
+        'left': 90,
+        'bottom': 180,
+        'right': 270
+    }
+
+    geo_alength = delay_spiral_alength_func(segmentation)
+
+    turns = np.arange(1, max_turns + 2)
+    spacings = np.linspace(min_spacing, max_spacing, n_spacings)
+    lengths = np.empty((turns.size, spacings.size))
+
+    for i, turn in enumerate(turns):
+        for j, spacing in enumerate(spacings):
+            lengths[i, j] = geo_alength(int(turn), spacing, 
+                vertical=vertical, horizontal=horizontal, 
+                quad_shift=quad_shift, horizontal_mode=horizontal_mode, 
+                vertical_mode=vertical_mode, start_turn=start_turn, 
+                start_angle=start_angle, 
+                fwd_end_angle=fwd_port_locs[port0_side], 
+                rev_end_angle=rev_port_locs[port1_side],
+                radial_shift=radial_shift, xy_ext_arr=xy_ext_arr,
+                wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
+                segmentation=segmentation, max_sagitta=max_sagitta)
+
+        if verbose:
+            print("Computed arc lengths for {} turns: ".format(turn)
+                + "{} to {} um".format(lengths[i, 0], lengths[i, -1]))
+
+    key, params = delay_spiral_alength_table_key(
+        min_spacing=min_spacing, 
+        port0_side=port0_side, port1_side=port1_side, 
+        radial_shift=radial_shift, 
+        start_turn=start_turn, start_angle=start_angle,
+        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+        xy_ext_arr=xy_ext_arr, wg_width=wg_width, 
+        n_pts=n_pts, seg_length=seg_length, segmentation=segmentation,
+        max_sagitta=max_sagitta)
+
+    np.savez_compressed(filename, turns=turns, spacings=spacings, 
+        lengths=lengths, key=key, params=params)
+
+    return {'turns': turns, 'spacings': spacings, 'lengths': lengths,
+            'key': key, 'params': params}
+
+
+def delay_spiral_load_alength_table(filename):
+    '''
+    Loads a table of delay spiral arc lengths saved by 
+    'delay_spiral_alength_table'.
+
+    Args:
+        filename:       File the table was saved to.
+                        <str>
+
+    Return:
+        A dict with the following entries:
+            'turns':    Number of turns of each row of the table.
+                        <1D np.ndarray of ints>
+            'spacings': Spacing between waveguide edges of each column.
+                        <1D np.ndarray>
+            'lengths':  Arc length of the spiral with each number of turns
+                        and spacing.
+                        <2D np.ndarray>
+            'key':      Key identifying the parameters of the spirals.
+                        <str>
+            'params':   The parameters of the spirals, as JSON.
+                        <str>
+        <dict>
+    '''
+    with np.load(filename) as table:
+        return {'turns': table['turns'], 'spacings': table['spacings'],
+                'lengths': table['lengths'], 'key': str(table['key']),
+                'params': str(table['params'])}
+
+
+def delay_spiral_alength_table_key(**params):
+    '''
+    Returns a key identifying the parameters of the delay spirals in an arc
+    length table (see 'delay_spiral_alength_table'). Every parameter that
+    changes the arc length for a given number of turns and spacing, along 
+    with 'min_spacing', should be passed. Numbers are compared as floats and
+    lists and ndarrays by value, so e.g. vertical=10 and vertical=10.0 give
+    the same key.
+
+    Args:
+        params:         The parameters, by name.
+
+    Return:
+        key:            SHA-1 hash of 'description'.
+                        <str>
+
+        description:    The parameters as JSON, with keys sorted.
+                        <str>
+    '''
+    def normalize(value):
+        '''Converts parameter values to JSON-serializable values'''
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return [normalize(v) for v in value]
+        elif isinstance(value, (bool, np.bool_)) or value is None:
+            return value if value is None else bool(value)
+        elif isinstance(value, (int, float, np.number)):
+            return float(value)
+        else:
+            return value
+    #enddef
+
+    description = json.dumps(
+        {name: normalize(value) for name, value in params.items()},
+        sort_keys=True)
+
+    return hashlib.sha1(description.encode()).hexdigest(), description
+
+
+def delay_spiral_geo(layout, layer, cell, turns=None, spacing=None, 
+    vertical=0, horizontal=0, quad_shift=0, horizontal_mode='symmetric', 
+    vertical_mode='symmetric', start_turn=1, start_angle=0, fwd_end_angle=0, 
+    rev_end_angle=0, radial_shift=0, xy_ext_arr=None,
+    wg_width=wg_width, n_pts=None, seg_length=seg_length, 
+    origin='center', trans=null_trans, sbend_output='pcell', 
+    segmentation='sampled', solution=None, max_sagitta=None, 
+    chunk_segments=None):
+    '''
+    Populates 'cell' with a delay spiral composed of two intertwined extended
+    arithmetic/Archimedean spirals joined by an s-bend in the center. 
+
+    Parameters available to the user are directly related to the spiral 
+    geometry, hence the suffix '_geo'. For an equivalent parameter set 
+    optimized for photonic design, see 'delay_spiral'.
+
+    Args:
+        layout:         Layout object for instantiation
+                        <pya.Layout object>
+
+        layer:          The index of the layer to insert the path into (this
+                        is the value returned from the layout.layer() method).
+                        <int>
+
+        cell:           Index of the cell to insert the directional coupler
+                        into (this is the value returned by the method
+                        'layout.create_cell').
+                        <int>
+
+        turns:          Number of full turns each spiral will make.
+                        <int>
+
+        spacing:        Distance between the edges of successive waveguides.
+                        <float or int>
+
+        vertical:       Length of vertical straight segments to be inserted.
+                        This is done by shifting the segments of the spiral
+                        outwards from their original positions and letting
+                        them be implicitly stitched together when the coords
+                        are used to generate a path.
+                        If list, the nth entry specifies by how much the nth
+                        half of the spiral (imagining the spiral divided along
+                        the y axis) is shifted. The segments corresponding to
+                        the 0th entry are those in the first FULL half and the
+                        segment before the first full half, if there exists
+                        one. E.g., if the spiral's innermost segment is in 
+                        quadrant 1, and the spiral unwinds in the counter-
+                        clockwise direction, then the first three segments
+                        will be shifted as specified by the 0th entry in 
+                        'vertical' (i.e., the segments in quadrants 1, 2, 3),
+                        but if the spiral started in quadrant 2, only the
+                        firt two segments (in quadrants 2, 3) would be shifted
+                        by the 0th entry, as usual.
+                        If more values are supplied than turns, the extra
+                        value are ignored. If fewer values are supplied than
+                        turns, the function will raise an exception.
+                        <float or int or list>
+                        (default: 0)
+
+        horizontal:     Length of horizontal straight segments to be inserted.
+                        This is done by shifting the segments of the spiral
+                        outwards from their original positions and letting
+                        them be implicitly stitched together when the coords
+                        are used to generate a path.
+                        If list, the nth entry specifies by how much the nth
+                        half of the spiral (imagining the spiral divided along
                         the y axis) is shifted. The segments corresponding to
                         the 0th entry are those in the first FULL half and the
                         segment before the first full half, if there exists
@@ -1171,144 +2707,138 @@ def delay_spiral_geo(layout, layer, cell, turns, spacing, vertical=0,
                         <pya.DTrans object>
                         (default: transforms.null_trans)
 
+        segmentation:   How the spirals are divided into segments whose ends
+                        are tangent to the x and y axes, between which the
+                        straight extensions are inserted.
+
+                        'sampled':
+                            The tangent points are located among the sampled
+                            coordinates of the spirals (see 
+                            'arithmetic_spiral_segments'), so the spirals must
+                            be sampled densely enough for them to be found.
+
+                        'analytic':
+                            The angles of the tangent points are computed
+                            exactly and each segment is sampled separately
+                            (see 'arithmetic_spiral_curve_segments'), so the
+                            ends of the segments are exactly tangent to the 
+                            axes for any n_pts or seg_length.
+                        <str>
+                        (default: 'sampled')
+
+        max_sagitta:    If given, the spirals are sampled with the fewest 
+                        points that keep the chords between them within 
+                        'max_sagitta' of the ideal spirals, so that points
+                        are spaced further apart where the spirals curve 
+                        less (see 'arithmetic_spiral_sagitta_thetas'), and
+                        n_pts and seg_length are ignored. If 'dbu', the 
+                        database unit of 'layout' is used, since smaller
+                        deviations can't be represented anyway. Works best
+                        with 'analytic' segmentation, since 'sampled' 
+                        segmentation locates the ends of the segments among
+                        the sparser points.
+                        <float or str or None>
+                        (default: None)
+
         sbend_output:   If 'pcell' is passed, s-bends generated as PCells. 
                         If 'path' is passed, s-bends generated as DPaths.
+                        If 'polygon' is passed, s-bends generated as 
+                        DPolygons (see 's_bend_polygon'). If 'cell' is 
+                        passed, s-bends are instances of cells shared by
+                        identical s-bends (see 's_bend_cell').
                         <str>
                         (default: 'pcell')
-    '''
-    # Generate coordinates for a basic spiral curve
-    fwd_coords = arithmetic_spiral_curve(
-        turns, 
-        (2 * spacing) + (2 * wg_width), 
-        n_pts, seg_length,
-        start_turn=start_turn, 
-        start_angle=start_angle, 
-        end_angle=fwd_end_angle, 
-        radial_shift=radial_shift)
-
-    # Generate the same spiral reflected about the origin. This way we have
-    # outgoing and ingoing spirals intertwined
-    rev_coords = arithmetic_spiral_curve(
-        turns, 
-        -(2 * spacing) - (2 * wg_width), 
-        n_pts, seg_length,
-        start_turn=start_turn, 
-        start_angle=start_angle, 
-        end_angle=rev_end_angle, 
-        radial_shift=-radial_shift)
 
-    # Extend the spiral in the x and y directions as desired by inserting 
-    # straight segments of the desired lengths.
-    fwd_spiral_points = arithmetic_spiral_extension(
-        fwd_coords, vertical, horizontal, quad_shift,
-        vertical_mode=vertical_mode,
-        horizontal_mode=horizontal_mode,
-        shift=xy_ext_arr)
-    rev_spiral_points = arithmetic_spiral_extension(
-        rev_coords, vertical, horizontal, quad_shift,
-        vertical_mode=vertical_mode,
-        horizontal_mode=horizontal_mode,
-        shift=xy_ext_arr)
-
-    # Convert the ndarrays of coordinates to lists of DPoints so we can 
-    # make KLayout DPaths out of them.
-    fwd_spiral_Dpoints = array_to_DPoints(fwd_spiral_points)
-    rev_spiral_Dpoints = array_to_DPoints(rev_spiral_points)
-
-    # Figure out which directions the inner terminations of the spiral are
-    # facing so we can connect them with an appropriate s-bend
-    fwd_first_segment = fwd_spiral_Dpoints[0] - fwd_spiral_Dpoints[1]
-    fwd_inner_port_angle = np.arctan2(
-        fwd_first_segment.y, fwd_first_segment.x)
-    fwd_inner_port_angle = ma.degrees(fwd_inner_port_angle)
-
-    # Get the innermost points of the forward and reverse spirals. These are
-    # the points the s-bend needs to connect, and will determine how long
-    # and tall the s-bend is.
-    innermost_fwd_point = fwd_spiral_points[:, 0]
-    innermost_rev_point = rev_spiral_points[:, 0]
-
-    # The s-bend needs to be oriented differently depending on whether the 
-    # inner terminations point along the x-axis or y-axis
-
-    if within_angle(fwd_inner_port_angle, 0, 10) or \
-       within_angle(fwd_inner_port_angle, 180, 10):
-       # If they point along the x-axis, the s-bend's 'length' should be
-       # given by horizontal distance, and the bend is reflected across y = 0.
-        orient_s_bend = pya.DTrans(pya.DTrans.M90)
-        # After an M90 transform,ation the s-bend's port0 is on the right, so 
-        # we'll move it to the location of the rightmost internal termination.
-        if innermost_fwd_point[0] > innermost_rev_point[0]:
-            place_s_bend = pya.DTrans(pya.DVector(
-                innermost_fwd_point[0],
-                innermost_fwd_point[1]))
-        else:
-            place_s_bend = pya.DTrans(pya.DVector(
-                innermost_rev_point[0],
-                innermost_rev_point[1]))
-
-        s_bend_length, s_bend_height = np.abs(
-            innermost_fwd_point - innermost_rev_point)
+        chunk_segments: If given, each spiral arm is generated and inserted
+                        as several paths of this many segments, one at a 
+                        time (see 'delay_spiral_arm_chunks'), rather than as
+                        a single path, so the memory needed doesn't grow 
+                        with the number of turns. Requires 'analytic' 
+                        segmentation.
+                        <int or None>
+                        (default: None)
 
-    elif within_angle(fwd_inner_port_angle, 90, 10) or \
-        within_angle(fwd_inner_port_angle, 270, 10):
-       # If they point along the y-axis, the s-bend's 'length' should be
-       # given by vertical distance, and the bend is reflected across y = x.
-        orient_s_bend = pya.DTrans(pya.DTrans.M45)
-        # After an M45 transformation, the s-bend's port0 is on the left, so 
-        # we'll move it to the location of the leftmost internal termination.
-        if innermost_fwd_point[0] > innermost_rev_point[0]:
-            place_s_bend = pya.DTrans(pya.DVector(
-                innermost_rev_point[0],
-                innermost_rev_point[1]))
-        else:
-            place_s_bend = pya.DTrans(pya.DVector(
-                innermost_fwd_point[0],
-                innermost_fwd_point[1]))
-        s_bend_height, s_bend_length = np.abs(
-            innermost_fwd_point - innermost_rev_point)
-    else:
-        raise RuntimeError(
-            "It looks like the 'arithmetic_spiral_segments' function isn't "
-            + "effectively locating points on the spiral that are tangent to "
-            + "the x and y axes. This may be because n_pts is too small.")
+        solution:       The spiral as computed by 'delay_spiral_geo_solution'
+                        or returned by 'delay_spiral_alen_tuning', in which
+                        case it's generated from the solution without 
+                        recomputing it, and the arguments describing the
+                        spiral ('turns' through 'seg_length', 
+                        'segmentation', 'max_sagitta', and 
+                        'chunk_segments') are ignored. Either 'solution' or 
+                        'turns' and 'spacing' must be given.
+                        <SpiralSolution or None>
+                        (default: None)
+    '''
+    if solution is None:
+        solution = delay_spiral_geo_solution(turns, spacing, 
+            vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+            horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
+            start_turn=start_turn, start_angle=start_angle, 
+            fwd_end_angle=fwd_end_angle, rev_end_angle=rev_end_angle, 
+            radial_shift=radial_shift, xy_ext_arr=xy_ext_arr, 
+            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
+            segmentation=segmentation, 
+            max_sagitta=layout.dbu if max_sagitta == 'dbu' else max_sagitta,
+            chunk_segments=chunk_segments)
 
     if origin != 'center': 
         raise Warning(
             "Values of 'origin' other than 'center' not yet supported.")
 
-    # Generate the spiral arms as DPaths
-    fwd_spiral_path = pya.DPath(
-        fwd_spiral_Dpoints, wg_width).transformed(trans)
-    rev_spiral_path = pya.DPath(
-        rev_spiral_Dpoints, wg_width).transformed(trans)
+    # Generate the spiral arms as DPaths, split wherever they have too many
+    # points to be written to GDSII, and insert them into the passed cell.
+    if solution.chunk_args is None:
+        arm_points = [solution.fwd_points, solution.rev_points]
+    else:
+        # Generate the arms a chunk at a time, inserting each before the 
+        # next is generated.
+        arm_points = (chunk for arm_args in solution.chunk_args
+                      for chunk in delay_spiral_arm_chunks(**arm_args))
 
-    # Insert it all into the passed cell
-    cell.shapes(layer).insert(fwd_spiral_path)
-    cell.shapes(layer).insert(rev_spiral_path)
+    for points in arm_points:
+        for path in array_to_DPaths(points, solution.wg_width):
+            cell.shapes(layer).insert(path.transformed(trans))
 
+    # The s-bend needs to be oriented differently depending on whether the 
+    # inner terminations point along the x-axis or y-axis. If they point 
+    # along the x-axis, the bend is reflected across y = 0, and otherwise 
+    # across y = x.
+    if solution.s_bend_axis == 'x':
+        orient_s_bend = pya.DTrans(pya.DTrans.M90)
+    else:
+        orient_s_bend = pya.DTrans(pya.DTrans.M45)
+
+    s_bend_x, s_bend_y = solution.s_bend_position
+    place_s_bend = pya.DTrans(pya.DVector(s_bend_x, s_bend_y))
 
     # Generate the s-bend with the determined dimensions and orientation
     s_bend_trans = trans * place_s_bend * orient_s_bend
-    s_bend_obj = s_bend(layout, layer, s_bend_length, s_bend_height,
-        wg_width=wg_width, origin='port0', trans=s_bend_trans,
+    s_bend_obj = s_bend(layout, layer, 
+        solution.s_bend_length, solution.s_bend_height,
+        wg_width=solution.wg_width, origin='port0', trans=s_bend_trans,
         output=sbend_output)
 
-    if sbend_output == 'pcell': cell.insert(s_bend_obj)
-    elif sbend_output == 'path': cell.shapes(layer).insert(s_bend_obj)
+    if sbend_output in ('pcell', 'cell'): cell.insert(s_bend_obj)
+    elif sbend_output in ('path', 'polygon'): 
+        cell.shapes(layer).insert(s_bend_obj)
 
     return
 
 
+@caching.memoize
 def delay_spiral_geo_alength(turns, spacing, vertical=0, 
     horizontal=0, quad_shift=0, horizontal_mode='symmetric', 
     vertical_mode='symmetric', start_turn=1, start_angle=0, fwd_end_angle=0, 
     rev_end_angle=0, radial_shift=0, xy_ext_arr=None,
-    wg_width=wg_width, n_pts=None, seg_length=seg_length, verbose=False):
+    wg_width=wg_width, n_pts=None, seg_length=seg_length, verbose=False,
+    segmentation='sampled', max_sagitta=None):
     '''
     Returns the arc length of the spiral generated by 'delay_spiral_geo' when
     supplied with the same parameters.
 
+    Results can be cached for repeated calls with the same parameters, e.g.
+    while tuning many spirals with shared settings. See 'chickpea.caching'.
+
     Args:
         turns:          Number of full turns each spiral will make.
                         <int>
@@ -1527,6 +3057,32 @@ def delay_spiral_geo_alength(turns, spacing, vertical=0,
                         <float or int>
                         (default: constants.seg_length == 1.0)
 
+        segmentation:   How the spirals are divided into segments whose ends
+                        are tangent to the x and y axes, between which the
+                        straight extensions are inserted.
+
+                        'sampled':
+                            The tangent points are located among the sampled
+                            coordinates of the spirals (see 
+                            'arithmetic_spiral_segments'), so the spirals must
+                            be sampled densely enough for them to be found.
+
+                        'analytic':
+                            The angles of the tangent points are computed
+                            exactly and each segment is sampled separately
+                            (see 'arithmetic_spiral_curve_segments'), so the
+                            ends of the segments are exactly tangent to the 
+                            axes for any n_pts or seg_length.
+                        <str>
+                        (default: 'sampled')
+
+        max_sagitta:    If given, the spirals are sampled with the fewest 
+                        points that keep the chords between them within 
+                        'max_sagitta' of the ideal spirals, and n_pts and 
+                        seg_length are ignored. See 'delay_spiral_geo'.
+                        <float or None>
+                        (default: None)
+
         verbose:        If True, prints the arc lengths for the s-bend, 
                         spiral extension lengths, and unextended spiral arc
                         lengths for the forward and reverse spirals separately
@@ -1537,46 +3093,84 @@ def delay_spiral_geo_alength(turns, spacing, vertical=0,
     # Compute the cooridnates of the basic, segmented, and extended spirals
     #
 
-    # Generate coordinates for a basic spiral curve. Note we need to supply
-    # spacing between waveguide centers here (i.e., DPath spines), and double
-    # it so that spacing between arms of intertwined spirals equals 'spacing'.
-    fwd_coords = arithmetic_spiral_curve(
-        turns, 
-        2 * (spacing + wg_width), 
-        n_pts, seg_length=seg_length,
-        start_turn=start_turn, 
-        start_angle=start_angle, 
-        end_angle=fwd_end_angle, 
-        radial_shift=radial_shift)
-
-    # Generate the same spiral reflected about the origin. This way we have
-    # outgoing and ingoing spirals intertwined
-    rev_coords = arithmetic_spiral_curve(
-        turns, 
-        -2 * (spacing + wg_width), 
-        n_pts, seg_length=seg_length,
-        start_turn=start_turn, 
-        start_angle=start_angle, 
-        end_angle=rev_end_angle, 
-        radial_shift=-radial_shift)
-
-
-    # Divide the spiral into segments whose terminations point in the
-    # x and y directions.
-    fwd_spiral_segs = arithmetic_spiral_segments(fwd_coords)
-    rev_spiral_segs = arithmetic_spiral_segments(rev_coords)    
+    solution = delay_spiral_geo_solution(turns, spacing, vertical=vertical,
+        horizontal=horizontal, quad_shift=quad_shift, 
+        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
+        start_turn=start_turn, start_angle=start_angle, 
+        fwd_end_angle=fwd_end_angle, rev_end_angle=rev_end_angle, 
+        radial_shift=radial_shift, xy_ext_arr=xy_ext_arr, wg_width=wg_width,
+        n_pts=n_pts, seg_length=seg_length, verbose=verbose, 
+        segmentation=segmentation, max_sagitta=max_sagitta)
+
+    return solution.arc_length
+
+
+def delay_spiral_geo_solution(turns, spacing, vertical=0, 
+    horizontal=0, quad_shift=0, horizontal_mode='symmetric', 
+    vertical_mode='symmetric', start_turn=1, start_angle=0, fwd_end_angle=0, 
+    rev_end_angle=0, radial_shift=0, xy_ext_arr=None,
+    wg_width=wg_width, n_pts=None, seg_length=seg_length, verbose=False,
+    segmentation='sampled', max_sagitta=None, chunk_segments=None):
+    '''
+    Computes everything 'delay_spiral_geo' needs to generate the delay spiral
+    with the given parameters, along with its arc length, without creating
+    any KLayout objects. The result can be passed as 'solution' to 
+    'delay_spiral_geo', so the spiral arms aren't generated again, e.g. after
+    the spiral was evaluated while tuning it (see 'delay_spiral_alen_tuning').
+
+    Args:
+        chunk_segments: If given, the coordinates of the spiral arms aren't 
+                        computed. Instead, the solution records how to 
+                        generate each arm in chunks of this many segments
+                        (see 'delay_spiral_arm_chunks'), and only the 
+                        innermost and outermost segments are generated here.
+                        The arc length is then computed analytically (see
+                        'delay_spiral_geo_alength_analytic'). Requires 
+                        'analytic' segmentation.
+                        <int or None>
+                        (default: None)
+
+        The remaining arguments are the same as for 
+        'delay_spiral_geo_alength'.
+
+    Return:
+        The solution
+        <SpiralSolution>
+    '''
+    if chunk_segments is not None:
+        return delay_spiral_chunked_solution(turns, spacing, 
+            vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+            horizontal_mode=horizontal_mode, vertical_mode=vertical_mode, 
+            start_turn=start_turn, start_angle=start_angle, 
+            fwd_end_angle=fwd_end_angle, rev_end_angle=rev_end_angle, 
+            radial_shift=radial_shift, xy_ext_arr=xy_ext_arr, 
+            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
+            verbose=verbose, segmentation=segmentation, 
+            max_sagitta=max_sagitta, chunk_segments=chunk_segments)
+
+    # Generate the segments of the forward spiral, and of the same spiral 
+    # reflected about the origin, so we have outgoing and ingoing spirals 
+    # intertwined. Note we need to supply spacing between waveguide centers
+    # here (i.e., DPath spines), and double it so that spacing between arms
+    # of intertwined spirals equals 'spacing'.
+    fwd_spiral_segs, rev_spiral_segs = delay_spiral_arm_segments(turns, 
+        2 * (spacing + wg_width), n_pts, seg_length=seg_length, 
+        start_turn=start_turn, start_angle=start_angle, 
+        fwd_end_angle=fwd_end_angle, rev_end_angle=rev_end_angle, 
+        radial_shift=radial_shift, segmentation=segmentation, 
+        max_sagitta=max_sagitta)
 
     # Extend the spiral in the x and y directions as desired by inserting 
     # straight segments of the desired lengths.
     fwd_extended_segs = arithmetic_spiral_extension(
-        fwd_coords, vertical, horizontal, quad_shift,
+        fwd_spiral_segs, vertical, horizontal, quad_shift,
         vertical_mode=vertical_mode,
         horizontal_mode=horizontal_mode,
         shift=xy_ext_arr,
         concatenate=False)
 
     rev_extended_segs = arithmetic_spiral_extension(
-        rev_coords, vertical, horizontal, quad_shift,
+        rev_spiral_segs, vertical, horizontal, quad_shift,
         vertical_mode=vertical_mode,
         horizontal_mode=horizontal_mode,
         shift=xy_ext_arr,
@@ -1588,6 +3182,8 @@ def delay_spiral_geo_alength(turns, spacing, vertical=0,
     #
 
     # Find the interval of theta over which the truncated spiral is defined.
+    # NOTE: the s-bend's contribution to the arc length is also computed from
+    # these innermost points, before the extensions are applied.
     fwd_innermost_point = fwd_spiral_segs[0][:, 0]
     rev_innermost_point = rev_spiral_segs[0][:, 0]
 
@@ -1627,55 +3223,341 @@ def delay_spiral_geo_alength(turns, spacing, vertical=0,
 
     def ext_length(segs):
         '''Computes total length of extensions to delay spiral'''
-        total_extension_length = 0
-        for i in range(len(segs) - 1):
-            # displacement vector from the end of the ith segment to the
-            # start of the (i + 1)th segment.
-            disp_vector = segs[i + 1][:, 0] - segs[i][:, -1]
-
-            # Since we expect a purely horizontal or vertical displacement
-            # vector (cooresponding to extensions along x and y only), the
-            # straight extension length can be computed simply as the sum
-            # of the displacement in the x and y directions, since one of the
-            # two directions will have 0 displacement.
-            total_extension_length += np.abs(disp_vector[0] + disp_vector[1])
-        return total_extension_length
+        # displacement vectors from the end of each segment to the start of
+        # the next segment.
+        starts = segs.offsets[1:-1]
+        disp_vectors = segs.coords[:, starts] - segs.coords[:, starts - 1]
+
+        # Since we expect a purely horizontal or vertical displacement
+        # vector (cooresponding to extensions along x and y only), the
+        # straight extension length can be computed simply as the sum
+        # of the displacement in the x and y directions, since one of the
+        # two directions will have 0 displacement.
+        return sum(np.abs(disp_vectors[0] + disp_vectors[1]))
+
+    fwd_extensions_length = ext_length(fwd_extended_segs)
+    rev_extensions_length = ext_length(rev_extended_segs)
+
+
+    #
+    # Compute the length contributed by the s-bend in the middle
+    #
+
+    # Figure out which directions the inner terminations of the spiral are
+    # facing so we can connect them with an appropriate s-bend
+    s_bend_axis = delay_spiral_s_bend_axis(fwd_spiral_segs[0], segmentation)
+
+    s_bend_length, s_bend_height = delay_spiral_s_bend_dims(
+        fwd_innermost_point, rev_innermost_point, s_bend_axis)
+
+    s_bend_arc_length_ = s_bend_alength(s_bend_length, s_bend_height)
+
+    if verbose:
+        print("Fwd spiral length: {} um".format(fwd_spiral_length))
+        print("Fwd extensions length: {} um".format(fwd_extensions_length))
+        print("Rev spiral length: {} um".format(rev_spiral_length))
+        print("Rev extensions length: {} um".format(rev_extensions_length))
+        print("S-bend length: {} um".format(s_bend_arc_length_))
+
+    total_arc_length = fwd_spiral_length + fwd_extensions_length + \
+        rev_spiral_length + rev_extensions_length + s_bend_arc_length_
+
+
+    #
+    # Lay out the extended spirals and the s-bend joining them
+    #
+
+    fwd_points = fwd_extended_segs.coords
+    rev_points = rev_extended_segs.coords
+
+    # The s-bend joins the innermost points of the extended spirals
+    s_bend_position = delay_spiral_s_bend_position(
+        fwd_points[:, 0], rev_points[:, 0], s_bend_axis)
+
+    ext_s_bend_length, ext_s_bend_height = delay_spiral_s_bend_dims(
+        fwd_points[:, 0], rev_points[:, 0], s_bend_axis)
+
+    # Bounding box of both spirals, including the width of the waveguides
+    all_points = np.concatenate((fwd_points, rev_points), axis=1)
+    bbox = np.array([
+        all_points.min(axis=1) - wg_width / 2,
+        all_points.max(axis=1) + wg_width / 2])
+
+    return SpiralSolution(turns=turns, spacing=spacing, 
+        arc_length=total_arc_length, vertical=vertical, 
+        horizontal=horizontal, wg_width=wg_width, 
+        fwd_points=fwd_points, rev_points=rev_points,
+        fwd_boundaries=fwd_extended_segs.offsets[1:-1], 
+        rev_boundaries=rev_extended_segs.offsets[1:-1],
+        s_bend_length=ext_s_bend_length, s_bend_height=ext_s_bend_height, 
+        s_bend_axis=s_bend_axis, s_bend_position=s_bend_position,
+        port0=fwd_points[:, -1], port1=rev_points[:, -1], bbox=bbox,
+        chunk_args=None)
+
+
+def delay_spiral_chunked_solution(turns, spacing, vertical=0, 
+    horizontal=0, quad_shift=0, horizontal_mode='symmetric', 
+    vertical_mode='symmetric', start_turn=1, start_angle=0, fwd_end_angle=0, 
+    rev_end_angle=0, radial_shift=0, xy_ext_arr=None,
+    wg_width=wg_width, n_pts=None, seg_length=seg_length, verbose=False,
+    segmentation='analytic', max_sagitta=None, chunk_segments=16):
+    '''
+    Computes the solution returned by 'delay_spiral_geo_solution' when 
+    'chunk_segments' is given, without computing the coordinates of the 
+    spiral arms, so that the memory needed doesn't grow with the number of 
+    turns. 'delay_spiral_geo' then generates the arms in chunks as it 
+    inserts them. The solution's 'fwd_points', 'rev_points', 
+    'fwd_boundaries', 'rev_boundaries', and 'bbox' are None.
+
+    Args:
+        See 'delay_spiral_geo_solution'.
+
+    Return:
+        The solution
+        <SpiralSolution>
+    '''
+    if segmentation != 'analytic':
+        raise ValueError(
+            "Spirals can only be generated in chunks with 'analytic' "
+            + "segmentation, since 'sampled' segmentation needs the full "
+            + "coordinates of the spirals to locate their segments.")
+
+    # Arguments to 'delay_spiral_arm_chunks' shared by both arms. As in 
+    # 'delay_spiral_geo_solution', the spacing is between waveguide centers 
+    # and doubled for the intertwined arms.
+    arm_args = dict(turns=turns, spacing=2 * (spacing + wg_width), 
+        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+        start_turn=start_turn, start_angle=start_angle, 
+        radial_shift=radial_shift, xy_ext_arr=xy_ext_arr, n_pts=n_pts, 
+        seg_length=seg_length, max_sagitta=max_sagitta, 
+        chunk_segments=chunk_segments)
+
+    fwd_args = dict(arm_args, end_angle=fwd_end_angle)
+    rev_args = dict(arm_args, end_angle=rev_end_angle, reflect=True)
+
+    def arm_end(args, segments, extended=True):
+        '''The chunk holding the given segments of an arm'''
+        if not extended:
+            args = dict(args, vertical=0, horizontal=0, xy_ext_arr=None)
+        return next(delay_spiral_arm_chunks(segments=segments, **args))
+    #enddef
+
+    # The inner ports point along the axis the unextended arms are parallel
+    # to at their innermost points.
+    s_bend_axis = delay_spiral_s_bend_axis(
+        arm_end(fwd_args, slice(1), extended=False), segmentation)
+
+    fwd_inner_point = arm_end(fwd_args, slice(1))[:, 0]
+    rev_inner_point = arm_end(rev_args, slice(1))[:, 0]
 
-    fwd_extensions_length = ext_length(fwd_extended_segs)
-    rev_extensions_length = ext_length(rev_extended_segs)
+    s_bend_length, s_bend_height = delay_spiral_s_bend_dims(
+        fwd_inner_point, rev_inner_point, s_bend_axis)
 
+    total_arc_length = delay_spiral_geo_alength_analytic(turns, spacing, 
+        vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+        horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+        start_turn=start_turn, start_angle=start_angle, 
+        fwd_end_angle=fwd_end_angle, rev_end_angle=rev_end_angle, 
+        radial_shift=radial_shift, xy_ext_arr=xy_ext_arr, wg_width=wg_width,
+        verbose=verbose)
+
+    return SpiralSolution(turns=turns, spacing=spacing, 
+        arc_length=total_arc_length, vertical=vertical, 
+        horizontal=horizontal, wg_width=wg_width, 
+        fwd_points=None, rev_points=None, 
+        fwd_boundaries=None, rev_boundaries=None,
+        s_bend_length=s_bend_length, s_bend_height=s_bend_height, 
+        s_bend_axis=s_bend_axis, 
+        s_bend_position=delay_spiral_s_bend_position(
+            fwd_inner_point, rev_inner_point, s_bend_axis),
+        port0=arm_end(fwd_args, slice(-1, None))[:, -1], 
+        port1=arm_end(rev_args, slice(-1, None))[:, -1], 
+        bbox=None, chunk_args=(fwd_args, rev_args))
+
+
+def delay_spiral_s_bend_axis(fwd_innermost_seg, segmentation='sampled'):
+    '''
+    Returns the axis along which the inner terminations of a delay spiral 
+    point, and thus along which the s-bend joining them runs.
 
-    #
-    # Compute the length contributed by the s-bend in the middle
-    #
+    Args:
+        fwd_innermost_seg:
+                        Innermost segment of the forward spiral, before any
+                        extensions are applied.
+                        <2 x N np.ndarray>
 
-    # Figure out which directions the inner terminations of the spiral are
-    # facing so we can connect them with an appropriate s-bend
-    fwd_inner_port_dx, fwd_inner_port_dy = \
-        fwd_extended_segs[0][:, 0] - fwd_extended_segs[0][:, 1]
-    fwd_inner_port_angle = np.arctan2(fwd_inner_port_dy, fwd_inner_port_dx)
-    fwd_inner_port_angle = ma.degrees(fwd_inner_port_angle)
+        segmentation:   'sampled' or 'analytic'. See 'delay_spiral_geo'.
+                        <str>
+                        (default: 'sampled')
+
+    Return:
+        'x' or 'y'
+        <str>
+    '''
+    fwd_inner_port_angle = delay_spiral_inner_port_angle(
+        fwd_innermost_seg, segmentation)
 
     # The s-bend needs to be oriented differently depending on whether the 
     # inner terminations point along the x-axis or y-axis
 
     if within_angle(fwd_inner_port_angle, 0, 10) or \
        within_angle(fwd_inner_port_angle, 180, 10):
-
-        s_bend_length, s_bend_height = np.abs(
-            fwd_innermost_point - rev_innermost_point)
-
+        return 'x'
     elif within_angle(fwd_inner_port_angle, 90, 10) or \
         within_angle(fwd_inner_port_angle, 270, 10):
-
-        s_bend_height, s_bend_length = np.abs(
-            fwd_innermost_point - rev_innermost_point)
+        return 'y'
     else:
         raise RuntimeError(
             "It looks like the 'arithmetic_spiral_segments' function isn't "
             + "effectively locating points on the spiral that are tangent to "
             + "the x and y axes. This may be because n_pts is too small.")
 
+
+def delay_spiral_s_bend_dims(fwd_point, rev_point, s_bend_axis):
+    '''
+    Returns the length and height of the s-bend joining the innermost points
+    of the spiral arms. If the terminations point along the x-axis, the 
+    s-bend's 'length' is given by the horizontal distance, otherwise by the
+    vertical distance.
+    '''
+    separation_x, separation_y = np.abs(fwd_point - rev_point)
+    if s_bend_axis == 'x':
+        return separation_x, separation_y
+    return separation_y, separation_x
+
+
+def delay_spiral_s_bend_position(fwd_point, rev_point, s_bend_axis):
+    '''
+    Returns the location of port 0 of the s-bend joining the innermost 
+    points of the spiral arms. It's placed at the rightmost of them if it 
+    runs along the x-axis, since it's then reflected across y = 0, and 
+    otherwise at the leftmost, since it's then reflected across y = x.
+    '''
+    fwd_is_right = fwd_point[0] > rev_point[0]
+    if fwd_is_right == (s_bend_axis == 'x'):
+        return fwd_point
+    return rev_point
+
+
+@caching.memoize
+def delay_spiral_geo_alength_analytic(turns, spacing, vertical=0, 
+    horizontal=0, quad_shift=0, horizontal_mode='symmetric', 
+    vertical_mode='symmetric', start_turn=1, start_angle=0, fwd_end_angle=0, 
+    rev_end_angle=0, radial_shift=0, xy_ext_arr=None,
+    wg_width=wg_width, n_pts=None, seg_length=seg_length, verbose=False,
+    segmentation='analytic', cross_check=None, max_sagitta=None):
+    '''
+    Returns the same arc length as 'delay_spiral_geo_alength' without
+    generating any coordinates. The angles at which the spirals are divided 
+    into segments are computed exactly (see 'arithmetic_spiral_tangent_thetas'),
+    the length of each spiral between them is given by 
+    'arithmetic_spiral_alength', the lengths of the straight extensions are 
+    read off the array of shifts applied to each segment, and the length of 
+    the s-bend joining the innermost points is given by 's_bend_alength'.
+
+    The result is identical to 'delay_spiral_geo_alength' with 'analytic'
+    segmentation. With the default 'sampled' segmentation the ends of the
+    segments are only located among the sampled coordinates, so the 
+    geometry-based arc length differs from this one by up to a few microns 
+    (e.g. 2.0 um for 8 turns with a spacing of 0.5 um and the default 
+    'seg_length'). Tuning 
+    only uses this function with 'analytic' segmentation; the default 
+    'sampled' tuning computes the arc length from the geometry, and only
+    the estimates of 'delay_spiral_feasibility' come from this function.
+
+    Results can be cached like those of 'delay_spiral_geo_alength'.
+
+    Args:
+        Same as 'delay_spiral_geo_alength', except that 'segmentation'
+        defaults to 'analytic'. 'n_pts', 'seg_length', 'segmentation', and 
+        'max_sagitta' are only used by the cross check.
+
+        cross_check:    If a number is passed, the arc length is also
+                        computed with 'delay_spiral_geo_alength' with the
+                        given 'segmentation' and a RuntimeError is raised if
+                        the two differ by more than this many microns. With
+                        'sampled' segmentation, allow for the discrepancy
+                        described above.
+                        <float or None>
+                        (default: None)
+
+    Return:
+        Total arc length of the delay spiral.
+        <float>
+    '''
+    # Need spacing between waveguide centers since we're calculating the
+    # length of the curve defining the path, and double it so that spacing
+    # between arms of intertwined spirals equals 'spacing'.
+    b = 2 * (spacing + wg_width) / (2 * np.pi)
+
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    fwd_end_theta = start_theta + ma.radians(360 * turns + fwd_end_angle)
+    rev_end_theta = start_theta + ma.radians(360 * turns + rev_end_angle)
+
+    # The reverse spiral is the forward one reflected about the origin, so 
+    # both are tangent to the axes at the same angles. The segments they're
+    # divided into span the first to the last of these in each spiral.
+    fwd_inner_theta, fwd_inner_k, fwd_outer_theta, fwd_outer_k = \
+        arithmetic_spiral_tangent_range(b, radial_shift, 
+            start_theta, fwd_end_theta)
+    rev_inner_theta, rev_inner_k, rev_outer_theta, rev_outer_k = \
+        arithmetic_spiral_tangent_range(b, radial_shift, 
+            start_theta, rev_end_theta)
+
+    fwd_n_segs = fwd_outer_k - fwd_inner_k
+    rev_n_segs = rev_outer_k - rev_inner_k
+
+    if min(fwd_n_segs, rev_n_segs) < 1:
+        raise ValueError(
+            "The sprial coordinates supplied did not contain a full segment. "
+            + "Try supplying coordinates over a larger range.")
+
+    fwd_spiral_length = arithmetic_spiral_alength(b, radial_shift, 
+        fwd_inner_theta, fwd_outer_theta)
+    rev_spiral_length = arithmetic_spiral_alength(b, radial_shift, 
+        rev_inner_theta, rev_outer_theta)
+
+    # When a single extension length is given for all turns, the array only
+    # needs enough turns for the spiral with more segments to serve both.
+    shift = xy_ext_arr
+    if shift is None:
+        shift = arithmetic_spiral_shift_array(vertical, horizontal,
+            max(fwd_n_segs, rev_n_segs) // 2 + 1, 
+            vertical_mode, horizontal_mode)
+
+    def ext_length(n_segs, start_quad):
+        '''Computes total length of extensions to delay spiral'''
+        seg_shifts = arithmetic_spiral_segment_shifts(shift, n_segs, 
+            start_quad, 1, quad_shift)
+
+        # Neighbouring segments meet before they're shifted, so each 
+        # extension is the difference between their shifts, which is purely
+        # horizontal or vertical.
+        return np.abs(np.diff(seg_shifts, axis=0).sum(1)).sum()
+    #enddef
+
+    # The segment starting at the kth tangent point is in quadrant k of the
+    # forward spiral, and the opposite quadrant of the reverse one. Both 
+    # spirals turn counter-clockwise.
+    fwd_extensions_length = ext_length(fwd_n_segs, fwd_inner_k % 4)
+    rev_extensions_length = ext_length(rev_n_segs, (rev_inner_k + 2) % 4)
+
+    # The innermost points of the unextended spirals are reflections of each
+    # other about the origin, so they're separated by twice the position of
+    # the forward one.
+    inner_radius = radial_shift + (b * fwd_inner_theta)
+    separation_x = abs(2 * inner_radius * ma.cos(fwd_inner_theta))
+    separation_y = abs(2 * inner_radius * ma.sin(fwd_inner_theta))
+
+    # At even tangent points the spiral is parallel to the y axis, so the
+    # inner terminations point along y and the s-bend's 'length' is given
+    # by the vertical distance. At odd ones they point along x.
+    if fwd_inner_k % 2 == 0:
+        s_bend_length, s_bend_height = separation_y, separation_x
+    else:
+        s_bend_length, s_bend_height = separation_x, separation_y
+
     s_bend_arc_length_ = s_bend_alength(s_bend_length, s_bend_height)
 
     if verbose:
@@ -1688,9 +3570,175 @@ def delay_spiral_geo_alength(turns, spacing, vertical=0,
     total_arc_length = fwd_spiral_length + fwd_extensions_length + \
         rev_spiral_length + rev_extensions_length + s_bend_arc_length_
 
+    if cross_check is not None:
+        geo_arc_length = delay_spiral_geo_alength(turns, spacing, 
+            vertical=vertical, horizontal=horizontal, quad_shift=quad_shift,
+            horizontal_mode=horizontal_mode, vertical_mode=vertical_mode,
+            start_turn=start_turn, start_angle=start_angle, 
+            fwd_end_angle=fwd_end_angle, rev_end_angle=rev_end_angle, 
+            radial_shift=radial_shift, xy_ext_arr=xy_ext_arr, 
+            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
+            segmentation=segmentation, max_sagitta=max_sagitta)
+
+        if verbose:
+            print("Arc length from geometry: {} um".format(geo_arc_length))
+
+        if abs(total_arc_length - geo_arc_length) > cross_check:
+            raise RuntimeError(
+                "The analytic arc length of the delay spiral, "
+                + "{} um, differs from the ".format(total_arc_length)
+                + "arc length computed from its geometry, "
+                + "{} um, by more than {} um.".format(
+                    geo_arc_length, cross_check))
+
     return total_arc_length
 
 
+def delay_spiral_geo_alength_batch(turns, spacing, radial_shift=0, 
+    vertical=0, horizontal=0, start_turn=1, start_angle=0, fwd_end_angle=0,
+    rev_end_angle=0, wg_width=wg_width):
+    '''
+    Returns the arc lengths of many delay spirals at once, evaluated as in
+    'delay_spiral_geo_alength_analytic' but with numpy broadcasting over the
+    parameters of the spirals instead of a loop over them. This is intended
+    for scanning the design space, e.g. to size banks of delay lines.
+
+    Each spiral has a single vertical and horizontal extension length for all
+    turns. Every segment boundary at which the spiral is parallel to the x
+    axis then contributes |horizontal| to the length of the extensions, and
+    every boundary at which it's parallel to the y axis contributes 
+    |vertical|, regardless of the extension modes and 'quad_shift', so these
+    aren't arguments here.
+
+    Args:
+        turns:          Number of full turns each spiral will make.
+                        <int or np.ndarray of ints>
+
+        spacing:        Distance between the edges of successive waveguides.
+                        <float or np.ndarray>
+
+        radial_shift:   Shifts the radius of the spirals uniformly.
+                        <float or np.ndarray>
+                        (default: 0)
+
+        vertical:       Length of the vertical extensions of each turn.
+                        <float or np.ndarray>
+                        (default: 0)
+
+        horizontal:     Length of the horizontal extensions of each turn.
+                        <float or np.ndarray>
+                        (default: 0)
+
+        start_turn, start_angle, fwd_end_angle, rev_end_angle, wg_width:
+                        Shared by all spirals. See 'delay_spiral_geo'.
+
+    Return:
+        Total arc length of each spiral, with the shape of 'turns', 
+        'spacing', 'radial_shift', 'vertical', and 'horizontal' broadcast
+        against each other. Spirals too short to contain a full segment 
+        have an arc length of NaN.
+        <np.ndarray>
+    '''
+    turns, spacing, radial_shift, vertical, horizontal = np.broadcast_arrays(
+        turns, spacing, radial_shift, vertical, horizontal)
+
+    b = 2 * (spacing + wg_width) / (2 * np.pi)
+
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    fwd_end_theta = start_theta + np.radians(360 * turns + fwd_end_angle)
+    rev_end_theta = start_theta + np.radians(360 * turns + rev_end_angle)
+
+    # The reverse spirals are the forward ones reflected about the origin, so
+    # both are tangent to the axes at the same angles.
+    inner_theta, inner_k, fwd_outer_theta, fwd_outer_k = \
+        arithmetic_spiral_tangent_range(b, radial_shift, 
+            start_theta, fwd_end_theta)
+    _, _, rev_outer_theta, rev_outer_k = \
+        arithmetic_spiral_tangent_range(b, radial_shift, 
+            start_theta, rev_end_theta)
+
+    spiral_length = \
+        arithmetic_spiral_alength(b, radial_shift, 
+            inner_theta, fwd_outer_theta) + \
+        arithmetic_spiral_alength(b, radial_shift, 
+            inner_theta, rev_outer_theta)
+
+    def ext_length(outer_k):
+        '''Computes total length of extensions to delay spirals'''
+        n_vertical, n_horizontal = \
+            arithmetic_spiral_boundary_counts(inner_k, outer_k)
+        return (np.abs(vertical) * n_vertical) + \
+            (np.abs(horizontal) * n_horizontal)
+    #enddef
+
+    extensions_length = ext_length(fwd_outer_k) + ext_length(rev_outer_k)
+
+    # The innermost points of the unextended spirals are reflections of each
+    # other about the origin. At even tangent points the spirals are parallel
+    # to the y axis, so the s-bend's 'length' is given by the vertical 
+    # distance between them, and at odd ones by the horizontal distance.
+    inner_radius = radial_shift + (b * inner_theta)
+    separation_x = np.abs(2 * inner_radius * np.cos(inner_theta))
+    separation_y = np.abs(2 * inner_radius * np.sin(inner_theta))
+
+    along_y = inner_k % 2 == 0
+    s_bend_length = np.where(along_y, separation_y, separation_x)
+    s_bend_height = np.where(along_y, separation_x, separation_y)
+
+    total_arc_length = spiral_length + extensions_length + \
+        s_bend_alength_batch(s_bend_length, s_bend_height)
+
+    # Spirals without a full segment couldn't be generated
+    too_short = (fwd_outer_k <= inner_k) | (rev_outer_k <= inner_k)
+
+    return np.where(too_short, np.nan, total_arc_length)
+
+
+def delay_spiral_ext_counts(turns, spacing, radial_shift=0, start_turn=1,
+    start_angle=0, fwd_end_angle=0, rev_end_angle=0, wg_width=wg_width):
+    '''
+    Returns the number of vertical and horizontal straight extensions in
+    both spirals of a delay spiral (see 'arithmetic_spiral_boundary_counts').
+    Since the arc length of a delay spiral with non-negative extensions grows
+    linearly with the length of its extensions, these are the rates at which
+    it grows with 'vertical' and 'horizontal' when every turn is extended
+    by the same length. 'delay_spiral_alen_tuning' uses them to trim the arc
+    length with the extensions instead of the spacing.
+
+    Args:
+        turns, spacing, radial_shift:
+                        See 'delay_spiral_geo_alength_batch'.
+                        <int, float or np.ndarray>
+
+        start_turn, start_angle, fwd_end_angle, rev_end_angle, wg_width:
+                        See 'delay_spiral_geo'.
+
+    Return:
+        n_vertical:     Number of vertical extensions in both spirals.
+                        <int or np.ndarray of ints>
+
+        n_horizontal:   Number of horizontal extensions in both spirals.
+                        <int or np.ndarray of ints>
+    '''
+    b = 2 * (spacing + wg_width) / (2 * np.pi)
+
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    fwd_end_theta = start_theta + np.radians(360 * turns + fwd_end_angle)
+    rev_end_theta = start_theta + np.radians(360 * turns + rev_end_angle)
+
+    _, inner_k, _, fwd_outer_k = arithmetic_spiral_tangent_range(b,
+        radial_shift, start_theta, fwd_end_theta)
+    _, _, _, rev_outer_k = arithmetic_spiral_tangent_range(b,
+        radial_shift, start_theta, rev_end_theta)
+
+    fwd_vertical, fwd_horizontal = \
+        arithmetic_spiral_boundary_counts(inner_k, fwd_outer_k)
+    rev_vertical, rev_horizontal = \
+        arithmetic_spiral_boundary_counts(inner_k, rev_outer_k)
+
+    return fwd_vertical + rev_vertical, fwd_horizontal + rev_horizontal
+
+
 def arithmetic_spiral_alength(b, a, theta0, theta1):
     '''
     The formula for the arc length of the arithmetic spiral curve
@@ -1714,6 +3762,258 @@ def arithmetic_spiral_alength(b, a, theta0, theta1):
     return indef_integral(b, a, theta1) - indef_integral(b, a, theta0)
 
 
+def delay_spiral_arm_segments(turns, spacing, n_pts=None, 
+    seg_length=seg_length, start_turn=1, start_angle=0, fwd_end_angle=0, 
+    rev_end_angle=0, radial_shift=0, segmentation='sampled', 
+    max_sagitta=None):
+    '''
+    Generates the forward and reverse arms of a delay spiral, divided into 
+    segments whose ends are tangent to the x and y axes, before any 
+    extensions are applied.
+
+    The reverse arm is the forward one reflected about the origin, apart from
+    where it ends. With 'analytic' segmentation, each segment is sampled 
+    between its exact tangent points (see 'arithmetic_spiral_curve_segments'),
+    so the segments the arms have in common are sampled at the same angles
+    (unless 'n_pts' is given, which is divided among the segments of each 
+    arm separately), and are computed only once for the forward arm and 
+    reflected. Only the segments at the outer end of the longer arm are 
+    sampled separately. With 'sampled' segmentation, each arm is sampled 
+    uniformly over its own range of angles (see 'arithmetic_spiral_curve'),
+    so the arms don't share any points and are both generated in full.
+
+    Args:
+        turns:          Number of full turns each arm makes.
+                        <int>
+
+        spacing:        Distance between successive wrappings of each arm,
+                        i.e. twice the distance between the centers of 
+                        neighbouring waveguides of the delay spiral.
+                        <float or int>
+
+        n_pts, seg_length, start_turn, start_angle, fwd_end_angle, 
+        rev_end_angle, radial_shift, segmentation, max_sagitta:
+                        See 'delay_spiral_geo'.
+
+    Return:
+        fwd_spiral_segs, rev_spiral_segs:
+                        The segments of the forward and reverse arms, from
+                        the innermost outwards.
+                        <SegmentedCurves>
+    '''
+    if segmentation == 'sampled':
+        fwd_coords = arithmetic_spiral_curve(turns, spacing, n_pts, 
+            seg_length=seg_length, start_turn=start_turn, 
+            start_angle=start_angle, end_angle=fwd_end_angle, 
+            radial_shift=radial_shift, max_sagitta=max_sagitta)
+        rev_coords = arithmetic_spiral_curve(turns, -spacing, n_pts, 
+            seg_length=seg_length, start_turn=start_turn, 
+            start_angle=start_angle, end_angle=rev_end_angle, 
+            radial_shift=-radial_shift, max_sagitta=max_sagitta)
+
+        return (arithmetic_spiral_segments(fwd_coords), 
+                arithmetic_spiral_segments(rev_coords))
+
+    elif segmentation != 'analytic':
+        raise ValueError(
+            "Unrecognized 'segmentation': '{}'. ".format(segmentation)
+            + "Use 'sampled' or 'analytic'.")
+
+    b = spacing / (2 * np.pi)
+
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    fwd_end_theta = start_theta + ma.radians(360 * turns + fwd_end_angle)
+    rev_end_theta = start_theta + ma.radians(360 * turns + rev_end_angle)
+
+    # The reverse arm, r = -(b * theta) - a, is tangent to the axes at the 
+    # same angles as the forward one.
+    fwd_thetas, _ = arithmetic_spiral_tangent_thetas(b, radial_shift, 
+        start_theta, fwd_end_theta)
+    rev_thetas, _ = arithmetic_spiral_tangent_thetas(b, radial_shift, 
+        start_theta, rev_end_theta)
+
+    # Make sure there are enough tangent points for at least 1 full segment.
+    if min(fwd_thetas.size, rev_thetas.size) < 2:
+        raise ValueError(
+            "The sprial coordinates supplied did not contain a full segment. "
+            + "Try supplying coordinates over a larger range.")
+
+    fwd_seg_thetas = arithmetic_spiral_segment_thetas(b, radial_shift, 
+        fwd_thetas, n_pts, seg_length, fwd_end_theta - start_theta, 
+        max_sagitta)
+    rev_seg_thetas = arithmetic_spiral_segment_thetas(b, radial_shift, 
+        rev_thetas, n_pts, seg_length, rev_end_theta - start_theta, 
+        max_sagitta)
+
+    fwd_spiral_segs = arithmetic_spiral_sample_segments(b, radial_shift, 
+        fwd_seg_thetas)
+
+    # Reflect the forward arm's segments wherever the reverse arm's segment
+    # is sampled identically, which is all of them unless 'n_pts' is given,
+    # and sample the rest of the reverse arm, r = -(b * theta) - a, itself.
+    rev_offsets = np.concatenate(
+        ([0], np.cumsum([theta.size for theta in rev_seg_thetas])))
+    rev_coords = np.empty((2, rev_offsets[-1]))
+
+    unshared = []
+    for i, theta in enumerate(rev_seg_thetas):
+        if i < len(fwd_seg_thetas) and \
+           np.array_equal(theta, fwd_seg_thetas[i]):
+            np.negative(fwd_spiral_segs[i], 
+                out=rev_coords[:, rev_offsets[i]:rev_offsets[i + 1]])
+        else:
+            unshared.append(i)
+
+    if unshared:
+        unshared_segs = arithmetic_spiral_sample_segments(-b, -radial_shift,
+            [rev_seg_thetas[i] for i in unshared])
+        for i, seg in zip(unshared, unshared_segs):
+            rev_coords[:, rev_offsets[i]:rev_offsets[i + 1]] = seg
+
+    return fwd_spiral_segs, SegmentedCurve(rev_coords, rev_offsets)
+
+
+def delay_spiral_arm_chunks(turns, spacing, vertical=0, horizontal=0, 
+    quad_shift=0, horizontal_mode='symmetric', vertical_mode='symmetric', 
+    start_turn=1, start_angle=0, end_angle=0, radial_shift=0, 
+    xy_ext_arr=None, n_pts=None, seg_length=seg_length, max_sagitta=None, 
+    reflect=False, chunk_segments=16, segments=slice(None)):
+    '''
+    Generates an extended arm of a delay spiral with 'analytic' segmentation
+    a few segments at a time, so that the coordinates of the whole arm are 
+    never held in memory at once. Each segment is sampled between its exact
+    tangent points (see 'arithmetic_spiral_segment_thetas') and translated
+    by its extension (see 'arithmetic_spiral_segment_shifts'), giving the 
+    same coordinates as 'delay_spiral_arm_segments' followed by 
+    'arithmetic_spiral_extension'.
+
+    Every chunk but the last also ends with the first two points of the 
+    next one, so paths made from consecutive chunks overlap along the first
+    edge of the next chunk. Their union is then the same as that of a single 
+    path through all the points, with no gaps at the ends of the chunks.
+
+    Args:
+        turns:          Number of full turns the arm makes.
+                        <int>
+
+        spacing:        Distance between successive wrappings of the arm,
+                        as in 'delay_spiral_arm_segments'.
+                        <float or int>
+
+        end_angle:      'fwd_end_angle' or 'rev_end_angle' of the arm. See
+                        'delay_spiral_geo'.
+                        <float or int>
+                        (default: 0)
+
+        reflect:        If True, generates the reverse arm, i.e. the arm 
+                        reflected about the origin.
+                        <bool>
+                        (default: False)
+
+        chunk_segments: Number of segments in each chunk.
+                        <int>
+                        (default: 16)
+
+        segments:       The segments to generate, counting from the 
+                        innermost one, e.g. slice(1) for only the innermost
+                        segment.
+                        <slice>
+                        (default: slice(None))
+
+        The remaining arguments are the same as for 'delay_spiral_geo'.
+
+    Yields:
+        Coordinates of each chunk of the extended arm.
+        <2 x N np.ndarray>
+    '''
+    b = spacing / (2 * np.pi)
+
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    end_theta = start_theta + ma.radians(360 * turns + end_angle)
+
+    # These are the same for the reverse arm, as in 
+    # 'delay_spiral_arm_segments'.
+    thetas, _ = arithmetic_spiral_tangent_thetas(b, radial_shift, 
+        start_theta, end_theta)
+
+    # Make sure there are enough tangent points for at least 1 full segment.
+    if thetas.size < 2:
+        raise ValueError(
+            "The sprial coordinates supplied did not contain a full segment. "
+            + "Try supplying coordinates over a larger range.")
+
+    n_segs = thetas.size - 1
+    sign = -1 if reflect else 1
+
+    def sample(i, j):
+        '''Unextended segments i to j - 1'''
+        seg_thetas = arithmetic_spiral_segment_thetas(b, radial_shift, 
+            thetas[i:j + 1], n_pts, seg_length, end_theta - start_theta, 
+            max_sagitta)
+        return arithmetic_spiral_sample_segments(sign * b, 
+            sign * radial_shift, seg_thetas)
+    #enddef
+
+    # The extensions applied to each segment only depend on where the first
+    # segment is, so they can be found for all segments up front.
+    first_seg = sample(0, 1)
+    start_quad, direction = first_seg.quadrants[0], first_seg.direction
+
+    if xy_ext_arr is None:
+        xy_ext_arr = arithmetic_spiral_shift_array(vertical, horizontal,
+            n_segs // 2 + 1, vertical_mode, horizontal_mode)
+
+    seg_shifts = arithmetic_spiral_segment_shifts(xy_ext_arr, n_segs,
+        start_quad, direction, quad_shift)
+
+    seg_indices = range(n_segs)[segments]
+    for start in range(0, len(seg_indices), chunk_segments):
+        chunk_indices = seg_indices[start:start + chunk_segments]
+        i, j = chunk_indices[0], chunk_indices[-1] + 1
+
+        # Overlap the next chunk, if there is one
+        overlap = j < n_segs
+        chunk = sample(i, j + overlap).shifted(seg_shifts[i:j + overlap])
+
+        yield chunk.coords[:, :chunk.offsets[j - i] + 2 * overlap]
+
+
+def delay_spiral_inner_port_angle(coords, segmentation='sampled'):
+    '''
+    Returns the angle in degrees at which the inner termination of a delay 
+    spiral arm points, i.e., the direction from its second point to its 
+    innermost point.
+
+    Args:
+        coords:         Coordinates of the spiral arm, starting at its 
+                        innermost point. With 'analytic' segmentation, these
+                        must be the coordinates before any extensions are
+                        applied.
+                        <2 x N ndarray>
+
+        segmentation:   'sampled' or 'analytic'. See 'delay_spiral_geo'.
+                        With 'analytic' segmentation the first segment may
+                        only be sampled at its ends, so the port is instead
+                        taken to point along the axis that the spiral is
+                        parallel to at its innermost point: the spiral is 
+                        parallel to the y axis where it crosses the x axis, 
+                        and vice versa. Only whether the port lies along x
+                        or y is meaningful in this case.
+                        <str>
+                        (default: 'sampled')
+
+    Return:
+        port_angle:     Angle of the inner port in degrees.
+                        <float>
+    '''
+    if segmentation == 'analytic':
+        innermost_x, innermost_y = coords[:, 0]
+        return 90.0 if abs(innermost_y) < abs(innermost_x) else 0.0
+
+    port_dx, port_dy = coords[:, 0] - coords[:, 1]
+    return ma.degrees(np.arctan2(port_dy, port_dx))
+
+
 def arithmetic_spiral_extension(coords, vertical, horizontal, quad_shift=0,
     vertical_mode='symmetric', horizontal_mode='symmetric', shift=None,
     concatenate=True):
@@ -1737,7 +4037,15 @@ def arithmetic_spiral_extension(coords, vertical, horizontal, quad_shift=0,
     Args:
         coords:         Cartesian coordinates defining an arithmetic spiral.
                         First column x coords. Second column y coords.
+                        Alternatively, the spiral already divided into 
+                        segments, as returned by 'arithmetic_spiral_segments'
+                        or 'arithmetic_spiral_curve_segments', or as a list
+                        of the coordinates of each segment.
                         <np.ndarray of floats with shape (2, n)>
+                        OR
+                        <SegmentedCurve>
+                        OR
+                        <list of np.ndarrays>
 
         vertical:       Length of vertical straight segments to be inserted.
                         This is done by shifting the segments of the spiral
@@ -1909,146 +4217,352 @@ def arithmetic_spiral_extension(coords, vertical, horizontal, quad_shift=0,
                         translation applied to the segment of the spiral
                         in quadrant 0, and so on.
 
+        concatenate:    If False, the extended spiral is returned divided 
+                        into segments rather than as a single array.
+                        <bool>
+                        (default: True)
+
+    Return:
+        Coordinates of the extended spiral. 
+        First column x coords. Second column y coords.
+        <2D np.ndarray>
+        OR, if concatenate is False
+        <SegmentedCurve>
+    '''
+    # Divide up the spiral into quarters whose endpoints point parallel to 
+    # the x and y axes, unless we were passed the segments already.
+    if isinstance(coords, np.ndarray):
+        spiral_segs = arithmetic_spiral_segments(coords)
+    elif isinstance(coords, SegmentedCurve):
+        spiral_segs = coords
+    else:
+        spiral_segs = SegmentedCurve.from_segments(coords)
+
+    # Which quadrant the first segment is in and which way the spiral 
+    # rotates
+    start_quad = spiral_segs.quadrants[0]
+    direction = spiral_segs.direction
+
+    if shift is None:
+        shift = arithmetic_spiral_shift_array(vertical, horizontal,
+            len(spiral_segs) // 2 + 1, vertical_mode, horizontal_mode)
+
+    # Go through the list of lateral extensions in each direction an apply
+    # each one to the appropriate side of the appropriate turn of the spiral.
+    # These extensions are applied by shifting each segment of the spiral by 
+    # an amount specified by the corresponding entry in the array 'shift'.
+    seg_shifts = arithmetic_spiral_segment_shifts(shift, len(spiral_segs),
+        start_quad, direction, quad_shift)
+
+    # Translate every segment of the spiral at once. The segments are stored
+    # one after another, so their coordinates are already concatenated. 
+    # Plotting and layout tools should take care of joining the lines 
+    # between the ends of each segment of the concatenated array of points.
+    extended_segs = spiral_segs.shifted(seg_shifts)
+
+    if concatenate:
+        return extended_segs.coords
+    else:
+        return extended_segs
+
+
+def arithmetic_spiral_start_quadrant(first_seg):
+    '''
+    Returns the quadrant containing the first segment of an arithmetic 
+    spiral and the direction in which the spiral turns, as needed by 
+    'arithmetic_spiral_segment_shifts'. The chord between the ends of the
+    segment is used, so that it works no matter how few points the segment
+    has: the middle of the chord is in the same quadrant as the segment, and
+    the chord turns the same way as the spiral.
+
+    Args:
+        first_seg:      Coordinates of the first segment of the spiral.
+                        <2 x N np.ndarray>
+
+    Return:
+        start_quad:     Quadrant containing the segment, zero-indexed as in
+                        'arithmetic_spiral_extension'.
+                        <int>
+
+        direction:      1 if the spiral turns counter-clockwise, -1 if 
+                        clockwise.
+                        <int>
+    '''
+    start_x, start_y = first_seg[:, 0]
+    end_x, end_y = first_seg[:, -1]
+    sample1_angle = ma.atan2(start_y + end_y, start_x + end_x)
+
+    # Map angle to between 0 and 2 pi
+    if sample1_angle < 0: sample1_angle += 2 * np.pi
+
+    if start_x * end_y - start_y * end_x > 0:  # if counter-clockwise
+        direction = 1   # next quadrant gotten by incrementing
+    else:                                       # if clockwise
+        direction = -1  # next quadrant gotten by decrementing
+
+    start_quad = int(sample1_angle // (np.pi / 2))  # zero-indexing quadrants
+
+    return start_quad, direction
+
+
+def arithmetic_spiral_shift_array(vertical, horizontal, total_turns,
+    vertical_mode='symmetric', horizontal_mode='symmetric'):
+    '''
+    Builds the array of translations applied to each quadrant of each turn
+    of an arithmetic spiral by 'arithmetic_spiral_extension'. See that 
+    function for details on the arguments.
+
+    Args:
+        vertical:       Lengths of the vertical extensions, one per turn, or
+                        a single length for all turns.
+                        <float or int or 1D np.ndarray>
+
+        horizontal:     Lengths of the horizontal extensions, one per turn, 
+                        or a single length for all turns.
+                        <float or int or 1D np.ndarray>
+
+        total_turns:    Number of extensions to generate when 'vertical' or
+                        'horizontal' is a single length.
+                        <int>
+
+        vertical_mode:  'symmetric', 'top', or 'bottom'
+                        <str>
+                        (default: 'symmetric')
+
+        horizontal_mode: 'symmetric', 'left', or 'right'
+                        <str>
+                        (default: 'symmetric')
+
+    Return:
+        shift:          The x and y translations for each quadrant and turn.
+                        shift[quadrant, 0, turn] is the x translation and
+                        shift[quadrant, 1, turn] the y translation.
+                        <np.ndarray with shape (4, 2, total_turns)>
+    '''
+    if type(vertical) == int or type(vertical) == float:
+        vertical = np.full(total_turns, vertical, float)
+    if type(horizontal) == int or type(horizontal) == float:
+        horizontal = np.full(total_turns, horizontal, float)
+
+    if vertical_mode == 'symmetric':
+        vertical_shifts = np.array([
+             vertical / 2,                  # quadrant 0
+             vertical / 2,                  # quadrant 1
+            -vertical / 2,                  # quadrant 2
+            -vertical / 2])                 # quadrant 3
+
+    elif vertical_mode == 'top':
+        vertical_shifts = np.array([
+            vertical,                       # quadrant 0
+            vertical,                       # quadrant 1
+            np.zeros(vertical.size),        # quadrant 2
+            np.zeros(vertical.size)])       # quadrant 3
+
+    elif vertical_mode == 'bottom':
+        vertical_shifts = np.array([
+            np.zeros(vertical.size),        # quadrant 0
+            np.zeros(vertical.size),        # quadrant 1
+            -vertical,                      # quadrant 2
+            -vertical])                     # quadrant 3
+
+    else:
+        raise ValueError(
+            "Expected one of the strings 'symmetric', 'top', or 'bottom' "
+            + "to be passed to the argument 'vertical_mode'. "
+            + "Instead got '{}'.".format(vertical_mode))
+        
+    if horizontal_mode == 'symmetric':
+        horizontal_shifts = np.array([
+             horizontal / 2,                # quadrant 0
+            -horizontal / 2,                # quadrant 1
+            -horizontal / 2,                # quadrant 2
+             horizontal / 2])               # quadrant 3
+
+    elif horizontal_mode == 'right':
+        horizontal_shifts = np.array([
+            horizontal,                     # quadrant 0
+            np.zeros(horizontal.size),      # quadrant 1
+            np.zeros(horizontal.size),      # quadrant 2
+            horizontal])                    # quadrant 3
+
+    elif horizontal_mode == 'left':
+        horizontal_shifts = np.array([
+            np.zeros(horizontal.size),      # quadrant 0
+            -horizontal,                    # quadrant 1
+            -horizontal,                    # quadrant 2
+            np.zeros(horizontal.size)])     # quadrant 3
+
+    else:
+        raise ValueError(
+            "Expected one of the strings 'symmetric', 'left', or 'right' "
+            + "to be passed to the argument 'horizontal_mode'. "
+            + "Instead got '{}'.".format(horizontal_mode))
+
+    shift = np.stack((horizontal_shifts, vertical_shifts), axis=1)
+    # For reference, if both vertical and horizontal modes are symmetric,
+    # the 'shift' array would look like this:
+    #
+    # shift = np.array([
+    #     [ horizontal / 2,  vertical / 2],   # quadrant 0
+    #     [-horizontal / 2,  vertical / 2],   # quadrant 1
+    #     [-horizontal / 2, -vertical / 2],   # quadrant 2
+    #     [ horizontal / 2, -vertical / 2],   # quadrant 3
+    # ])
+
+    return shift
+
+
+def arithmetic_spiral_segment_shifts(shift, n_segs, start_quad, direction=1,
+    quad_shift=0):
+    '''
+    Picks out the translation applied to each segment of an arithmetic spiral
+    by 'arithmetic_spiral_extension' from the array 'shift'.
+
+    NOTE: quadrants are zero-indexed as in 'arithmetic_spiral_extension'.
+
+    Args:
+        shift:          Translations for each quadrant and turn, as returned
+                        by 'arithmetic_spiral_shift_array'.
+                        <np.ndarray with shape (4, 2, turns)>
+
+        n_segs:         Number of segments in the spiral.
+                        <int>
+
+        start_quad:     Quadrant containing the first segment.
+                        <int>
+
+        direction:      1 if the spiral turns counter-clockwise, such that 
+                        the next quadrant is gotten by incrementing, and -1
+                        if it turns clockwise.
+                        <int>
+                        (default: 1)
+
+        quad_shift:     See 'arithmetic_spiral_extension'.
+                        <int>
+                        (default: 0)
+
     Return:
-        Coordinates of the extended spiral. 
-        First column x coords. Second column y coords.
-        <2D np.ndarray>
+        seg_shifts:     The x, y translation of each segment.
+                        <np.ndarray with shape (n_segs, 2)>
     '''
-    # Divide up the spiral into quarters whose endpoints point parallel to 
-    # the x and y axes.
-    spiral_segs = arithmetic_spiral_segments(coords)
-
-    # Figure out which quadrant the first segment is in and which way
-    # the spiral rotates. We'll use two adjacent points about in the middle
-    # of the first segment to do this.
-    first_seg = spiral_segs[0]
-    sample1_index = int(len(first_seg) // 2)
-    sample2_index = int(len(first_seg) // 2 + 1)
-    sample1_x, sample1_y = first_seg[:, sample1_index]
-    sample2_x, sample2_y = first_seg[:, sample2_index]
-    sample1_angle = ma.atan2(sample1_y, sample1_x)
-    sample2_angle = ma.atan2(sample2_y, sample2_x)
-
-    # Map angles to between 0 and 2 pi
-    if sample1_angle < 0: sample1_angle += 2 * np.pi
-    if sample2_angle < 0: sample2_angle += 2 * np.pi
+    # As we go through the segments, we keep track of which quadrant each
+    # segment is in, and from the quadrant what side of the x and y axes it
+    # is on, so we can determine when to apply the next value along the 2nd
+    # axis of the array 'shift'. We subtract the starting quadrant 
+    # 'start_quad' so that both forward and reverse spirals have each 
+    # extension applied in the same place.
+    idx = np.arange(n_segs)
+    quadrant = (start_quad + direction * idx) % 4
 
-    if sample2_angle > sample1_angle:  # if clockwise
-        direction = 1   # next quadrant gotten by incrementing
-    else:                              # if counter-clockwise
-        direction = -1  # next quadrant gotten by decrementing
+    # Row 0 holds the horizontal halves and row 1 the vertical ones
+    halves = (idx - start_quad + quad_shift - np.array([[1], [0]])) // 2
+    halves = np.maximum(halves, 0).astype(int)
 
-    quadrant = int(sample1_angle // (np.pi / 2))   # zero-indexing quadrants
-    start_quad = quadrant
+    return shift[quadrant, np.array([[0], [1]]), halves].T
 
-    if shift is None:
-        total_turns = len(spiral_segs) // 2 + 1
-        if type(vertical) == int or type(vertical) == float:
-            vertical = np.full(total_turns, vertical, np.float)
-        if type(horizontal) == int or type(horizontal) == float:
-            horizontal = np.full(total_turns, horizontal, np.float)
-
-        if vertical_mode == 'symmetric':
-            vertical_shifts = np.array([
-                 vertical / 2,                  # quadrant 0
-                 vertical / 2,                  # quadrant 1
-                -vertical / 2,                  # quadrant 2
-                -vertical / 2])                 # quadrant 3
-
-        elif vertical_mode == 'top':
-            vertical_shifts = np.array([
-                vertical,                       # quadrant 0
-                vertical,                       # quadrant 1
-                np.zeros(vertical.size),        # quadrant 2
-                np.zeros(vertical.size)])       # quadrant 3
-
-        elif vertical_mode == 'bottom':
-            vertical_shifts = np.array([
-                np.zeros(vertical.size),        # quadrant 0
-                np.zeros(vertical.size),        # quadrant 1
-                -vertical,                      # quadrant 2
-                -vertical])                     # quadrant 3
 
-        else:
-            raise ValueError(
-                "Expected one of the strings 'symmetric', 'top', or 'bottom' "
-                + "to be passed to the argument 'vertical_mode'. "
-                + "Instead got '{}'.".format(vertical_mode))
-            
-        if horizontal_mode == 'symmetric':
-            horizontal_shifts = np.array([
-                 horizontal / 2,                # quadrant 0
-                -horizontal / 2,                # quadrant 1
-                -horizontal / 2,                # quadrant 2
-                 horizontal / 2])               # quadrant 3
-
-        elif horizontal_mode == 'right':
-            horizontal_shifts = np.array([
-                horizontal,                     # quadrant 0
-                np.zeros(horizontal.size),      # quadrant 1
-                np.zeros(horizontal.size),      # quadrant 2
-                horizontal])                    # quadrant 3
-
-        elif horizontal_mode == 'left':
-            horizontal_shifts = np.array([
-                np.zeros(horizontal.size),      # quadrant 0
-                -horizontal,                    # quadrant 1
-                -horizontal,                    # quadrant 2
-                np.zeros(horizontal.size)])     # quadrant 3
+class SegmentedCurve:
+    '''
+    A curve divided into segments, such as an arithmetic spiral divided at 
+    the points where it's tangent to the x and y axes. The coordinates of
+    all segments are stored one after another in a single array, with each
+    segment including both of its ends, so the points at which segments 
+    meet appear twice. Translating the segments independently, as 
+    'arithmetic_spiral_extension' does, then takes a single array operation
+    and leaves the coordinates of the whole curve already concatenated.
+
+    It behaves like a list of the coordinates of each segment: len() gives
+    the number of segments, and indexing and iteration give views into 
+    'coords'. Slicing gives a list of such views.
+
+    NOTE: quadrants are zero-indexed as in 'arithmetic_spiral_extension'.
+
+    Attributes:
+        coords:         Coordinates of the segments, one after another.
+                        <2 x N np.ndarray>
+
+        offsets:        Index into 'coords' of the first point of each 
+                        segment, followed by N.
+                        <1D np.ndarray of ints>
+
+        quadrants:      Quadrant containing each segment.
+                        <1D np.ndarray of ints>
+
+        direction:      1 if the curve turns counter-clockwise, such that the
+                        next quadrant is gotten by incrementing, and -1 if it
+                        turns clockwise.
+                        <int>
+    '''
+    __slots__ = ('coords', 'offsets', 'quadrants', 'direction')
 
-        else:
-            raise ValueError(
-                "Expected one of the strings 'symmetric', 'left', or 'right' "
-                + "to be passed to the argument 'horizontal_mode'. "
-                + "Instead got '{}'.".format(horizontal_mode))
-
-        shift = np.stack((horizontal_shifts, vertical_shifts), axis=1)
-        # For reference, if both vertical and horizontal modes are symmetric,
-        # the 'shift' array would look like this:
-        #
-        # shift = np.array([
-        #     [ horizontal / 2,  vertical / 2],   # quadrant 0
-        #     [-horizontal / 2,  vertical / 2],   # quadrant 1
-        #     [-horizontal / 2, -vertical / 2],   # quadrant 2
-        #     [ horizontal / 2, -vertical / 2],   # quadrant 3
-        # ])
-
-    # endif
+    def __init__(self, coords, offsets, quadrants=None, direction=None):
+        self.coords = coords
+        self.offsets = offsets
 
-    # Go through the list of lateral extensions in each direction an apply
-    # each one to the appropriate side of the appropriate turn of the spiral.
-    # These extensions are applied by shifting each segment of the spiral by 
-    # an amount specified by the corresponding entry in the array 'shift'.
-    for idx, seg in enumerate(spiral_segs):
-        # In this loop, as we iterate through the segments, we keep track of
-        # which quadrant the segment is in, and from the quadrant what side 
-        # of the x and y axes it is on, so we can determine when to apply the
-        # next value along the 2nd axis of the array 'shift'.
-        # We subtract the starting quadrant 'start_quad' so that both forward
-        # and reverse spirals have each extension applied in the same place.
-        # 
-        vert_half = int((idx - start_quad + quad_shift) // 2)
-        hori_half = int((idx - 1 - start_quad + quad_shift) // 2) 
-        if vert_half < 0: vert_half = 0
-        if hori_half < 0: hori_half = 0
-
-        next_shift = np.array([
-            shift[quadrant, 0, hori_half],
-            shift[quadrant, 1, vert_half]
-        ])
-        # Translate this segment of the spiral appropriately
-        spiral_segs[idx] = (seg.transpose() + next_shift).transpose()
-        # Compute next quadrant (wraps back to 0 after quadrant 3)
-        quadrant = (quadrant + direction) % 4
-
-    # Concatenate and return the transformed segments. Plotting and layout 
-    # tools should take care of joining the lines between the ends of each
-    # segment of the concatenated array of points.
+        # Find the quadrants from the first segment, unless they're known
+        if quadrants is None:
+            start_quad, direction = arithmetic_spiral_start_quadrant(self[0])
+            quadrants = (start_quad + direction * np.arange(len(self))) % 4
 
-    if concatenate:
-        return np.concatenate(spiral_segs, axis=1)
-    else:
-        return spiral_segs
+        self.quadrants = quadrants
+        self.direction = direction
+
+    @classmethod
+    def from_segments(cls, segs):
+        '''Builds the curve from a list of the coordinates of each segment'''
+        sizes = [seg.shape[1] for seg in segs]
+        return cls(np.concatenate(segs, axis=1), 
+                   np.concatenate(([0], np.cumsum(sizes))))
+
+    def __len__(self):
+        return self.offsets.size - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(len(self))[idx]]
+
+        idx = range(len(self))[idx]
+        return self.coords[:, self.offsets[idx]:self.offsets[idx + 1]]
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def shifted(self, seg_shifts):
+        '''
+        Returns the curve with each segment translated by the corresponding
+        row of 'seg_shifts', a (number of segments) x 2 array, allocating 
+        only the new coordinates.
+        '''
+        coords = np.repeat(seg_shifts.T, np.diff(self.offsets), axis=1)
+        coords += self.coords
+        return SegmentedCurve(coords, self.offsets, self.quadrants, 
+                              self.direction)
+
+
+def arithmetic_spiral_sample_segments(b, a, seg_thetas):
+    '''
+    Samples the arithmetic spiral r = (b * theta) + a at the angles of each
+    segment, as returned by 'arithmetic_spiral_segment_thetas', all at once.
+
+    Args:
+        b, a:           Coefficients of the spiral equation.
+                        <float>
+
+        seg_thetas:     The angles sampling each segment.
+                        <list of np.ndarrays>
+
+    Return:
+        The segments of the spiral.
+        <SegmentedCurve>
+    '''
+    theta = np.concatenate(seg_thetas)
+    sizes = [seg_theta.size for seg_theta in seg_thetas]
+
+    r = a + (b * theta)
+
+    return SegmentedCurve(np.stack(polar_to_rect(r, theta)), 
+                          np.concatenate(([0], np.cumsum(sizes))))
 
 
 def arithmetic_spiral_segments(coords):
@@ -2063,20 +4577,15 @@ def arithmetic_spiral_segments(coords):
                         <np.ndarray of floats with shape (2, n)>
 
     Return:
-        spiral_segs:    A list of 2-D numpy arrays, each of which represents
-                        the coordinates of one segment.
-                        <list of np.ndarrays>
+        spiral_segs:    The segments, each of which starts at the point the
+                        previous one ends at.
+                        <SegmentedCurve>
     '''
     # Find indices of the points on the spiral that are parallel to either the
     # x or y axes.
-    negy_inds = relex.argrelmin(coords[1])[0]
-    posy_inds = relex.argrelmax(coords[1])[0]
-    negx_inds = relex.argrelmin(coords[0])[0]
-    posx_inds = relex.argrelmax(coords[0])[0]
-
-    # Get the parallel points that will divide the spiral into the desired
-    # segments, requested by the 'divison' argument.
-    inds = np.concatenate((negy_inds, posy_inds, negx_inds, posx_inds))
+    # These are the relative extrema of the x and y coordinates, which come
+    # out already sorted.
+    inds = relex.argrelextrema_xy(coords)[0]
 
     # Figure out how many segments to divide the spiral into.
     num_segs = inds.size - 1
@@ -2088,23 +4597,400 @@ def arithmetic_spiral_segments(coords):
             + "Try supplying coordinates over a larger range, or dividing "
             + "into smaller segments.")
 
-    # The indicies need to be sorted after the concatenation
-    inds.sort()
+    # Copy the points of every segment, from inds[i] to inds[i + 1] 
+    # inclusive, into a single array. Copying slices is much faster than 
+    # gathering the points by index.
+    offsets = np.concatenate(([0], np.cumsum(np.diff(inds) + 1)))
+
+    return SegmentedCurve(np.concatenate(
+        [coords[:, inds[i]:inds[i + 1] + 1] for i in range(num_segs)], 
+        axis=1), offsets)
+    
 
-    # Init a list of segments (can't be an np.ndarray since each segment 
-    # will be a different length)
-    spiral_segs = []
+def arithmetic_spiral_tangent_theta(k, b, a, iterations=4):
+    '''
+    Returns the angle theta of the kth point on the arithmetic spiral 
+    r = (b * theta) + a at which the spiral is tangent to the x or y axis. 
 
-    for i in range(num_segs):
-        start = inds[i]
-        end = inds[i + 1] + 1
-        spiral_segs.append(coords[:, start:end])
+    Such points satisfy theta = (k * pi / 2) + atan(b / r), since the angle
+    between the radius and the tangent of the spiral is pi / 2 - atan(b / r).
+    For even k the spiral is parallel to the y axis (dx/dtheta = 0), and for
+    odd k it's parallel to the x axis (dy/dtheta = 0). The equation is solved
+    with Newton's method, which converges within a few iterations since 
+    atan(b / r) varies slowly with theta. Assumes b / r > 0 along the spiral.
+
+    Args:
+        k:              Index of the tangent point. The kth tangent point is
+                        in the interval (k * pi / 2, (k + 1) * pi / 2).
+                        <int or np.ndarray of ints>
+
+        b:              Coefficient of theta in the spiral equation
+                        <float or np.ndarray>
+
+        a:              Constant term in the spiral equation
+                        <float or np.ndarray>
+
+        iterations:     Number of Newton iterations.
+                        <int>
+                        (default: 4)
+
+    Return:
+        theta, in radians
+        <float or np.ndarray>
+    '''
+    # The math module is much faster than numpy for scalars
+    if np.isscalar(k) and np.isscalar(b) and np.isscalar(a):
+        arctan = ma.atan
+    else:
+        arctan = np.arctan
+
+    base = np.multiply(k, np.pi / 2) if arctan is np.arctan else k * np.pi / 2
+
+    theta = base + arctan(b / (a + b * base))
+    for i in range(iterations):
+        r = a + b * theta
+        g = theta - base - arctan(b / r)
+        theta = theta - g / (1 + b**2 / (r**2 + b**2))
+
+    return theta
+
+
+def arithmetic_spiral_tangent_thetas(b, a, theta0, theta1):
+    '''
+    Returns the angles at which the arithmetic spiral r = (b * theta) + a, 
+    for theta \\in (theta0, theta1), is parallel to the x or y axis, along 
+    with the indices of these points (see 'arithmetic_spiral_tangent_theta').
+    These are the angles at which 'arithmetic_spiral_segments' divides the 
+    spiral, found exactly rather than from sampled coordinates.
+
+    Args:
+        b:              Coefficient of theta in the spiral equation
+                        <float>
+
+        a:              Constant term in the spiral equation
+                        <float>
+
+        theta0:         Start of the interval of theta, in radians
+                        <float>
+
+        theta1:         End of the interval of theta, in radians
+                        <float>
+
+    Return:
+        thetas:         The angles, in increasing order.
+                        <np.ndarray of floats>
+
+        ks:             Index of each tangent point. Even for points where
+                        the spiral is parallel to the y axis and odd for those
+                        where it's parallel to the x axis.
+                        <np.ndarray of ints>
+    '''
+    # The kth tangent point lies between k pi / 2 and (k + 1) pi / 2, so
+    # these are the only candidates.
+    ks = np.arange(ma.floor(theta0 / (np.pi / 2)), 
+                   ma.floor(theta1 / (np.pi / 2)) + 1)
+    thetas = arithmetic_spiral_tangent_theta(ks, b, a)
+
+    inside = (thetas > theta0) & (thetas < theta1)
+
+    return thetas[inside], ks[inside]
+
+
+def arithmetic_spiral_tangent_range(b, a, theta0, theta1):
+    '''
+    Returns the first and last of the angles returned by 
+    'arithmetic_spiral_tangent_thetas', with their indices, without solving
+    for the angles in between.
+
+    All arguments may also be arrays, which are broadcast against each other
+    to find the first and last angles of many spirals at once.
+
+    Args:
+        b:              Coefficient of theta in the spiral equation
+                        <float or np.ndarray>
+
+        a:              Constant term in the spiral equation
+                        <float or np.ndarray>
+
+        theta0:         Start of the interval of theta, in radians
+                        <float or np.ndarray>
+
+        theta1:         End of the interval of theta, in radians
+                        <float or np.ndarray>
+
+    Return:
+        first_theta:    The smallest angle in (theta0, theta1) at which the
+                        spiral is parallel to the x or y axis.
+                        <float or np.ndarray>
+
+        first_k:        Index of that point.
+                        <int or np.ndarray of ints>
+
+        last_theta:     The largest such angle.
+                        <float or np.ndarray>
+
+        last_k:         Index of that point. There are last_k - first_k + 1
+                        such points in total.
+                        <int or np.ndarray of ints>
+    '''
+    # The kth tangent point lies between k pi / 2 and (k + 1) pi / 2, so
+    # the first is one of the two points nearest theta0, and the last one of
+    # the two nearest theta1.
+    if np.isscalar(theta0) and np.isscalar(theta1):
+        k0 = ma.floor(theta0 / (np.pi / 2))
+        k1 = ma.floor(theta1 / (np.pi / 2))
+    else:
+        k0 = np.floor(np.divide(theta0, np.pi / 2)).astype(int)
+        k1 = np.floor(np.divide(theta1, np.pi / 2)).astype(int)
+
+    if np.isscalar(k0) and np.isscalar(k1) and \
+       np.isscalar(b) and np.isscalar(a):
+        first_k = k0 if arithmetic_spiral_tangent_theta(k0, b, a) > theta0 \
+            else k0 + 1
+        last_k = k1 if arithmetic_spiral_tangent_theta(k1, b, a) < theta1 \
+            else k1 - 1
+    else:
+        first_k = np.where(
+            arithmetic_spiral_tangent_theta(k0, b, a) > theta0, k0, k0 + 1)
+        last_k = np.where(
+            arithmetic_spiral_tangent_theta(k1, b, a) < theta1, k1, k1 - 1)
+
+    return (arithmetic_spiral_tangent_theta(first_k, b, a), first_k, 
+            arithmetic_spiral_tangent_theta(last_k, b, a), last_k)
+
+
+def arithmetic_spiral_boundary_counts(first_k, last_k):
+    '''
+    Returns the number of boundaries between the segments of an arithmetic
+    spiral divided at its tangent points first_k, ..., last_k (see 
+    'arithmetic_spiral_tangent_range') at which vertical and horizontal 
+    extensions are inserted by 'arithmetic_spiral_extension'. The segments
+    meet at the tangent points first_k + 1, ..., last_k - 1. The spiral is
+    parallel to the y axis at the even ones, where the segments are shifted
+    vertically, and parallel to the x axis at the odd ones.
+
+    Adding the same length to every vertical (horizontal) extension of a 
+    spiral with non-negative extensions therefore lengthens it by that 
+    length times the number of vertical (horizontal) boundaries.
+
+    Args:
+        first_k:        Index of the first tangent point.
+                        <int or np.ndarray of ints>
+
+        last_k:         Index of the last tangent point.
+                        <int or np.ndarray of ints>
+
+    Return:
+        n_vertical:     Number of boundaries with vertical extensions.
+                        <int or np.ndarray of ints>
+
+        n_horizontal:   Number of boundaries with horizontal extensions.
+                        <int or np.ndarray of ints>
+    '''
+    n_boundaries = last_k - first_k - 1
+    n_horizontal = (last_k // 2) - ((first_k + 1) // 2)
+
+    return n_boundaries - n_horizontal, n_horizontal
+
+
+def arithmetic_spiral_curve_segments(turns, spacing, n_pts=None, 
+    seg_length=seg_length, radial_shift=0, start_turn=0, start_angle=0, 
+    end_angle=0, max_sagitta=None):
+    '''
+    Generates the same arithmetic spiral as 'arithmetic_spiral_curve', already
+    divided into segments as by 'arithmetic_spiral_segments'. Rather than 
+    looking for the points at which the spiral is tangent to the x and y axes
+    in sampled coordinates, the angles of these points are computed exactly
+    (see 'arithmetic_spiral_tangent_thetas') and each segment is sampled 
+    independently between them. The ends of the segments are therefore 
+    exactly tangent to the axes regardless of how many points are used, so 
+    this works with far fewer points than 'arithmetic_spiral_segments' needs.
+
+    Args:
+        turns:          Number of full turns the spiral will make.
+                        <int>
+
+        spacing:        Distance between successive wrappings.
+                        <float or int>
+
+        n_pts:          Number of points defining the spiral. These are 
+                        distributed among the segments in proportion to the
+                        angle they span, with at least 2 points (their ends)
+                        per segment.
+                        <int>
+
+        seg_length:     Gives the distance between the points defining the 
+                        spiral and sets the number of points in each segment
+                        appropriately. Only used if n_pts is None.
+                        <float or int>
+                        (default: constants.seg_length == 1.0)
+
+        radial_shift:   Shifts the radius uniformly. In the spiral
+                        equation r = b * theta + a, a = radial_shift.
+                        <float or int>
+                        (default: 0)
+
+        start_turn:     The turn of the spiral to start on. Must be a 
+                        positive integer.
+                        <int>
+
+        start_angle:    Starting angle in degrees. Must have
+                        0 <= start_angle < 360
+                        <float or int>
+                        (default: 0)
+
+        end_angle:      End angle in degrees. Must have
+                        0 <= start_angle < 360
+                        <float or int>
+                        (default: 0)
+
+        max_sagitta:    If given, each segment is sampled with the fewest 
+                        points that keep the chords between them within
+                        'max_sagitta' of the spiral (see
+                        'arithmetic_spiral_sagitta_thetas'), and n_pts and 
+                        seg_length are ignored.
+                        <float or int>
+                        (default: None)
+
+    Return:
+        spiral_segs:    The segments, as returned by 
+                        'arithmetic_spiral_segments'.
+                        <SegmentedCurve>
+    '''
+    b = spacing / (2 * np.pi)
+
+    start_theta = ma.radians(360 * start_turn + start_angle)
+    end_theta = start_theta + ma.radians(360 * turns + end_angle)
+
+    thetas, ks = arithmetic_spiral_tangent_thetas(b, radial_shift, 
+        start_theta, end_theta)
+
+    # Make sure there are enough tangent points for at least 1 full segment.
+    if thetas.size < 2:
+        raise ValueError(
+            "The sprial coordinates supplied did not contain a full segment. "
+            + "Try supplying coordinates over a larger range.")
+
+    seg_thetas = arithmetic_spiral_segment_thetas(b, radial_shift, thetas, 
+        n_pts, seg_length, end_theta - start_theta, max_sagitta)
+
+    return arithmetic_spiral_sample_segments(b, radial_shift, seg_thetas)
+
+
+def arithmetic_spiral_segment_thetas(b, a, thetas, n_pts=None, 
+    seg_length=seg_length, theta_span=None, max_sagitta=None):
+    '''
+    Returns the angles at which 'arithmetic_spiral_curve_segments' samples 
+    each segment of the arithmetic spiral r = (b * theta) + a lying between
+    successive angles in 'thetas'.
+
+    Args:
+        b, a:           Coefficients of the spiral equation.
+                        <float>
+
+        thetas:         Angles of the ends of the segments, in radians.
+                        <np.ndarray of floats>
+
+        n_pts:          Number of points defining the whole spiral, which are
+                        distributed among the segments in proportion to the
+                        angle they span, with at least 2 points (their ends)
+                        per segment. If None, 'seg_length' is used.
+                        <int or None>
+                        (default: None)
+
+        seg_length:     Distance between the points defining the spiral.
+                        Only used if n_pts and max_sagitta are None.
+                        <float or int>
+                        (default: constants.seg_length == 1.0)
+
+        theta_span:     Range of angles spanned by the whole spiral, in 
+                        radians. Only used if n_pts is given.
+                        <float>
+                        (default: None)
+
+        max_sagitta:    If given, each segment is sampled with the fewest
+                        points keeping the chords between them within 
+                        'max_sagitta' of the spiral (see 
+                        'arithmetic_spiral_sagitta_thetas'), and n_pts and
+                        seg_length are ignored.
+                        <float or None>
+                        (default: None)
+
+    Return:
+        The angles sampling each segment, including its ends.
+        <list of np.ndarrays>
+    '''
+    if max_sagitta is not None:
+        return [arithmetic_spiral_sagitta_thetas(b, a, 
+                    thetas[i], thetas[i + 1], max_sagitta)
+                for i in range(thetas.size - 1)]
+
+    if n_pts is None:
+        # b and a have the same sign, so the arc length is the same as that
+        # of the spiral with both made positive.
+        seg_lengths = arithmetic_spiral_alength(np.abs(b), np.abs(a), 
+            thetas[:-1], thetas[1:])
+        seg_pts = (seg_lengths // seg_length).astype(int) + 1
+    else:
+        seg_pts = np.round(n_pts * np.diff(thetas) / theta_span).astype(int)
+
+    seg_pts = np.maximum(seg_pts, 2)
+
+    return [np.linspace(thetas[i], thetas[i + 1], seg_pts[i])
+            for i in range(thetas.size - 1)]
+
+
+def arithmetic_spiral_sagitta_thetas(b, a, theta0, theta1, max_sagitta):
+    '''
+    Returns the fewest angles from theta0 to theta1 at which the arithmetic
+    spiral r = (b * theta) + a can be sampled so that the chords between 
+    successive samples deviate from the spiral by at most 'max_sagitta'.
+
+    A chord of length c across a curve of curvature k deviates from it by a
+    sagitta of about k c^2 / 8, so chords can be up to sqrt(8 max_sagitta / k)
+    long. The spiral's curvature, (r^2 + 2 b^2) / (r^2 + b^2)^(3/2), falls off
+    as 1 / r, so the chords lengthen outwards as sqrt(r), and the samples are
+    spaced uniformly in the number of chords needed up to each angle, which 
+    is integrated numerically. 
+
+    Args:
+        b, a:           Coefficients of the spiral equation.
+                        <float>
+
+        theta0, theta1: Angles of the first and last samples, in radians.
+                        <float>
+
+        max_sagitta:    Largest allowed distance between the spiral and the
+                        chords sampling it, e.g. the layout's database unit.
+                        <float>
+
+    Return:
+        The angles, in increasing order.
+        <np.ndarray of floats>
+    '''
+    # The curve is the same when reflected, i.e. with both b and a negated.
+    b, a = abs(b), abs(a)
+
+    # Number of chords needed per radian, on a grid much finer than the 
+    # chords, since it varies slowly.
+    grid = np.linspace(theta0, theta1, 
+        max(int(ma.ceil((theta1 - theta0) / (np.pi / 32))), 1) + 1)
+    r_squared = (a + (b * grid)) ** 2
+    density = np.sqrt((r_squared + 2 * b**2) / (8 * max_sagitta)) \
+        / (r_squared + b**2) ** 0.25
+
+    # Number of chords needed up to each angle of the grid
+    chords = np.concatenate(([0], np.cumsum(
+        (density[1:] + density[:-1]) * np.diff(grid) / 2)))
+
+    n_chords = max(int(ma.ceil(chords[-1])), 1)
+
+    return np.interp(np.linspace(0, chords[-1], n_chords + 1), chords, grid)
 
-    return spiral_segs
-    
 
 def arithmetic_spiral_curve(turns, spacing, n_pts=None, seg_length=seg_length,
-    radial_shift=0, start_turn=0, start_angle=0, end_angle=0):
+    radial_shift=0, start_turn=0, start_angle=0, end_angle=0, 
+    max_sagitta=None):
     '''
     Generates an array of Cartesian coordinates defining an arithmetic (aka
     Archimedean) spiral. The range of angles in degrees over which it is 
@@ -2148,6 +5034,14 @@ def arithmetic_spiral_curve(turns, spacing, n_pts=None, seg_length=seg_length,
                         <float or int>
                         (default: 0)
 
+        max_sagitta:    If given, the spiral is sampled with the fewest 
+                        points that keep the chords between them within
+                        'max_sagitta' of the spiral (see
+                        'arithmetic_spiral_sagitta_thetas'), and n_pts and 
+                        seg_length are ignored.
+                        <float or int>
+                        (default: None)
+
     Return:
         An array of shape (2, n_pts) defining the spiral.
         First column x coords. Second column y coords.
@@ -2158,14 +5052,17 @@ def arithmetic_spiral_curve(turns, spacing, n_pts=None, seg_length=seg_length,
     start_theta = ma.radians(360 * start_turn + start_angle)
     end_theta = start_theta + ma.radians(360 * turns + end_angle)
 
-    # if n_pts unspecified
-    if n_pts is None:
-        arc_length = arithmetic_spiral_alength(b, radial_shift, 
-            start_theta, end_theta)
-        n_pts = int(arc_length // seg_length)
-        
-    
-    theta = np.linspace(start_theta, end_theta, n_pts)
+    if max_sagitta is not None:
+        theta = arithmetic_spiral_sagitta_thetas(b, radial_shift, 
+            start_theta, end_theta, max_sagitta)
+    else:
+        # if n_pts unspecified
+        if n_pts is None:
+            arc_length = arithmetic_spiral_alength(b, radial_shift, 
+                start_theta, end_theta)
+            n_pts = int(arc_length // seg_length)
+
+        theta = np.linspace(start_theta, end_theta, n_pts)
 
     r = radial_shift + (b * theta)
 
@@ -2197,7 +5094,7 @@ def rect_to_polar(x, y):
 
 
 def parabolic_taper(layout, start_width, end_width, length, 
-    seg_length=seg_length, n_pts=None, origin='port0'):
+    seg_length=seg_length, n_pts=None, origin='port0', output='polygon'):
     '''
     Generates a parabolic waveguide taper as a pya.DPolygon object.
 
@@ -2242,9 +5139,28 @@ def parabolic_taper(layout, start_width, end_width, length,
                         <str>
                         (default: 'port0')
 
+        output:         Determines what KLayout objects are the output of 
+                        this function.
+
+                        passed string       function output
+                        -----------------------------------------------
+                        'polygon'           A single pya.DPolygon, unless
+                                            it would have more than 
+                                            constants.max_vertices vertices,
+                                            which can't be written to 
+                                            GDSII; then the same as 'tiles'
+                        'tiles'             A list of abutting pya.DPolygons
+                                            with at most 
+                                            constants.max_vertices vertices
+                                            each (see 'split_strip_coords')
+
+                        <str>
+                        (default: 'polygon')
+
     Return:
-        A polygon in the shape of a linear taper
-        <pya.DPolygon object>
+        A polygon in the shape of a parabolic taper, or a list of polygons
+        tiling it.
+        <pya.DPolygon object or list of pya.DPolygon objects>
     '''
     if start_width > end_width:
         raise ValueError("Must have start_width < end_width")
@@ -2262,27 +5178,31 @@ def parabolic_taper(layout, start_width, end_width, length,
     upper_profile =  a * x_coords**2 + k
     lower_profile = -upper_profile
 
-    # Define points in the hull of the taper
-    hull_upper = [pya.DPoint(x_coords[i], upper_profile[i]) 
-        for i in range(n_pts)]
-    hull_lower = [pya.DPoint(x_coords[i], lower_profile[i]) 
-        for i in range(n_pts)]
-
-    # instantiate the polygon
-    taper = pya.DPolygon(hull_upper + hull_lower[::-1])
-
     # Shift the taper so that it has the desired coordinate origin.
     if origin == 'center':
-        taper = taper.transformed(pya.DTrans(pya.DPoint(-length / 2, 0)))
+        x_coords = x_coords - length / 2
     elif origin == 'port1':
-        taper = taper.transformed(pya.DTrans(pya.DPoint(-length, 0)))
+        x_coords = x_coords - length
     elif origin == 'port0':
         pass
     else:
         raise ValueError("Expected arugment 'origin' to be one of 'port0', "
             + "'port1', or 'center'. instead got {}".format(origin))
 
-    return taper
+    # Define points in the hull of the taper
+    hull_upper = np.stack((x_coords, upper_profile))
+    hull_lower = np.stack((x_coords, lower_profile))
+
+    # instantiate the polygon
+    if output == 'polygon' and 2 * n_pts <= max_vertices:
+        return pya.DPolygon(array_to_DPoints(
+            np.concatenate((hull_upper, hull_lower[:, ::-1]), axis=1)))
+    elif output in ('polygon', 'tiles'):
+        return strip_to_DPolygons(hull_upper, hull_lower)
+    else:
+        raise ValueError(
+            "Expected one of the strings 'polygon' or 'tiles' to be passed "
+            + "to the argument 'output'. Instead got {}.".format(output))
 
 
 def linear_taper(layout, start_width, end_width, length, origin='port0'):
@@ -2435,11 +5355,25 @@ def s_bend(layout, layer, length=None, height=None, bend_radius=None,
                         -----------------------------------------------
                         'pcell'             Rounded Path PCell
                         'path'              pya.DPath object w/ round corners
+                        'polygon'           pya.DPolygon of the outline,
+                                            generated directly (see 
+                                            's_bend_polygon')
+                        'cell'              Instance of a cell holding the
+                                            s-bend as a polygon, shared by 
+                                            all identical s-bends (see 
+                                            's_bend_cell')
 
     Return:
-        The instantiated rounded path PCell.
-        <pya.DCellInstArray object>
+        The instantiated rounded path PCell or s-bend cell, DPath, or 
+        DPolygon, depending on the value of 'output'.
+        <pya.DCellInstArray object or pya.DPath or pya.DPolygon object>
     '''
+    if output == 'cell':
+        cell_index = s_bend_cell(layout, layer, length, height, bend_radius,
+            bend_angle, wg_width=wg_width, n_pts=n_pts, 
+            seg_length=seg_length, origin=origin)
+        return pya.DCellInstArray(cell_index, trans)
+
     steep_bend, length, bend_radius, height, bend_angle = \
         s_bend_solve_params(length, bend_radius, height, bend_angle)
 
@@ -2479,9 +5413,78 @@ def s_bend(layout, layer, length=None, height=None, bend_radius=None,
             wg_width=wg_width, bend_radius=bend_radius, n_pts=n_pts, 
             seg_length=seg_length, trans=trans, output=output)
     else:
-        return s_bend_shallow(layout, layer, length, bend_radius, 
-            height, bend_angle, wg_width=wg_width, n_pts=n_pts, 
-            seg_length=seg_length, trans=trans, output=output)
+        return s_bend_shallow(layout, layer, length, bend_radius, 
+            height, bend_angle, wg_width=wg_width, n_pts=n_pts, 
+            seg_length=seg_length, trans=trans, output=output)
+
+
+def s_bend_cell(layout, layer, length=None, height=None, bend_radius=None,
+    bend_angle=None, wg_width=wg_width, n_pts=None, seg_length=seg_length,
+    origin='port0', shape='polygon'):
+    '''
+    Returns the index of a cell holding the s-bend 's_bend' generates with 
+    the passed parameters, creating the cell only if the layout doesn't 
+    already contain one with the same geometry. The cell is named after a 
+    hash of the s-bend's canonical geometry (its layer, width, bend radius, 
+    number of points per circle, origin, and bend angle or, for steep 
+    s-bends, height), so s-bends specified by different parameter pairs, or
+    placed with different transformations, share a cell as long as they 
+    have the same shape. Instantiating the cell for every s-bend, e.g. in a
+    sweep of directional couplers, stores each distinct s-bend only once.
+
+    Args:
+        layout, layer, length, height, bend_radius, bend_angle, wg_width,
+        n_pts, seg_length, origin:
+                        See 's_bend'.
+
+        shape:          The 'output' of 's_bend' inserted into the cell, 
+                        either 'polygon' or 'path'.
+                        <str>
+                        (default: 'polygon')
+
+    Return:
+        The index of the cell, whose origin is given by 'origin'.
+        <int>
+    '''
+    if shape not in ('polygon', 'path'):
+        raise ValueError(
+            "Expected one of the strings 'polygon' or 'path' to be passed "
+            + "to the argument 'shape'. Instead got {}.".format(shape))
+
+    steep_bend, solved_length, solved_radius, solved_height, solved_angle = \
+        s_bend_solve_params(length, bend_radius, height, bend_angle)
+
+    if n_pts is None:
+        n_pts = 2 * ma.pi * solved_radius / seg_length
+
+    # A steep s-bend is determined by its height and a shallow one by its
+    # bend angle, which 's_bend' rounds to zero below 1e-4. Floats are 
+    # rounded so that s-bends solved from different parameter pairs match.
+    if steep_bend:
+        shape_param = solved_height
+    else:
+        shape_param = solved_angle if solved_angle >= 1e-4 else 0
+
+    # Layers are told apart by their info, or by their index if they're 
+    # anonymous (see 'layout.layer()'), since all such layers have the same
+    # empty info.
+    layer_info = layout.get_info(layer)
+    layer_key = layer if layer_info.anonymous() else layer_info.to_s()
+
+    description = repr((layer_key, shape, origin, 
+        steep_bend, round(wg_width, 9), round(solved_radius, 9), 
+        round(n_pts, 9), round(shape_param, 9)))
+
+    name = 's_bend_' + hashlib.sha1(description.encode()).hexdigest()[:12]
+
+    cell = layout.cell(name)
+    if cell is None:
+        cell = layout.create_cell(name)
+        cell.shapes(layer).insert(s_bend(layout, layer, length, height, 
+            bend_radius, bend_angle, wg_width=wg_width, n_pts=n_pts, 
+            seg_length=seg_length, origin=origin, output=shape))
+
+    return cell.cell_index()
 
 
 def s_bend_solve_params(length, bend_radius, height, bend_angle):
@@ -2617,12 +5620,196 @@ def s_bend_solve_params(length, bend_radius, height, bend_angle):
     return steep_bend, length, bend_radius, height, bend_angle
 
 
+class SBendParams:
+    '''
+    The parameters of many s-bends at once, as solved by
+    's_bend_solve_params_batch'. Every attribute is an ndarray with the
+    broadcast shape of the arguments, and parameters that don't apply to an
+    s-bend, or that couldn't be solved for, are NaN.
+
+    Attributes:
+        kind:           The kind of s-bend 's_bend' generates with the
+                        parameters: 'steep' (see 's_bend_steep'), 'shallow'
+                        (see 's_bend_shallow'), or 'double' (see
+                        's_bend_double').
+                        <np.ndarray of str>
+
+        length, bend_radius, height, bend_angle:
+                        The parameters, as returned by 's_bend_solve_params',
+                        so 'bend_angle' is in radians. As for that function,
+                        the length of a steep s-bend solved from its height 
+                        and bend radius, and the bend angle of any steep 
+                        s-bend, are unspecified (NaN).
+                        <np.ndarray of floats>
+
+        alength:        The arc length of each s-bend (see 's_bend_alength').
+                        <np.ndarray of floats>
+
+        radius_violation:
+                        True where 's_bend' would raise an error because the
+                        bend radius is too small, i.e. it's less than
+                        constants.min_bend_radius, or the length and bend 
+                        radius were specified with length > 2 * bend_radius.
+                        <np.ndarray of bools>
+    '''
+    __slots__ = ('kind', 'length', 'bend_radius', 'height', 'bend_angle',
+                 'alength', 'radius_violation')
+
+    def __init__(self, **attributes):
+        for name in self.__slots__:
+            setattr(self, name, attributes[name])
+
+    def __repr__(self):
+        return "SBendParams(shape={})".format(self.kind.shape)
+
+
+def s_bend_solve_params_batch(length=None, bend_radius=None, height=None,
+    bend_angle=None, specified=None):
+    '''
+    Solves for the parameters of many s-bends at once, as 
+    's_bend_solve_params' does for a single s-bend, with numpy broadcasting.
+    Each s-bend may be specified by a different one of the parameter pairs 
+    supported by 's_bend', with the unspecified parameters of each s-bend
+    left as NaN (or the whole argument left as None). Rather than raising an
+    error for s-bends with too small a bend radius, they're reported in the
+    'radius_violation' attribute of the result. The results agree with 
+    's_bend_solve_params' to within floating point rounding.
+
+    Args:
+        length, bend_radius, height, bend_angle:
+                        The parameters, as passed to 's_bend', with 
+                        'bend_angle' in degrees. NaN or None where they 
+                        aren't specified.
+                        <float or np.ndarray or None>
+                        (default: None)
+
+        specified:      Which parameters are specified for each s-bend, with
+                        the first axis indexing (length, bend_radius, height, 
+                        bend_angle). Broadcast against the parameters. If 
+                        None, the parameters that aren't NaN are specified.
+                        <np.ndarray of bools with shape (4, ...) or None>
+                        (default: None)
+
+    Return:
+        The solved parameters
+        <SBendParams>
+    '''
+    params = [np.asarray(np.nan if param is None else param, float)
+              for param in (length, bend_radius, height, bend_angle)]
+    if specified is None:
+        specified = [~np.isnan(param) for param in params]
+    elif len(specified) != 4:
+        raise ValueError("Expected the first axis of 'specified' to have "
+            + "length 4. Instead got {}.".format(len(specified)))
+
+    length, bend_radius, height, bend_angle, \
+        spec_length, spec_radius, spec_height, spec_angle = \
+        np.broadcast_arrays(*params, *specified)
+
+    #
+    # Check which pair of parameters is specified for each s-bend
+    #
+
+    angle_radius  = spec_radius & spec_angle & ~spec_length & ~spec_height
+    length_height = spec_length & spec_height & ~spec_radius & ~spec_angle
+    length_radius = spec_length & spec_radius & ~spec_height & ~spec_angle
+    height_radius = spec_height & spec_radius & ~spec_length & ~spec_angle
+
+    unsupported = ~(angle_radius | length_height | length_radius 
+                    | height_radius)
+    if unsupported.any():
+        raise ValueError("{} of the s-bends ".format(unsupported.sum())
+            + "aren't specified by exactly two parameters forming one of "
+            + "the pairs: " + """
+            (length, bend_radius),
+            (height, bend_radius)
+            (length, height),
+            (bend_radius, bend_angle)""")
+
+    #
+    # Calculate the unspecified parameters for every pair, as in 
+    # 's_bend_solve_params', then select those of the specified pair.
+    #
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Compute length and height from bend_angle and bend_radius
+        ar_angle = np.radians(bend_angle)
+        ar_length = 2 * bend_radius * np.sin(ar_angle)
+        ar_height = 2 * bend_radius * (1 + np.cos(ar_angle))
+
+        # Compute bend_radius and bend_angle from length and height (see
+        # 's_bend_solve_angle_radius')
+        lh_steep_radius = length / 2
+        lh_steep = (height > length) & (lh_steep_radius >= min_bend_radius)
+        port_sep_squared = (height ** 2) + (length ** 2)
+        lh_radius = port_sep_squared / (4 * height)
+        lh_angle = np.arctan2((2 * height * length) / port_sep_squared,
+                              (height**2 - length**2) / port_sep_squared)
+
+        # Compute height and bend_angle from length and bend_radius (see
+        # 's_bend_solve_height_angle'). These are NaN where 
+        # length > 2 * bend_radius.
+        diameter = 2 * bend_radius
+        a = np.sqrt(diameter**2 - length**2)
+        lr_height = diameter - a
+        lr_angle = np.pi + np.arctan(-length / a)
+
+        # Compute length and bend_angle from height and bend_radius (see
+        # 's_bend_solve_length_angle')
+        hr_steep = height > 2 * bend_radius
+        hr_length = np.sqrt(height * (4 * bend_radius - height))
+        hr_angle = np.arctan2(hr_length / bend_radius, 
+                              (height / bend_radius) - 2)
+
+    steep_bend = (length_height & lh_steep) | (height_radius & hr_steep)
+
+    length = np.select(
+        [angle_radius, length_height | length_radius, 
+         height_radius & ~hr_steep],
+        [ar_length, length, hr_length], np.nan)
+
+    bend_radius = np.select(
+        [length_height & lh_steep, length_height],
+        [lh_steep_radius, lh_radius], bend_radius)
+
+    height = np.select(
+        [angle_radius, length_radius], [ar_height, lr_height], height)
+
+    bend_angle = np.select(
+        [angle_radius, length_height & ~lh_steep, length_radius, 
+         height_radius & ~hr_steep],
+        [ar_angle, lh_angle, lr_angle, hr_angle], np.nan)
+
+    #
+    # Classify the s-bends and compute their arc lengths, as in 's_bend' and
+    # 's_bend_alength'
+    #
+
+    with np.errstate(invalid='ignore'):
+        kind = np.where(steep_bend, 'steep', 
+                        np.where(bend_angle < 1e-4, 'double', 'shallow'))
+
+        alength = np.where(steep_bend, 
+            (ma.pi * bend_radius) + (height - 2 * bend_radius),
+            2 * bend_radius * (ma.pi - bend_angle))
+
+        radius_violation = ((bend_radius < min_bend_radius) 
+                            | (length_radius & (length > 2 * bend_radius)))
+
+    return SBendParams(kind=kind, length=length, bend_radius=bend_radius, 
+        height=height, bend_angle=bend_angle, alength=alength, 
+        radius_violation=radius_violation)
+
+
+@caching.memoize
 def s_bend_alength(length=None, height=None, bend_radius=None,  
     bend_angle=None):
     '''
     Returns the arc length of the s-bend generated by s_bend when supplied
     with the corresponding arguments.
 
+    Results can be cached for repeated calls. See 'chickpea.caching'.
+
     Args:
         length:         Length of the s-bend. Also the distance between its
                         ports in the x-direction.
@@ -2655,6 +5842,42 @@ def s_bend_alength(length=None, height=None, bend_radius=None,
         return 2 * bend_radius * (ma.pi - bend_angle)
 
 
+def s_bend_alength_batch(length, height):
+    '''
+    Returns the arc lengths of the s-bends generated by s_bend when supplied
+    with each pair of 'length' and 'height', as 's_bend_alength' does for a 
+    single pair, but with numpy broadcasting.
+
+    Args:
+        length:         Lengths of the s-bends.
+                        <float or np.ndarray>
+
+        height:         Heights of the s-bends.
+                        <float or np.ndarray>
+
+    Return:
+        The arc lengths
+        <np.ndarray>
+    '''
+    length, height = np.broadcast_arrays(
+        np.asarray(length, float), np.asarray(height, float))
+
+    # See 's_bend_solve_params' for when s-bends are steep
+    steep_bend = (height > length) & (length / 2 >= min_bend_radius)
+
+    # Steep s-bends have half-circle bends of radius length / 2 joined by a
+    # straight segment. Shallow ones are solved by 's_bend_solve_angle_radius'.
+    steep_length = (ma.pi * length / 2) + (height - length)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        port_sep_squared = (height ** 2) + (length ** 2)
+        bend_radius = port_sep_squared / (4 * height)
+        bend_angle = np.arctan2(2 * height * length, height**2 - length**2)
+        shallow_length = 2 * bend_radius * (ma.pi - bend_angle)
+
+    return np.where(steep_bend, steep_length, shallow_length)
+
+
 def s_bend_solve_length_height(bend_angle, bend_radius):
     '''
     Returns the length and height of the s-bend with 'bend_angle' and 
@@ -2834,12 +6057,21 @@ def s_bend_shallow(layout, layer, length, bend_radius, height, bend_angle,
                         -----------------------------------------------
                         'pcell'             Rounded Path PCell
                         'path'              pya.DPath object w/ round corners
+                        'polygon'           pya.DPolygon of the outline,
+                                            generated directly (see 
+                                            's_bend_polygon')
 
     Return:
-        The instantiated rounded path PCell.
-        <pya.DCellInstArray object>
+        The instantiated rounded path PCell, DPath, or DPolygon, depending on
+        the value of 'output'.
+        <pya.DCellInstArray object or pya.DPath or pya.DPolygon object>
     '''
 
+    if output == 'polygon':
+        return s_bend_polygon(layout, bend_radius, ma.pi - bend_angle, 
+            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
+            trans=trans)
+
     x1 = bend_radius * ma.tan((ma.pi - bend_angle) / 2)
     dx = height * ma.tan(bend_angle - (ma.pi / 2))
 
@@ -2906,11 +6138,20 @@ def s_bend_steep(layout, layer, length, wg_width=wg_width,
                         -----------------------------------------------
                         'pcell'             Rounded Path PCell
                         'path'              pya.DPath object w/ round corners
+                        'polygon'           pya.DPolygon of the outline,
+                                            generated directly (see 
+                                            's_bend_polygon')
 
     Return:
-        The instantiated rounded path PCell.
-        <pya.DCellInstArray object>
+        The instantiated rounded path PCell, DPath, or DPolygon, depending on
+        the value of 'output'.
+        <pya.DCellInstArray object or pya.DPath or pya.DPolygon object>
     '''
+    if output == 'polygon':
+        return s_bend_polygon(layout, bend_radius, ma.pi / 2, length,
+            wg_width=wg_width, n_pts=n_pts, seg_length=seg_length, 
+            trans=trans)
+
     points = [
         pya.DPoint(0,               0                       ),
         pya.DPoint(bend_radius,     0                       ),
@@ -2969,11 +6210,19 @@ def s_bend_double(layout, layer, wg_width=wg_width, bend_radius=bend_radius,
                         -----------------------------------------------
                         'pcell'             Rounded Path PCell
                         'path'              pya.DPath object w/ round corners
+                        'polygon'           pya.DPolygon of the outline,
+                                            generated directly (see 
+                                            's_bend_polygon')
 
     Return:
-        The instantiated rounded path PCell.
-        <pya.DCellInstArray object>
+        The instantiated rounded path PCell, DPath, or DPolygon, depending on
+        the value of 'output'.
+        <pya.DCellInstArray object or pya.DPath or pya.DPolygon object>
     '''
+    if output == 'polygon':
+        return s_bend_polygon(layout, bend_radius, ma.pi, wg_width=wg_width,
+            n_pts=n_pts, seg_length=seg_length, trans=trans)
+
     points = [
         pya.DPoint( 0,               0              ),
         pya.DPoint( bend_radius,     0              ),
@@ -2988,6 +6237,162 @@ def s_bend_double(layout, layer, wg_width=wg_width, bend_radius=bend_radius,
         trans=trans, output=output)
 
 
+def s_bend_outline(bend_radius, sweep, straight=0, wg_width=wg_width,
+    n_pts=None, seg_length=seg_length):
+    '''
+    Computes the outline of an s-bend in closed form. The s-bend starts at
+    the origin going in the +x direction, turns left through the angle 
+    'sweep' along an arc of radius 'bend_radius', continues straight for 
+    'straight', and turns right through 'sweep' along another arc, ending
+    at port 1 going in the +x direction again. Shallow s-bends have 
+    sweep = pi - bend_angle and no straight segment, steep s-bends have 
+    sweep = pi / 2, and s-bends that double back on themselves have 
+    sweep = pi.
+
+    The edges of the waveguide along each bend are concentric arcs with
+    radii bend_radius -/+ wg_width / 2, whose points lie exactly on the 
+    arcs, including the ends where the bends meet each other and the 
+    straight segments. Since the s-bend is symmetric under a rotation of
+    180 degrees about its center, only the first bend is computed.
+
+    Args:
+        bend_radius:    Radius of both bends.
+                        <float>
+
+        sweep:          Angle in radians that each bend turns through.
+                        <float>
+
+        straight:       Length of the straight segment between the bends.
+                        <float>
+                        (default: 0)
+
+        wg_width:       Width of the waveguide.
+                        <float>
+                        (default: constants.wg_width == 0.5)
+
+        n_pts:          Number of points per full circle on each edge of the
+                        bends. If None, this is computed from 'seg_length'.
+                        <int or float or None>
+                        (default: None)
+
+        seg_length:     Distance between the points along the bends if 
+                        'n_pts' is None.
+                        <float>
+                        (default: constants.seg_length == 1.0)
+
+    Return:
+        The hull of the s-bend, counterclockwise from the right edge of
+        port 0.
+        <2 x N np.ndarray>
+    '''
+    if n_pts is None:
+        n_pts = 2 * ma.pi * bend_radius / seg_length
+
+    n_segs = max(1, ma.ceil(n_pts * sweep / (2 * ma.pi)))
+    theta = np.linspace(0, sweep, n_segs + 1)
+
+    # The first bend is centered on (0, bend_radius). Its left edge is the
+    # inner one.
+    radii = np.array([[bend_radius - wg_width / 2], 
+                      [bend_radius + wg_width / 2]])
+    x = radii * np.sin(theta)
+    y = bend_radius - radii * np.cos(theta)
+    left, right = np.stack((x[0], y[0])), np.stack((x[1], y[1]))
+
+    port1 = np.array([
+        [(2 * bend_radius * ma.sin(sweep)) + (straight * ma.cos(sweep))],
+        [(2 * bend_radius * (1 - ma.cos(sweep))) + (straight * ma.sin(sweep))]
+    ])
+
+    # Rotating the first bend by 180 degrees about the center of the s-bend
+    # gives the second, with the left and right edges swapped.
+    left, right = (np.concatenate((left, port1 - right[:, ::-1]), axis=1),
+                   np.concatenate((right, port1 - left[:, ::-1]), axis=1))
+
+    return np.concatenate((right, left[:, ::-1]), axis=1)
+
+
+def s_bend_polygon(layout, bend_radius, sweep, straight=0, wg_width=wg_width,
+    n_pts=None, seg_length=seg_length, trans=null_trans):
+    '''
+    Generates the outline of an s-bend (see 's_bend_outline') as a single
+    DPolygon, without going through a ROUND_PATH PCell or rounding the 
+    corners of a DPath. The vertices are snapped to the database unit of 
+    'layout' before 'trans' is applied.
+
+    Args:
+        layout:         Layout whose database unit the vertices are snapped
+                        to.
+                        <pya.Layout object>
+
+        bend_radius, sweep, straight, wg_width, n_pts, seg_length:
+                        See 's_bend_outline'.
+
+        trans:          A transformation to apply to the polygon.
+                        <pya.DTrans object>
+                        (default: transforms.null_trans)
+
+    Return:
+        The s-bend
+        <pya.DPolygon>
+    '''
+    hull = s_bend_outline(bend_radius, sweep, straight, wg_width=wg_width, 
+        n_pts=n_pts, seg_length=seg_length)
+
+    # Building the polygon in database units also removes any vertices that
+    # coincide after snapping.
+    polygon = pya.Polygon(conversion.array_to_Points(hull, layout.dbu))
+
+    return polygon.to_dtype(layout.dbu).transformed(trans)
+
+
+def s_bend_benchmark(n_bends=10**4, length=40, heights=(1, 20), 
+    outputs=('pcell', 'path', 'polygon')):
+    '''
+    Times generating 'n_bends' shallow s-bends of the given length, with
+    heights evenly spaced over the range 'heights', and inserting them into
+    a layout, for each of the values of 'output' accepted by 's_bend'.
+
+    Args:
+        n_bends:        Number of s-bends generated.
+                        <int>
+                        (default: 10**4)
+
+        length:         Length of the s-bends.
+                        <float>
+                        (default: 40)
+
+        heights:        Smallest and largest heights of the s-bends.
+                        <tuple of 2 floats>
+                        (default: (1, 20))
+
+        outputs:        Values of 'output' to time.
+                        <tuple of str>
+                        (default: ('pcell', 'path', 'polygon'))
+
+    Return:
+        The total time for each value of 'output' in seconds, from fastest
+        to slowest.
+        <dict of str: float>
+    '''
+    times = {}
+    for output in outputs:
+        layout = pya.Layout()
+        cell = layout.create_cell('benchmark')
+        layer = layout.layer(1, 0)
+
+        start = time.perf_counter()
+        for height in np.linspace(*heights, n_bends).tolist():
+            s_bend_obj = s_bend(layout, layer, length, height, output=output)
+            if output == 'pcell':
+                cell.insert(s_bend_obj)
+            else:
+                cell.shapes(layer).insert(s_bend_obj)
+        times[output] = time.perf_counter() - start
+
+    return dict(sorted(times.items(), key=lambda item: item[1]))
+
+
 def round_path(layout, layer, points, wg_width=wg_width,  
     bend_radius=bend_radius, n_pts=None, seg_length=seg_length, 
     trans=null_trans, output='pcell'):
@@ -3041,10 +6446,16 @@ def round_path(layout, layer, points, wg_width=wg_width,
                         'pcell'             Rounded Path PCell
                         'path'              pya.DPath object w/ round corners
 
+    Paths with more than constants.max_vertices points once rounded can't be
+    written to GDSII, so they're split into abutting pieces (see 
+    'split_path_coords'). Then 'path' gives a list of DPaths, and 'pcell' 
+    gives an instance of a plain cell holding the pieces.
+
     Return:
         The instantiated rounded path PCell or DPath, depending on the value
         of 'output'.
-        <pya.DCellInstArray object or pya.DPath object>
+        <pya.DCellInstArray object or pya.DPath object or list of pya.DPath
+        objects>
 
     '''
     # Compute number of points to keep the distance bewteen points on the
@@ -3063,13 +6474,151 @@ def round_path(layout, layer, points, wg_width=wg_width,
 
     path = pya.DPath(dpoints, wg_width)
 
+    # Each corner gets at most int(n_pts) // 2 + 3 points, so only long 
+    # paths have to be rounded to check whether they must be split.
+    pieces = None
+    if len(dpoints) * (int(n_pts) // 2 + 4) > max_vertices:
+        coords = round_corners_coords(
+            [np.array([[point.x, point.y] for point in dpoints]).T],
+            bend_radius, n_pts, layout.dbu)[0]
+        if coords.shape[1] > max_vertices:
+            pieces = array_to_DPaths(coords, wg_width)
+
     if output == 'pcell':
+        if pieces is None:
+            cell_idx = round_path_variant(
+                layout, layer, path, bend_radius, n_pts)
+        else:
+            cell_idx = round_path_pieces_cell(layout, layer, pieces)
+
+        pcell = pya.DCellInstArray(cell_idx, trans)
+
+        return pcell
+
+    elif output == 'path':
+        if pieces is not None:
+            return [piece.transformed(trans) for piece in pieces]
+
+        return path.round_corners(
+            bend_radius, n_pts, layout.dbu).transformed(trans)
+
+    else:
+        raise ValueError(
+            "Expected one of the strings 'pcell' or 'path' to be passed to "
+            + "the argument 'output'. Instead got {}.".format(output))
+
+
+def round_path_pieces_cell(layout, layer, pieces):
+    '''
+    Returns the index of a cell holding the pieces of a rounded path split by
+    'round_path', creating the cell only if the layout doesn't already 
+    contain one with the same pieces. As in 's_bend_cell', the cell is named
+    after a hash of its layer and geometry.
+
+    Args:
+        layout:         Layout to create the cell in.
+                        <pya.Layout object>
+
+        layer:          The index of the layer of the pieces.
+                        <int>
+
+        pieces:         The pieces of the path.
+                        <list of pya.DPath objects>
+
+    Return:
+        The index of the cell.
+        <int>
+    '''
+    layer_info = layout.get_info(layer)
+    layer_key = layer if layer_info.anonymous() else layer_info.to_s()
+
+    digest = hashlib.sha1(repr(layer_key).encode())
+    for piece in pieces:
+        digest.update(piece.to_s().encode())
+
+    name = 'round_path_' + digest.hexdigest()[:12]
+
+    cell = layout.cell(name)
+    if cell is None:
+        cell = layout.create_cell(name)
+        for piece in pieces:
+            cell.shapes(layer).insert(piece)
+
+    return cell.cell_index()
+
+
+# The Basic library and its ROUND_PATH PCell declaration, looked up by 
+# 'round_path_pcell_declaration' on first use
+round_path_pcell = None
+
+# For each layout, the cells of the ROUND_PATH variants created by 
+# 'round_path_variant', keyed by their parameters. Entries are dropped along
+# with their layouts.
+round_path_variants = weakref.WeakKeyDictionary()
+
+
+def round_path_pcell_declaration():
+    '''
+    Returns the Basic library and its ROUND_PATH PCell declaration, which are
+    only looked up the first time this is called.
+    '''
+    global round_path_pcell
+
+    if round_path_pcell is None:
         basic_lib = pya.Library.library_by_name("Basic")
-        pcell_dec = basic_lib.layout().pcell_declaration("ROUND_PATH")
-        layer_name = layout.layer_infos()[layer]
+        round_path_pcell = (basic_lib, 
+                            basic_lib.layout().pcell_declaration("ROUND_PATH"))
+
+    return round_path_pcell
+
+
+def round_path_variant(layout, layer, path, bend_radius, n_pts):
+    '''
+    Returns the index of the ROUND_PATH PCell variant in 'layout' rounding
+    the corners of 'path', creating it only if this function hasn't already
+    created an identical variant in 'layout'. Repeated geometries, e.g. the
+    bends of many routed waveguides, thus skip 'add_pcell_variant' along 
+    with the lookups of the PCell declaration and layer.
+
+    Args:
+        layout:         Layout to create the variant in.
+                        <pya.Layout object>
+
+        layer:          The index of the layer of the path.
+                        <int>
+
+        path:           The path whose corners are rounded. Shouldn't be
+                        modified afterwards, since it's part of the key of
+                        the cached variant.
+                        <pya.DPath object>
+
+        bend_radius, n_pts:
+                        See 'round_path'.
+
+    Return:
+        The index of the variant's cell.
+        <int>
+    '''
+    variants = round_path_variants.setdefault(layout, {})
+    key = (layer, bend_radius, n_pts, path)
 
+    basic_lib, pcell_dec = round_path_pcell_declaration()
+
+    cell = variants.get(key)
+
+    # Cell indices are reused once cells are deleted (e.g. by 
+    # layout.clear()), so the variant's cell is cached rather than its 
+    # index. If it has been deleted, or somehow isn't a ROUND_PATH variant
+    # anymore, other cells may have been deleted too, so every cached 
+    # variant of the layout is forgotten.
+    if cell is not None and (cell.destroyed() or not cell.is_pcell_variant()
+            or cell.pcell_declaration().id() != pcell_dec.id()):
+        variants.clear()
+        cell = None
+
+    if cell is None:
         parameters = {
-            "layer":   layer_name, 
+            "layer":   layout.get_info(layer), 
             "radius":  bend_radius, 
             "path":    path, 
             "npoints": n_pts
@@ -3077,31 +6626,363 @@ def round_path(layout, layer, points, wg_width=wg_width,
 
         pcell_idx = layout.add_pcell_variant(
             basic_lib, pcell_dec.id(), parameters)
+        cell = layout.cell(pcell_idx)
+        variants[key] = cell
 
-        pcell = pya.DCellInstArray(pcell_idx, trans)
+    return cell.cell_index()
 
-        return pcell
 
-    elif output == 'path':
-        return path.round_corners(
-            bend_radius, n_pts, layout.dbu).transformed(trans)
+@functools.lru_cache(maxsize=256)
+def unit_arc_table(step, count):
+    '''
+    Returns the cosines and sines of the angles (k + 1/3) * step, for
+    k = 0, ..., count - 1, at which 'round_corners_coords' samples the arc of
+    a corner with angular step 'step'. Tables are cached, since the corners
+    of routed waveguides and s-bends mostly share a few steps. The returned
+    arrays are read-only.
+    '''
+    theta = step * (np.arange(count) + 1 / 3)
+    table = np.stack((np.cos(theta), np.sin(theta)))
+    table.flags.writeable = False
+    return table
 
-    else:
-        raise ValueError(
-            "Expected one of the strings 'pcell' or 'path' to be passed to "
-            + "the argument 'output'. Instead got {}.".format(output))
 
+def round_corners_coords(polylines, bend_radius, n_pts, accuracy=0):
+    '''
+    Rounds the corners of many polylines at once, computing the points of 
+    every arc with numpy rather than calling 'pya.DPath.round_corners' on 
+    each path, for use where the rounded coordinates are needed as ndarrays
+    (e.g. to build polygons with 'conversion'). When the result is just a
+    DPath, 'pya.DPath.round_corners' is faster (see 
+    'round_corners_benchmark'), so 'round_path' only uses this for paths it
+    has to split.
+
+    The arcs are sampled as KLayout samples them: a corner 
+    turning through the angle alpha is replaced by its two tangent points
+    and m = max(2, round(alpha * n_pts / (2 * pi))) points between them, 
+    spaced by step = alpha / (m - 1/3) and starting step / 3 after the 
+    first tangent point, on a circle of radius 
+    bend_radius / cos(step / 3) so that the arc's chords straddle the ideal
+    circle. Corners whose tangent points are within 'accuracy' of the 
+    vertex are left unrounded. An arc can have one point more or fewer than
+    KLayout's where alpha * n_pts / (2 * pi) is within rounding error of a
+    half-integer.
+
+    As in KLayout, an arc that doesn't fit is shrunk: the tangent points of
+    a corner are at most half of a segment it shares with another corner, 
+    or the whole first or last segment of the polyline, away from its 
+    vertex, and the radius of its arc is reduced to match while keeping its
+    number of points. Repeated consecutive vertices are dropped.
 
-def array_to_DPoints(arr):
+    Args:
+        polylines:      The vertices of each polyline, each of which should
+                        have at least 2 points.
+                        <list of 2 x N np.ndarrays>
+
+        bend_radius:    Radius of the arcs.
+                        <float>
+
+        n_pts:          Number of points per full circle. Truncated to an
+                        integer, as KLayout does.
+                        <int or float>
+
+        accuracy:       Consecutive points of a rounded polyline no further
+                        apart than this are merged, e.g. where the tangent
+                        points of two corners coincide.
+                        <float>
+                        (default: 0)
+
+    Return:
+        The points of each rounded polyline, as views into a single array.
+        <list of 2 x N np.ndarrays>
+    '''
+    if len(polylines) == 0:
+        return []
+
+    coords = np.concatenate(polylines, axis=1).astype(float)
+    sizes = [polyline.shape[1] for polyline in polylines]
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+    # Drop repeated vertices, keeping the first point of each polyline.
+    unique = np.ones(coords.shape[1], dtype=bool)
+    unique[1:] = np.any(np.diff(coords, axis=1) != 0, axis=0)
+    unique[offsets[:-1]] = True
+    if not np.all(unique):
+        coords = coords[:, unique]
+        offsets = np.concatenate(([0], np.cumsum(unique)[offsets[1:] - 1]))
+
+    # Every vertex except the ends of each polyline is a corner.
+    is_corner = np.ones(coords.shape[1], dtype=bool)
+    is_corner[offsets[:-1]] = False
+    is_corner[offsets[1:] - 1] = False
+    corners = np.flatnonzero(is_corner)
+
+    # Length of each segment. The segments joining consecutive polylines,
+    # and a dummy one after the last point, are ignored.
+    seg_length = np.append(np.hypot(*np.diff(coords, axis=1)), np.inf)
+    seg_length[offsets[1:] - 1] = np.inf
+
+    vertex = coords[:, corners]
+    e_in = (vertex - coords[:, corners - 1]) / seg_length[corners - 1]
+    e_out = (coords[:, corners + 1] - vertex) / seg_length[corners]
+
+    # Turning angle and distance from each vertex to its tangent points
+    alpha = np.arctan2(np.abs(e_in[0] * e_out[1] - e_in[1] * e_out[0]),
+                       np.sum(e_in * e_out, axis=0))
+    tan_half = np.tan(alpha / 2)
+
+    # As in KLayout, the arc of a corner may take up at most half of each 
+    # segment it shares with another corner, and all of the first or last 
+    # segment of a polyline. Arcs that don't fit get a smaller radius.
+    max_tangent = seg_length / 2
+    max_tangent[offsets[:-1]] = seg_length[offsets[:-1]]
+    max_tangent[offsets[1:] - 2] = seg_length[offsets[1:] - 2]
+    tangent_length = np.minimum(bend_radius * tan_half, np.minimum(
+        max_tangent[corners - 1], max_tangent[corners]))
+
+    rounded = tangent_length > accuracy
+    corners, vertex, e_in, e_out, alpha, tangent_length, tan_half = (
+        corners[rounded], vertex[:, rounded], e_in[:, rounded], 
+        e_out[:, rounded], alpha[rounded], tangent_length[rounded],
+        tan_half[rounded])
+    radius = np.minimum(bend_radius, tangent_length / tan_half)
+
+    arc_pts = np.floor(alpha * int(n_pts) / (2 * ma.pi) + 0.5)
+    arc_pts = np.maximum(2, arc_pts)
+    arc_pts = arc_pts.astype(int)
+    step = alpha / (arc_pts - 1 / 3)
+
+    # Each rounded corner is replaced by its tangent points and the arc
+    # between them.
+    counts = np.ones(coords.shape[1], dtype=int)
+    counts[corners] = arc_pts + 2
+    starts = np.concatenate(([0], np.cumsum(counts)))
+    out = np.repeat(coords, counts, axis=1)
+
+    tangent0 = vertex - e_in * tangent_length
+    out[:, starts[corners]] = tangent0
+    out[:, starts[corners] + arc_pts + 1] = vertex + e_out * tangent_length
+
+    # Unit vector from the center of each arc to its first tangent point,
+    # which is to the right of 'e_in' for left turns and to the left of it
+    # for right turns. A point at angle t along the arc is
+    # center + radius * (radial * cos(t) + e_in * sin(t)).
+    radial = np.stack((e_in[1], -e_in[0]))
+    right_turn = (e_in[0] * e_out[1] - e_in[1] * e_out[0]) < 0
+    radial[:, right_turn] *= -1
+    center = tangent0 - radius * radial
+
+    for unique_step in np.unique(step):
+        sel = np.flatnonzero(step == unique_step)
+        count = arc_pts[sel[0]]
+        cos, sin = unit_arc_table(unique_step, count)
+
+        arc_radius = radius[sel, np.newaxis] / ma.cos(unique_step / 3)
+        points = (center[:, sel, np.newaxis] 
+                  + arc_radius * (radial[:, sel, np.newaxis] * cos 
+                                  + e_in[:, sel, np.newaxis] * sin))
+        idx = starts[corners[sel], np.newaxis] + 1 + np.arange(count)
+        out[:, idx] = points
+
+    # Merge points that coincide within 'accuracy', but never across the
+    # ends of the polylines. As in KLayout, a point is dropped if it is 
+    # within 'accuracy' of the last point kept, which only differs from the
+    # previous point after a point has been dropped.
+    out_offsets = starts[offsets]
+    keep = np.ones(out.shape[1], dtype=bool)
+    keep[1:] = np.hypot(*np.diff(out, axis=1)) > accuracy
+    keep[out_offsets[:-1]] = True
+
+    close = ~keep
+    is_start = np.zeros(out.shape[1] + 1, dtype=bool)
+    is_start[out_offsets] = True
+    for i in np.flatnonzero(close):
+        if not close[i]:
+            continue
+        last = i - 1
+        while not is_start[i] and (close[i] or not keep[i - 1]):
+            close[i] = False
+            keep[i] = ma.hypot(*(out[:, i] - out[:, last])) > accuracy
+            if keep[i]:
+                last = i
+            i += 1
+
+    kept = np.cumsum(keep)
+
+    return np.split(out[:, keep], kept[out_offsets[1:-1] - 1], axis=1)
+
+
+def round_corners_benchmark(n_paths=1000, n_corners=4, bend_radius=bend_radius,
+    seg_length=seg_length, number=3, repeat=5):
+    '''
+    Times rounding the corners of 'n_paths' zig-zag paths, each with
+    'n_corners' 90 degree corners, on the installed version of KLayout. The
+    routes are:
+
+        route       description
+        ---------------------------------------------------------------------
+        'klayout'   'pya.DPath.round_corners' on each DPath
+        'coords'    'round_corners_coords' on all paths at once
+        'dpaths'    'round_corners_coords', then converting each result to
+                    a DPath with 'conversion.array_to_DPath'
+
+    Args:
+        n_paths:        Number of paths.
+                        <int>
+                        (default: 1000)
+
+        n_corners:      Number of corners per path.
+                        <int>
+                        (default: 4)
+
+        bend_radius:    Radius of the arcs.
+                        <float>
+                        (default: constants.bend_radius == 10.0)
+
+        seg_length:     Distance between the points of the arcs.
+                        <float>
+                        (default: constants.seg_length == 1.0)
+
+        number, repeat: Each route is run 'number' times, 'repeat' times
+                        over, and the fastest repetition is kept (see
+                        'timeit.repeat').
+                        <int>
+                        (default: 3, 5)
+
+    Return:
+        The time per path of each route in seconds, from fastest to slowest.
+        <dict of str: float>
+    '''
+    n_pts = 2 * ma.pi * bend_radius / seg_length
+    accuracy = 0.001
+
+    # Staircases with legs of three bend radii, offset from one another
+    vertices = np.arange(n_corners + 2)
+    zig_zag = 3 * bend_radius * np.stack(((vertices + 1) // 2, vertices // 2))
+    polylines = [zig_zag + [[0], [idx]] for idx in range(n_paths)]
+    dpaths = [conversion.array_to_DPath(polyline, wg_width)
+              for polyline in polylines]
+
+    routes = {
+        'klayout':  lambda: [dpath.round_corners(bend_radius, n_pts, accuracy)
+                             for dpath in dpaths],
+        'coords':   lambda: round_corners_coords(
+                        polylines, bend_radius, n_pts, accuracy),
+        'dpaths':   lambda: [conversion.array_to_DPath(coords, wg_width)
+                             for coords in round_corners_coords(
+                                 polylines, bend_radius, n_pts, accuracy)],
+    }
+
+    times = {name: min(timeit.repeat(route, number=number, repeat=repeat))
+                   / (number * n_paths)
+             for name, route in routes.items()}
+
+    return dict(sorted(times.items(), key=lambda item: item[1]))
+
+
+def split_path_coords(coords, max_vertices=max_vertices):
     '''
-    Converts an ndarray of coordinates to a list of DPoints
+    Splits the spine of a path into consecutive pieces with at most 
+    'max_vertices' points each. Each piece ends, and the next one starts, at
+    the midpoint of an edge of the original path, so paths made from the 
+    pieces abut along a shared end face perpendicular to that edge, and 
+    together cover exactly the same area as the original path. Edges of 
+    zero length are never split, since their direction is undefined.
+
+    Args:
+        coords:         Coordinates of the points of the path.
+                        <2 x N np.ndarray>
+
+        max_vertices:   Largest number of points in each piece. Must be at 
+                        least 4.
+                        <int>
+                        (default: constants.max_vertices == 8190)
+
+    Return:
+        The pieces, which are views into a single array.
+        <list of 2 x M np.ndarrays>
+    '''
+    n = coords.shape[1]
+    if n <= max_vertices:
+        return [coords]
+
+    # Each piece gets up to 'max_vertices' - 3 of the original points, along
+    # with a midpoint at each end and one spare in case a split is moved.
+    # 'bounds' are the indices of the first original point of each piece 
+    # after the first, and the pieces are split on the edges ending there.
+    bounds = np.arange(max_vertices - 3, n, max_vertices - 3)
+    degenerate = np.all(coords[:, bounds - 1] == coords[:, bounds], axis=0)
+    bounds[degenerate] -= 1
+
+    # Insert every midpoint twice, to end one piece and start the next, and
+    # split between the two copies.
+    midpoints = (coords[:, bounds - 1] + coords[:, bounds]) / 2
+    split_coords = np.insert(coords, np.repeat(bounds, 2), 
+        np.repeat(midpoints, 2, axis=1), axis=1)
+
+    return np.split(split_coords, bounds + 2 * np.arange(bounds.size) + 1, 
+                    axis=1)
+
+
+def split_strip_coords(upper, lower, max_vertices=max_vertices):
+    '''
+    Splits a polygon bounded by two matched profiles, such as a taper, into
+    tiles with at most 'max_vertices' vertices each. The polygon's hull runs
+    along 'upper' and back along 'lower', and the ith points of the two 
+    profiles are joined by a straight rung, e.g. across the width of a taper.
+    Neighbouring tiles share one of these rungs, so they abut exactly.
+
+    Args:
+        upper, lower:   Coordinates of the two profiles.
+                        <2 x N np.ndarrays>
+
+        max_vertices:   Largest number of vertices in each tile. Must be at
+                        least 4.
+                        <int>
+                        (default: constants.max_vertices == 8190)
+
+    Return:
+        The hull of each tile.
+        <list of 2 x M np.ndarrays>
+    '''
+    n = upper.shape[1]
+
+    # Each tile spans 'rungs' rungs, the last of which is the first of the 
+    # next tile.
+    rungs = max_vertices // 2
+    starts = np.arange(0, max(n - 1, 1), rungs - 1)
+
+    return [np.concatenate((upper[:, start:start + rungs], 
+                            lower[:, start:start + rungs][:, ::-1]), axis=1)
+            for start in starts]
+
+
+def array_to_DPaths(arr, width, max_vertices=max_vertices):
     '''
-    dpts = []
+    Converts an ndarray of coordinates to DPaths of the given width, split
+    so that none has more than 'max_vertices' points (see 
+    'split_path_coords'), since longer paths can't be written to GDSII.
+    '''
+    return [pya.DPath(array_to_DPoints(piece), width) 
+            for piece in split_path_coords(arr, max_vertices)]
+
+
+def strip_to_DPolygons(upper, lower, max_vertices=max_vertices):
+    '''
+    Converts a polygon bounded by two matched profiles to DPolygons, split 
+    so that none has more than 'max_vertices' vertices (see 
+    'split_strip_coords').
+    '''
+    return [pya.DPolygon(array_to_DPoints(tile)) 
+            for tile in split_strip_coords(upper, lower, max_vertices)]
 
-    for i in range(arr.shape[1]):
-        dpts.append(pya.DPoint(arr[0, i], arr[1, i]))
 
-    return dpts
+def array_to_DPoints(arr):
+    '''
+    Converts an ndarray of coordinates to a list of DPoints (see
+    'conversion.array_to_DPoints')
+    '''
+    return conversion.array_to_DPoints(arr)
 
 
 def path_ports(path):
@@ -247,3 +247,51 @@ def argrelextrema(data, comparator, axis=0, order=1, mode='clip'):
     results = _boolrelextrema(data, comparator,
                               axis, order, mode)
     return np.nonzero(results)
+
+
+def argrelextrema_xy(coords):
+    """
+    Calculate the relative extrema of both coordinates of a 2D curve in a
+    single pass. A point is an extremum of a coordinate if that coordinate is
+    strictly less than, or strictly greater than, both of its neighbours,
+    which are found from sign changes of `np.diff`. This gives the same
+    points as calling `argrelmin` and `argrelmax` on each coordinate with
+    the default ``order=1`` and ``mode='clip'``, without the shifted copies
+    made by `_boolrelextrema` or sorting the combined indices afterwards.
+    Parameters
+    ----------
+    coords : ndarray
+        Array of shape (2, N), or (k, 2, N) for a batch of k curves, holding
+        the x and y coordinates of the points along the curve.
+    Returns
+    -------
+    extrema : tuple of ndarrays
+        ``(inds, axes)`` for a single curve, or ``(batch, inds, axes)`` for
+        a batch, where ``inds`` are the indices of the extrema along the
+        curve and ``axes`` is 0 where the x coordinate has an extremum (the
+        curve is parallel to the y axis) and 1 where the y coordinate has one
+        (the curve is parallel to the x axis). The extrema are sorted by
+        batch index, then by ``inds``, then by ``axes``, so a point that is
+        an extremum of both coordinates appears once for each.
+    See Also
+    --------
+    argrelmin, argrelmax
+    Examples
+    --------
+    >>> t = np.linspace(0, 2 * np.pi, 9)[:-1]
+    >>> argrelextrema_xy(np.stack((np.cos(t + 0.1), np.sin(t + 0.1))))
+    (array([2, 4, 6]), array([1, 0, 1]))
+    """
+    coords = np.asarray(coords)
+    if coords.ndim not in (2, 3) or coords.shape[-2] != 2:
+        raise ValueError('coords must have shape (2, N) or (k, 2, N)')
+
+    # A relative extremum is where the sign of the difference to the next
+    # point goes from strictly positive to strictly negative or vice versa.
+    signs = np.sign(np.diff(coords, axis=-1))
+    results = (signs[..., :-1] * signs[..., 1:]) < 0
+
+    # Put the coordinate axis last so that the nonzero indices come out
+    # sorted along the curve
+    *batch, inds, axes = np.nonzero(np.moveaxis(results, -2, -1))
+    return (*batch, inds + 1, axes)